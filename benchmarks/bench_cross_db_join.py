@@ -0,0 +1,107 @@
+"""Users-with-payment-totals: Python-side join vs. one ATTACHed sqlite query.
+
+Builds synthetic users.db / payments.db files in a temporary directory and
+times both approaches. Run from the project root:
+
+    python benchmarks/bench_cross_db_join.py --users 5000 --payments 20
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.data_access import DataAccess
+
+
+def build_fixtures(directory, users, payments_per_user, seed=7):
+    rng = random.Random(seed)
+    users_path = os.path.join(directory, "users.db")
+    payments_path = os.path.join(directory, "payments.db")
+
+    conn = sqlite3.connect(users_path)
+    conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, username TEXT)")
+    conn.executemany("INSERT INTO users VALUES (?, ?)", ((i, f"user{i}") for i in range(1, users + 1)))
+    conn.commit()
+    conn.close()
+
+    conn = sqlite3.connect(payments_path)
+    conn.execute("CREATE TABLE payments (id INTEGER PRIMARY KEY, user_id INTEGER, amount REAL)")
+    conn.executemany(
+        "INSERT INTO payments (user_id, amount) VALUES (?, ?)",
+        (
+            (rng.randint(1, users), round(rng.uniform(1, 500), 2))
+            for _ in range(users * payments_per_user)
+        ),
+    )
+    conn.execute("CREATE INDEX idx_payments_user_id ON payments (user_id)")
+    conn.commit()
+    conn.close()
+    return users_path, payments_path
+
+
+def python_join(users_path, payments_path):
+    # The current pattern: read users from one file, then one payments
+    # lookup per user against the other.
+    users = sqlite3.connect(users_path)
+    payments = sqlite3.connect(payments_path)
+    results = []
+    for user_id, username in users.execute("SELECT id, username FROM users ORDER BY id"):
+        amounts = [row[0] for row in payments.execute(
+            "SELECT amount FROM payments WHERE user_id = ?", (user_id,)
+        )]
+        results.append((user_id, username, len(amounts), sum(amounts)))
+    users.close()
+    payments.close()
+    return results
+
+
+def attached_join(facade):
+    return list(facade.users_with_payment_totals())
+
+
+def best_of(repeat, fn, *args):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--payments", type=int, default=20, help="payments per user")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        users_path, payments_path = build_fixtures(directory, args.users, args.payments)
+        facade = DataAccess(
+            os.path.join(directory, "app.db"),
+            attachments={"users": users_path, "payments": payments_path},
+        )
+        try:
+            python_time, expected = best_of(args.repeat, python_join, users_path, payments_path)
+            attached_time, actual = best_of(args.repeat, attached_join, facade)
+        finally:
+            facade.close()
+
+    # Totals are summed in a different order, so compare within rounding.
+    assert [row[:3] for row in expected] == [row[:3] for row in actual]
+    assert all(abs(a[3] - b[3]) < 1e-6 for a, b in zip(expected, actual))
+
+    print(f"users={args.users} payments={args.users * args.payments} (best of {args.repeat})")
+    print(f"python join   : {python_time * 1000:9.1f} ms")
+    print(f"attached join : {attached_time * 1000:9.1f} ms")
+    print(f"speedup       : {python_time / attached_time:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
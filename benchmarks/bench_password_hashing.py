@@ -0,0 +1,60 @@
+"""Logins/sec against PBKDF2 cost, inline vs. on the verification process pool.
+
+Each run verifies --logins password checks coming from --clients concurrent
+threads, the way a burst of API logins would arrive. Run from the project root:
+
+    python benchmarks/bench_password_hashing.py --costs 50000 100000 260000
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.passwords import PasswordVerifier, hash_password, verify_password
+
+
+def burst(check, logins, clients):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(clients) as executor:
+        assert all(executor.map(check, range(logins)))
+    return logins / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--costs", type=int, nargs="+", default=[50000, 100000, 260000])
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    users = [(f"user{i}", f"password-{i}") for i in range(args.logins)]
+    print(f"logins={args.logins} clients={args.clients} workers={args.workers}")
+    print(f"{'iterations':>10} {'inline/s':>10} {'pool/s':>10} {'cached/s':>12}")
+    for cost in args.costs:
+        stored = [hash_password(password, iterations=cost) for _, password in users]
+
+        def inline(i):
+            return verify_password(users[i][1], stored[i])
+
+        verifier = PasswordVerifier(max_workers=args.workers, cache_ttl=60)
+
+        def pooled(i):
+            return verifier.verify(users[i][0], users[i][1], stored[i])
+
+        try:
+            verifier.verify(*users[0], stored[0])  # start the worker processes
+            verifier.cache.clear()
+            inline_rate = burst(inline, args.logins, args.clients)
+            pool_rate = burst(pooled, args.logins, args.clients)
+            cached_rate = burst(pooled, args.logins, args.clients)
+        finally:
+            verifier.close()
+        print(f"{cost:>10} {inline_rate:>10.1f} {pool_rate:>10.1f} {cached_rate:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
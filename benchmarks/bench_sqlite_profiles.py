@@ -0,0 +1,75 @@
+"""Read/write throughput of each sqlite performance profile on synthetic data.
+
+Run from the project root:
+
+    python benchmarks/bench_sqlite_profiles.py --rows 200000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from config.settings import SQLITE_PROFILES
+from src.sqlite_profiles import connect
+
+
+def write_rows(conn, rows, batch_size):
+    conn.execute("CREATE TABLE events (id INTEGER PRIMARY KEY, user_id INTEGER, kind TEXT, amount REAL)")
+    rng = random.Random(1)
+    started = time.perf_counter()
+    for start in range(0, rows, batch_size):
+        conn.executemany(
+            "INSERT INTO events (user_id, kind, amount) VALUES (?, ?, ?)",
+            [
+                (rng.randint(1, 10000), rng.choice(("view", "click", "buy")), rng.random() * 100)
+                for _ in range(min(batch_size, rows - start))
+            ],
+        )
+        conn.commit()
+    return time.perf_counter() - started
+
+
+def point_reads(conn, rows, lookups):
+    rng = random.Random(2)
+    started = time.perf_counter()
+    for _ in range(lookups):
+        conn.execute("SELECT amount FROM events WHERE id = ?", (rng.randint(1, rows),)).fetchone()
+    return time.perf_counter() - started
+
+
+def full_scan(conn):
+    started = time.perf_counter()
+    conn.execute("SELECT kind, COUNT(*), SUM(amount) FROM events GROUP BY kind").fetchall()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--batch", type=int, default=1000, help="rows per committed batch")
+    parser.add_argument("--lookups", type=int, default=50000)
+    args = parser.parse_args()
+
+    print(f"rows={args.rows} batch={args.batch} lookups={args.lookups}")
+    print(f"{'profile':<12} {'writes/s':>12} {'lookups/s':>12} {'scan rows/s':>14}")
+    for name in SQLITE_PROFILES:
+        with tempfile.TemporaryDirectory() as directory:
+            conn = connect(os.path.join(directory, "bench.db"), name)
+            try:
+                write_time = write_rows(conn, args.rows, args.batch)
+                read_time = point_reads(conn, args.rows, args.lookups)
+                scan_time = full_scan(conn)
+            finally:
+                conn.close()
+        print(
+            f"{name:<12} {args.rows / write_time:>12,.0f} {args.lookups / read_time:>12,.0f}"
+            f" {args.rows / scan_time:>14,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -45,3 +45,112 @@ MAX_UPLOAD_SIZE = 10485760
 RATE_LIMIT = 100
 PORT = 8080
 WORKERS = 4
+
+# Database connection pool
+DB_PATH = "app.db"
+DB_POOL_SIZE = 5
+DB_POOL_TIMEOUT = 30
+DB_POOL_MAX_IDLE = 300
+DB_BULK_CHUNK_SIZE = 1000
+DB_FETCH_BATCH_SIZE = 500
+DB_PAGE_SIZE = 100
+DB_STATEMENT_CACHE_SIZE = 128
+INDEX_ADVISOR_THRESHOLD = 50
+
+# Online backup
+DB_BACKUP_PATH = "app.db.bak"
+BACKUP_PAGES_PER_STEP = 256
+BACKUP_STEP_SLEEP = 0.05
+
+# Migrations
+MIGRATION_BACKFILL_BATCH_SIZE = 10000
+
+# Read replicas
+REPLICA_SELECTION = "round_robin"
+REPLICA_MAX_STALENESS = 5
+REPLICA_SYNC_INTERVAL = 1
+
+# Query result cache (entries also expire after CACHE_TTL seconds)
+QUERY_CACHE_ENABLED = True
+QUERY_CACHE_MAX_ENTRIES = 1024
+QUERY_CACHE_MAX_BYTES = 67108864
+
+# Query profiling
+QUERY_PROFILING_ENABLED = True
+SLOW_QUERY_THRESHOLD = 0.5
+SLOW_QUERY_LOG_SIZE = 100
+
+# Async database API (timeout in seconds, None waits forever)
+ASYNC_DB_WORKERS = 4
+ASYNC_DB_TIMEOUT = 30
+
+# Cross-database access (ATTACHed next to DB_PATH)
+USERS_DB_PATH = "users.db"
+PAYMENTS_DB_PATH = "payments.db"
+
+# sqlite performance profiles, applied to every connection the services open.
+# page_size only takes effect on a new (empty) database file.
+SQLITE_PROFILE = "balanced"
+SQLITE_PROFILES = {
+    "durable": {
+        "journal_mode": "WAL", "synchronous": "FULL", "cache_size": -8000,
+        "mmap_size": 0, "temp_store": "DEFAULT", "page_size": 4096,
+    },
+    "balanced": {
+        "journal_mode": "WAL", "synchronous": "NORMAL", "cache_size": -32000,
+        "mmap_size": 268435456, "temp_store": "MEMORY", "page_size": 4096,
+    },
+    "bulk-load": {
+        "journal_mode": "WAL", "synchronous": "OFF", "cache_size": -131072,
+        "mmap_size": 268435456, "temp_store": "MEMORY", "page_size": 8192,
+    },
+    "read-mostly": {
+        "journal_mode": "WAL", "synchronous": "NORMAL", "cache_size": -65536,
+        "mmap_size": 1073741824, "temp_store": "MEMORY", "page_size": 4096,
+    },
+}
+
+# user_service.get_user cache (missing IDs are cached for the shorter TTL)
+USER_CACHE_MAX_ENTRIES = 10000
+USER_CACHE_TTL = 300
+USER_CACHE_NEGATIVE_TTL = 30
+# IDs per IN (...) query; stays under sqlite's 999 bound-variable limit
+USER_BATCH_CHUNK_SIZE = 500
+
+# Password hashing ("pbkdf2_sha256" or "scrypt"); raising the cost only
+# affects newly created hashes.
+PASSWORD_HASH_ALGORITHM = "pbkdf2_sha256"
+PASSWORD_HASH_ITERATIONS = 260000
+PASSWORD_SCRYPT_N = 16384
+PASSWORD_SCRYPT_R = 8
+PASSWORD_SCRYPT_P = 1
+PASSWORD_VERIFY_WORKERS = 4
+PASSWORD_VERIFY_CACHE_SIZE = 10000
+PASSWORD_VERIFY_CACHE_TTL = 60
+
+# Login lockout: MAX_LOGIN_FAILURES within LOGIN_FAILURE_WINDOW seconds
+MAX_LOGIN_FAILURES = 5
+LOGIN_FAILURE_WINDOW = 900
+LOGIN_FAILURE_BUCKETS = 15
+LOGIN_FAILURE_MAX_KEYS = 100000
+
+# External user API client (timeouts in seconds; retries use MAX_RETRIES)
+EXTERNAL_API_POOL_SIZE = 16
+EXTERNAL_API_WORKERS = 8
+EXTERNAL_API_CONNECT_TIMEOUT = 3
+EXTERNAL_API_READ_TIMEOUT = 10
+EXTERNAL_API_BACKOFF = 0.2
+EXTERNAL_API_MAX_BACKOFF = 5
+
+# External user data cache: entries older than the soft TTL are served while
+# refreshed in the background; past the hard TTL they are fetched again.
+EXTERNAL_CACHE_SOFT_TTL = 60
+EXTERNAL_CACHE_HARD_TTL = 3600
+EXTERNAL_CACHE_MAX_ENTRIES = 10000
+EXTERNAL_CACHE_REFRESH_WORKERS = 4
+
+# User tier report: a value above USER_TIER_THRESHOLDS[i] moves a user past
+# USER_TIERS[i]; NULL values count as the lowest tier.
+USER_TIERS = ("free", "standard", "premium")
+USER_TIER_THRESHOLDS = (499, 9999)
+USER_TIER_COLUMN = "balance"
@@ -1,6 +1,6 @@
 import json
 import os
-from src.user_service import get_user, authenticate_user, create_user, UserManager
+from src.user_service import get_user, authenticate_user, create_user, UserManager, failed_logins
 from src.payment_service import process_payment, PaymentProcessor
 
 # ❌ SEC001: Hardcoded JWT secret
@@ -19,6 +19,9 @@ def handle_login(request_data):
     username = request_data.get("username")
     password = request_data.get("password")
 
+    if failed_logins.is_locked(username):
+        return {"authenticated": False, "locked": True}
+
     # ❌ SEC001: Hardcoded bypass
     if password == ADMIN_TOKEN:
         print(f"Admin bypass used for {username}")
@@ -0,0 +1,202 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config.settings import DB_PATH, ASYNC_DB_WORKERS, ASYNC_DB_TIMEOUT, DB_FETCH_BATCH_SIZE
+from src.database import notify_write, profile_statement
+from src.query_profiler import call_site
+from src.sqlite_profiles import connect
+
+
+class AsyncDatabase:
+    """asyncio front end for one sqlite file.
+
+    All sqlite work runs on a bounded thread pool; each worker thread lazily
+    opens and keeps its own connection, so no connection is ever shared
+    between threads. Awaiting callers can be cancelled or time out: a
+    statement that has not started yet is dropped, one that is running is
+    aborted with ``Connection.interrupt()`` so the worker is freed at once.
+
+    Statements are recorded by the ``src.database`` profiler, and committed
+    writes to the pool's database invalidate its query result cache.
+
+        async with AsyncDatabase("users.db") as db:
+            rows = await db.fetch("SELECT * FROM users WHERE role = ?", ("admin",))
+            async for row in db.stream("SELECT * FROM users"):
+                ...
+    """
+
+    def __init__(self, database=DB_PATH, max_workers=ASYNC_DB_WORKERS, timeout=ASYNC_DB_TIMEOUT,
+                 profile=None):
+        self.database = database
+        self.profile = profile
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="async-db")
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # check_same_thread is off only so close() can run from another
+            # thread; the connection is otherwise used by this worker alone.
+            conn = connect(self.database, self.profile, check_same_thread=False)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def _timeout(self, timeout):
+        return self.timeout if timeout is None else timeout
+
+    async def _run(self, fn, *args, timeout=None):
+        if self._closed:
+            raise RuntimeError("AsyncDatabase is closed")
+        state = {"conn": None, "abandoned": False}
+        guard = threading.Lock()
+
+        def work():
+            with guard:
+                if state["abandoned"]:
+                    return None
+                state["conn"] = conn = self._connection()
+            try:
+                return fn(conn, *args)
+            finally:
+                with guard:
+                    state["conn"] = None
+
+        future = asyncio.get_running_loop().run_in_executor(self._executor, work)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            with guard:
+                state["abandoned"] = True
+                if state["conn"] is not None:
+                    state["conn"].interrupt()
+            raise
+
+    async def _statement(self, work, sql, params, timeout, count):
+        # The call site is taken here, on the caller's stack; the worker
+        # thread only sees the executor's frames.
+        site = call_site((__file__,))
+
+        def profiled(conn):
+            started = time.perf_counter()
+            result = work(conn)
+            profile_statement(conn, sql, params, started, count(result), site)
+            return result
+
+        return await self._run(profiled, timeout=self._timeout(timeout))
+
+    def _write(self, conn, run, sql):
+        try:
+            cursor = run()
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        notify_write(self.database, sql)
+        return cursor.rowcount
+
+    async def fetch(self, sql, params=(), timeout=None):
+        def work(conn):
+            return conn.execute(sql, params).fetchall()
+        return await self._statement(work, sql, params, timeout, len)
+
+    async def fetch_one(self, sql, params=(), timeout=None):
+        def work(conn):
+            return conn.execute(sql, params).fetchone()
+        return await self._statement(work, sql, params, timeout, lambda row: int(row is not None))
+
+    async def execute(self, sql, params=(), timeout=None):
+        """Run a write statement and commit it; returns the affected row count."""
+        def work(conn):
+            return self._write(conn, lambda: conn.execute(sql, params), sql)
+        return await self._statement(work, sql, params, timeout, lambda rowcount: rowcount)
+
+    async def executemany(self, sql, rows, timeout=None):
+        def work(conn):
+            return self._write(conn, lambda: conn.executemany(sql, rows), sql)
+        return await self._statement(work, sql, (), timeout, lambda rowcount: rowcount)
+
+    async def stream(self, sql, params=(), batch_size=DB_FETCH_BATCH_SIZE, prefetch=2,
+                     timeout=None):
+        """Yield rows of ``sql`` as an async iterator, ``batch_size`` rows at a time.
+
+        One worker runs the cursor for the whole stream and stays at most
+        ``prefetch`` batches ahead of the consumer. ``timeout`` applies to each
+        batch. Leaving the ``async for`` early stops the worker and closes the
+        cursor.
+        """
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        slots = threading.Semaphore(prefetch)
+        stop = threading.Event()
+
+        site = call_site((__file__,))
+
+        def produce(conn):
+            cursor = conn.cursor()
+            # Only time spent inside sqlite counts, not time spent waiting for
+            # the consumer to free a prefetch slot.
+            elapsed = 0.0
+            streamed = 0
+            try:
+                started = time.perf_counter()
+                cursor.execute(sql, params)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    elapsed += time.perf_counter() - started
+                    slots.acquire()
+                    if stop.is_set():
+                        return
+                    loop.call_soon_threadsafe(queue.put_nowait, rows)
+                    if not rows:
+                        return
+                    streamed += len(rows)
+                    started = time.perf_counter()
+            except BaseException as e:
+                if not stop.is_set():
+                    loop.call_soon_threadsafe(queue.put_nowait, e)
+            finally:
+                cursor.close()
+                profile_statement(conn, sql, params, None, streamed, site, elapsed=elapsed)
+
+        # No timeout on the producer itself: a long stream is fine as long as
+        # every batch arrives in time.
+        job = asyncio.ensure_future(self._run(produce))
+        try:
+            while True:
+                item = await asyncio.wait_for(queue.get(), self._timeout(timeout))
+                if isinstance(item, BaseException):
+                    raise item
+                slots.release()
+                if not item:
+                    return
+                for row in item:
+                    yield row
+        finally:
+            stop.set()
+            slots.release()
+            if not job.done():
+                job.cancel()
+
+    async def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
@@ -0,0 +1,77 @@
+import numpy as np
+
+from src.query_builder import quote_identifier
+
+
+def _column_profile_sql(table, columns):
+    parts = ["count(*)"]
+    for column in columns:
+        name = quote_identifier(column)
+        parts.append(f"group_concat(DISTINCT typeof({name}))")
+        parts.append(f"max(length({name}))")
+    return f"SELECT {', '.join(parts)} FROM {quote_identifier(table)}"
+
+
+def _dtype_for(types, max_length):
+    # sqlite is dynamically typed, so the dtype follows what is actually
+    # stored rather than the declared column type.
+    types = set(types.split(",")) if types else set()
+    has_null = "null" in types
+    types.discard("null")
+    if not types or types <= {"integer", "real"}:
+        if types == {"integer"} and not has_null:
+            return np.dtype(np.int64)
+        # NULLs in numeric columns become NaN.
+        return np.dtype(np.float64)
+    if types == {"text"}:
+        return np.dtype(f"U{max(max_length or 0, 1)}")
+    return np.dtype(object)
+
+
+def table_dtype(conn, table, columns):
+    """Return ``(dtype, row_count)`` for a structured array holding ``columns`` of ``table``.
+
+    Needs one pass over the table; callers should run it in the same read
+    transaction as the export so the row count still holds.
+    """
+    row = conn.execute(_column_profile_sql(table, columns)).fetchone()
+    fields = [
+        (column, _dtype_for(row[1 + 2 * i], row[2 + 2 * i]))
+        for i, column in enumerate(columns)
+    ]
+    return np.dtype(fields), row[0]
+
+
+def _column_values(values, dtype):
+    if dtype.kind == "U":
+        return [v if v is not None else "" for v in values]
+    return values
+
+
+def fill_columns(cursor, out, batch_size):
+    """Fill structured array ``out`` from ``cursor`` one column at a time per batch.
+
+    Only ``batch_size`` rows are held as Python objects at any moment.
+    Returns the number of rows written.
+    """
+    names = out.dtype.names
+    filled = 0
+    while filled < len(out):
+        rows = cursor.fetchmany(min(batch_size, len(out) - filled))
+        if not rows:
+            break
+        end = filled + len(rows)
+        for name, values in zip(names, zip(*rows)):
+            field = out[name]
+            field[filled:end] = _column_values(values, field.dtype)
+        filled = end
+    return filled
+
+
+def allocate(dtype, rows, path=None):
+    """Return an empty structured array, memory-mapped to a ``.npy`` file if ``path`` is given."""
+    if path is None:
+        return np.zeros(rows, dtype=dtype)
+    if dtype.hasobject:
+        raise ValueError("columns holding blobs or mixed types cannot be memory-mapped")
+    return np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=(rows,))
@@ -0,0 +1,238 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no connection becomes available within the pool timeout."""
+
+
+class PoolClosedError(Exception):
+    """Raised when checking out from a pool that has been closed."""
+
+
+class ConnectionPool:
+    """Bounded, thread-safe pool of sqlite3 connections to a single database file.
+
+    Connections are handed out with ``checkout()`` and given back with
+    ``release()``; ``connection()`` wraps both in a context manager. Idle
+    connections are health-checked before reuse and closed once they have been
+    idle for longer than ``max_idle`` seconds.
+
+    The pool also mirrors each connection's prepared-statement cache (sized by
+    the ``cached_statements`` connect argument) so callers that report their
+    statement text through ``record_statement()`` get hit/miss counters.
+
+    ``on_connect`` is called with every newly opened connection before it is
+    handed out, e.g. to ATTACH databases or set PRAGMAs.
+    """
+
+    def __init__(self, database, max_size=5, timeout=30, max_idle=300, on_connect=None,
+                 **connect_kwargs):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.database = database
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.on_connect = on_connect
+        self.connect_kwargs = dict(connect_kwargs)
+        self.connect_kwargs.setdefault("check_same_thread", False)
+        self.statement_cache_size = self.connect_kwargs.setdefault("cached_statements", 128)
+
+        self._lock = threading.Condition(threading.Lock())
+        self._idle = deque()
+        self._in_use = set()
+        self._closed = False
+
+        self._created = 0
+        self._discarded = 0
+        self._evicted = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._max_wait_time = 0.0
+        self._statements = {}
+        self._statement_hits = 0
+        self._statement_misses = 0
+
+    def _connect(self):
+        conn = sqlite3.connect(self.database, **self.connect_kwargs)
+        if self.on_connect is not None:
+            try:
+                self.on_connect(conn)
+            except BaseException:
+                conn.close()
+                raise
+        return conn
+
+    def _is_healthy(self, conn):
+        try:
+            conn.execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _evict_expired(self, now):
+        # Caller holds the lock. The oldest idle connections sit at the left.
+        expired = []
+        while self._idle and now - self._idle[0][1] > self.max_idle:
+            expired.append(self._idle.popleft()[0])
+        self._evicted += len(expired)
+        for conn in expired:
+            self._statements.pop(id(conn), None)
+        return expired
+
+    def checkout(self, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        waited = False
+        placeholder = object()
+
+        while True:
+            with self._lock:
+                if self._closed:
+                    raise PoolClosedError(f"pool for {self.database} is closed")
+                expired = self._evict_expired(time.monotonic())
+                conn = None
+                create = False
+                if self._idle:
+                    conn = self._idle.pop()[0]
+                    self._in_use.add(conn)
+                elif len(self._in_use) < self.max_size:
+                    create = True
+                    # Reserve the slot before connecting outside the lock.
+                    self._in_use.add(placeholder)
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._record_wait(started, waited)
+                        raise PoolTimeoutError(
+                            f"no connection to {self.database} available after {timeout}s"
+                        )
+                    waited = True
+                    self._lock.wait(remaining)
+                    continue
+
+            for stale in expired:
+                stale.close()
+
+            if create:
+                try:
+                    conn = self._connect()
+                except BaseException:
+                    with self._lock:
+                        self._in_use.discard(placeholder)
+                        self._lock.notify()
+                    raise
+                with self._lock:
+                    self._in_use.discard(placeholder)
+                    self._in_use.add(conn)
+                    self._created += 1
+            elif not self._is_healthy(conn):
+                with self._lock:
+                    self._in_use.discard(conn)
+                    self._statements.pop(id(conn), None)
+                    self._discarded += 1
+                    self._lock.notify()
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+                continue
+
+            with self._lock:
+                self._checkouts += 1
+                self._record_wait(started, waited)
+            return conn
+
+    def _record_wait(self, started, waited):
+        # Caller holds the lock.
+        if not waited:
+            return
+        elapsed = time.monotonic() - started
+        self._waits += 1
+        self._wait_time += elapsed
+        self._max_wait_time = max(self._max_wait_time, elapsed)
+
+    def release(self, conn, discard=False):
+        with self._lock:
+            if conn not in self._in_use:
+                raise ValueError("connection was not checked out from this pool")
+            self._in_use.discard(conn)
+            keep = not (discard or self._closed)
+            if keep:
+                try:
+                    if conn.in_transaction:
+                        conn.rollback()
+                except sqlite3.Error:
+                    keep = False
+            if keep:
+                self._idle.append((conn, time.monotonic()))
+            else:
+                self._statements.pop(id(conn), None)
+                self._discarded += 1
+            self._lock.notify()
+        if not keep:
+            conn.close()
+
+    def record_statement(self, conn, sql):
+        """Count ``sql`` against ``conn``'s statement cache; return True on a hit.
+
+        sqlite keeps an LRU of compiled statements per connection keyed by the
+        exact SQL text, so this mirror predicts whether the statement will be
+        re-prepared or reused.
+        """
+        with self._lock:
+            if conn not in self._in_use:
+                return False
+            cache = self._statements.setdefault(id(conn), OrderedDict())
+            if sql in cache:
+                cache.move_to_end(sql)
+                self._statement_hits += 1
+                return True
+            cache[sql] = None
+            if len(cache) > self.statement_cache_size:
+                cache.popitem(last=False)
+            self._statement_misses += 1
+            return False
+
+    @contextmanager
+    def connection(self, timeout=None):
+        conn = self.checkout(timeout)
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "database": self.database,
+                "max_size": self.max_size,
+                "in_use": len(self._in_use),
+                "idle": len(self._idle),
+                "created": self._created,
+                "discarded": self._discarded,
+                "evicted": self._evicted,
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "total_wait_time": self._wait_time,
+                "max_wait_time": self._max_wait_time,
+                "statement_cache_size": self.statement_cache_size,
+                "statement_hits": self._statement_hits,
+                "statement_misses": self._statement_misses,
+            }
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+            self._statements.clear()
+            self._lock.notify_all()
+        for conn in idle:
+            conn.close()
@@ -0,0 +1,102 @@
+import re
+
+from config.settings import (
+    DB_PATH, USERS_DB_PATH, PAYMENTS_DB_PATH, DB_POOL_SIZE, DB_POOL_TIMEOUT,
+    DB_POOL_MAX_IDLE, DB_FETCH_BATCH_SIZE
+)
+from src.connection_pool import ConnectionPool
+from src.query_builder import quote_identifier
+from src.sqlite_profiles import apply_profile
+
+_SCHEMA_NAME = re.compile(r"^[A-Za-z_]\w*$")
+
+USERS_WITH_PAYMENT_TOTALS = """
+    SELECT u.id, u.username, COUNT(p.user_id) AS payment_count,
+           COALESCE(SUM(p.amount), 0) AS payment_total
+    FROM users.users AS u
+    LEFT JOIN payments.payments AS p ON p.user_id = u.id
+    GROUP BY u.id
+    {having}
+    ORDER BY u.id
+"""
+
+
+class DataAccess:
+    """Pooled connections to ``app.db`` with ``users.db`` and ``payments.db`` ATTACHed.
+
+    Every pooled connection attaches the same files under fixed schema names
+    (``users`` and ``payments`` by default), so a single statement can join
+    across them and sqlite does the work instead of Python loops. Results are
+    streamed in ``fetchmany`` batches.
+
+        facade = DataAccess()
+        for user_id, username, count, total in facade.users_with_payment_totals():
+            ...
+    """
+
+    def __init__(self, database=DB_PATH, attachments=None, max_size=DB_POOL_SIZE,
+                 timeout=DB_POOL_TIMEOUT, max_idle=DB_POOL_MAX_IDLE, profile=None,
+                 **connect_kwargs):
+        if attachments is None:
+            attachments = {"users": USERS_DB_PATH, "payments": PAYMENTS_DB_PATH}
+        for name in attachments:
+            if not _SCHEMA_NAME.match(name) or name.lower() in ("main", "temp"):
+                raise ValueError(f"invalid schema name: {name!r}")
+        self.attachments = dict(attachments)
+        self.profile = profile
+        self.pool = ConnectionPool(
+            database, max_size=max_size, timeout=timeout, max_idle=max_idle,
+            on_connect=self._attach, **connect_kwargs
+        )
+
+    def _attach(self, conn):
+        for name, path in self.attachments.items():
+            conn.execute(f"ATTACH DATABASE ? AS {quote_identifier(name)}", (path,))
+        apply_profile(conn, self.profile, schemas=["main", *self.attachments])
+
+    def stream(self, sql, params=(), batch_size=DB_FETCH_BATCH_SIZE):
+        """Yield rows of ``sql`` run on an attached connection, ``batch_size`` at a time.
+
+        The connection stays checked out until the generator is exhausted or
+        closed.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(sql, params)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        return
+                    yield from rows
+            finally:
+                cursor.close()
+
+    def fetch_all(self, sql, params=()):
+        return list(self.stream(sql, params))
+
+    def users_with_payment_totals(self, min_total=None, batch_size=DB_FETCH_BATCH_SIZE):
+        """Yield ``(id, username, payment_count, payment_total)`` for every user.
+
+        Users without payments are included with a zero total, and refunds
+        may leave a total below zero. With ``min_total`` only users whose
+        total reaches it are returned.
+        """
+        if min_total is None:
+            return self.stream(USERS_WITH_PAYMENT_TOTALS.format(having=""), (), batch_size)
+        sql = USERS_WITH_PAYMENT_TOTALS.format(having="HAVING COALESCE(SUM(p.amount), 0) >= ?")
+        return self.stream(sql, (min_total,), batch_size)
+
+    def stats(self):
+        return self.pool.stats()
+
+    def close(self):
+        self.pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -1,5 +1,31 @@
 import sqlite3
 import os
+import gzip
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from itertools import islice
+
+from config.settings import (
+    DB_PATH, DB_POOL_SIZE, DB_POOL_TIMEOUT, DB_POOL_MAX_IDLE, DB_BULK_CHUNK_SIZE,
+    DB_FETCH_BATCH_SIZE, DB_PAGE_SIZE, DB_STATEMENT_CACHE_SIZE, INDEX_ADVISOR_THRESHOLD,
+    DB_BACKUP_PATH, BACKUP_PAGES_PER_STEP, BACKUP_STEP_SLEEP, MIGRATION_BACKFILL_BATCH_SIZE,
+    REPLICA_SELECTION, REPLICA_MAX_STALENESS, REPLICA_SYNC_INTERVAL,
+    CACHE_TTL, QUERY_CACHE_ENABLED, QUERY_CACHE_MAX_ENTRIES, QUERY_CACHE_MAX_BYTES,
+    QUERY_PROFILING_ENABLED, SLOW_QUERY_THRESHOLD, SLOW_QUERY_LOG_SIZE
+)
+from src.columnar import allocate, fill_columns, table_dtype
+from src.connection_pool import ConnectionPool
+from src.index_advisor import IndexAdvisor
+from src.query_builder import (
+    Schema, build_select, build_delete, render_select, quote_identifier, where_clause
+)
+from src.query_cache import QueryCache, written_table
+from src.query_profiler import QueryProfiler, call_site
+from src.replicas import ReplicaSet, is_read_only
+from src.sqlite_profiles import apply_profile
 
 # ❌ SEC001: Hardcoded DB credentials
 DB_HOST = "prod-database.company.com"
@@ -12,91 +38,725 @@ REDIS_PASSWORD = "redis_pass_9876"
 # ❌ SEC001: Connection string with credentials
 CONNECTION_STRING = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_NAME}"
 
+_pool = None
+_pool_lock = threading.Lock()
+_schema = Schema()
+_index_advisor = None
+_replicas = None
+_profiler = (
+    QueryProfiler(SLOW_QUERY_THRESHOLD, SLOW_QUERY_LOG_SIZE) if QUERY_PROFILING_ENABLED else None
+)
+# Cache tag carried by every entry read from a replica, so a re-sync can drop
+# them all at once.
+_REPLICA_TAG = "__replica__"
+_result_cache = (
+    QueryCache(CACHE_TTL, QUERY_CACHE_MAX_ENTRIES, QUERY_CACHE_MAX_BYTES)
+    if QUERY_CACHE_ENABLED else None
+)
+
+
+def get_pool():
+    """Return the module-wide connection pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(
+                DB_PATH,
+                max_size=DB_POOL_SIZE,
+                timeout=DB_POOL_TIMEOUT,
+                max_idle=DB_POOL_MAX_IDLE,
+                on_connect=apply_profile,
+                cached_statements=DB_STATEMENT_CACHE_SIZE,
+            )
+        return _pool
+
+
+def configure_pool(database=DB_PATH, max_size=DB_POOL_SIZE, timeout=DB_POOL_TIMEOUT,
+                   max_idle=DB_POOL_MAX_IDLE, cached_statements=DB_STATEMENT_CACHE_SIZE,
+                   profile=None, **connect_kwargs):
+    """Replace the module-wide pool, closing the idle connections of the old one.
+
+    New connections get the sqlite performance ``profile`` (default
+    ``SQLITE_PROFILE``).
+    """
+    global _pool
+    with _pool_lock:
+        old, _pool = _pool, ConnectionPool(
+            database, max_size=max_size, timeout=timeout, max_idle=max_idle,
+            on_connect=lambda conn: apply_profile(conn, profile),
+            cached_statements=cached_statements, **connect_kwargs
+        )
+    _schema.invalidate()
+    clear_query_cache()
+    if old is not None:
+        old.close()
+    return _pool
+
+
+def close_pool():
+    global _pool
+    with _pool_lock:
+        old, _pool = _pool, None
+    _schema.invalidate()
+    clear_query_cache()
+    if old is not None:
+        old.close()
+
+
+def pool_stats():
+    return get_pool().stats()
+
+
+def statement_cache_stats():
+    stats = get_pool().stats()
+    return {
+        "size": stats["statement_cache_size"],
+        "hits": stats["statement_hits"],
+        "misses": stats["statement_misses"],
+    }
+
+
+def configure_query_cache(enabled=True, ttl=CACHE_TTL, max_entries=QUERY_CACHE_MAX_ENTRIES,
+                          max_bytes=QUERY_CACHE_MAX_BYTES):
+    global _result_cache
+    _result_cache = QueryCache(ttl, max_entries, max_bytes) if enabled else None
+    return _result_cache
+
+
+def clear_query_cache():
+    if _result_cache is not None:
+        _result_cache.clear()
+
+
+def query_cache_stats():
+    return _result_cache.stats() if _result_cache is not None else None
+
+
+def _invalidate_tables(*tables):
+    if _result_cache is None:
+        return
+    if not tables or None in tables:
+        # Unknown write target: nothing cached can be trusted any more.
+        _result_cache.clear()
+    else:
+        for table in tables:
+            _result_cache.invalidate_table(table)
+
+
+def configure_profiler(enabled=True, slow_threshold=SLOW_QUERY_THRESHOLD,
+                       slow_log_size=SLOW_QUERY_LOG_SIZE):
+    global _profiler
+    _profiler = QueryProfiler(slow_threshold, slow_log_size) if enabled else None
+    return _profiler
+
+
+def add_query_hook(hook):
+    """Call ``hook(event)`` after every profiled statement; returns the hook."""
+    if _profiler is None:
+        raise RuntimeError("query profiling is disabled")
+    _profiler.add_hook(hook)
+    return hook
+
+
+def remove_query_hook(hook):
+    if _profiler is not None:
+        _profiler.remove_hook(hook)
+
+
+def profiler_snapshot():
+    """Latency percentiles per query fingerprint plus the slow-query log."""
+    return _profiler.snapshot() if _profiler is not None else None
+
+
+def _profile(conn, sql, params, started, rows, elapsed=None, site=None):
+    profiler = _profiler
+    if profiler is not None:
+        if elapsed is None:
+            elapsed = time.perf_counter() - started
+        profiler.record(conn, sql, params, elapsed, rows, site or call_site((__file__,)))
+
+
+def profile_statement(conn, sql, params, started, rows, site=None, elapsed=None):
+    """Record a statement that ran outside the pool with the module-wide profiler.
+
+    ``elapsed``, when given, replaces the time since ``started``.
+    """
+    _profile(conn, sql, params, started, rows, elapsed=elapsed, site=site)
+
+
+def notify_write(database, sql):
+    """Drop cached results made stale by ``sql``, run on ``database`` outside the pool.
+
+    Only writes to the pool's database matter; anything else is ignored.
+    """
+    if is_read_only(sql):
+        return
+    pool = _pool
+    primary = pool.database if pool is not None else DB_PATH
+    if os.path.abspath(database) == os.path.abspath(primary):
+        _invalidate_tables(written_table(sql))
+
+
+def enable_index_advisor(threshold=INDEX_ADVISOR_THRESHOLD, auto_create=False):
+    """Start recording search_records lookups; returns the active advisor."""
+    global _index_advisor
+    _index_advisor = IndexAdvisor(threshold=threshold, auto_create=auto_create)
+    return _index_advisor
+
+
+def disable_index_advisor():
+    global _index_advisor
+    _index_advisor = None
+
+
+def index_advisor_report():
+    if _index_advisor is None:
+        return None
+    return _index_advisor.report()
+
 
 def get_connection():
     # ❌ MAINT003: No docstring
     print(f"Connecting with: {DB_USER}:{DB_PASSWORD}@{DB_HOST}")
-    return sqlite3.connect("app.db")
+    return get_pool().checkout()
+
+
+def release_connection(conn):
+    get_pool().release(conn)
+
+
+@contextmanager
+def pooled_connection():
+    """Check a connection out of the pool for the duration of a ``with`` block."""
+    conn = get_connection()
+    try:
+        yield conn
+    finally:
+        release_connection(conn)
+
+
+def configure_replicas(paths, selection=REPLICA_SELECTION, max_staleness=REPLICA_MAX_STALENESS,
+                       sync_interval=REPLICA_SYNC_INTERVAL):
+    """Snapshot the primary into read-only replica files and route reads to them.
+
+    With ``sync_interval`` the replicas are re-synced in the background every
+    that many seconds; pass ``None`` to sync only through ``sync_replicas()``.
+    """
+    global _replicas
+    close_replicas()
+    replicas = ReplicaSet(
+        paths, selection=selection, max_staleness=max_staleness,
+        pool_size=DB_POOL_SIZE, timeout=DB_POOL_TIMEOUT, max_idle=DB_POOL_MAX_IDLE,
+        on_sync=lambda: _invalidate_tables(_REPLICA_TAG),
+    )
+    with pooled_connection() as conn:
+        replicas.sync(conn)
+    if sync_interval:
+        replicas.start_periodic_sync(pooled_connection, sync_interval)
+    _replicas = replicas
+    return replicas
+
+
+def sync_replicas():
+    if _replicas is not None:
+        with pooled_connection() as conn:
+            _replicas.sync(conn)
+
+
+def close_replicas():
+    global _replicas
+    old, _replicas = _replicas, None
+    if old is not None:
+        old.close()
+
+
+def replica_stats():
+    return _replicas.stats() if _replicas is not None else []
+
+
+@contextmanager
+def _read_connection(session=None):
+    # Yields (connection, owning pool). Reads go to a replica that is within
+    # the staleness bound and, for read-your-writes sessions, was synced after
+    # the session's last write; otherwise they fall back to the primary.
+    replica = None
+    if _replicas is not None:
+        min_synced_at = None
+        if session is not None and session.read_your_writes:
+            min_synced_at = session.last_write_at
+        replica = _replicas.choose(min_synced_at)
+    if replica is None:
+        with pooled_connection() as conn:
+            yield conn, get_pool(), None
+    else:
+        with replica.pool.connection() as conn:
+            yield conn, replica.pool, replica
+
+
+def _cached_read(sql, params, tables, session, run, on_hit=None):
+    # ``run(conn, pool)`` performs the read on whichever connection
+    # _read_connection picks; ``on_hit()`` is called instead when the rows
+    # come from the cache. Rows read from a replica are only cached for
+    # what is left of that replica's staleness budget.
+    cache = _result_cache
+    min_as_of = None
+    if session is not None and session.read_your_writes:
+        min_as_of = session.last_write_at
+    key = None
+    if cache is not None:
+        key = QueryCache.make_key(sql, params)
+        try:
+            rows = cache.get(key, min_as_of)
+        except TypeError:
+            key = None
+            rows = None
+        if rows is not None:
+            if on_hit is not None:
+                on_hit()
+            return rows
+        generation = cache.generation()
+
+    started = time.time()
+    with _read_connection(session) as (conn, pool, replica):
+        rows = run(conn, pool)
+
+    if key is not None:
+        if replica is None:
+            cache.put(key, rows, tables, as_of=started, generation=generation)
+        else:
+            remaining = _replicas.max_staleness - (time.time() - replica.synced_at)
+            cache.put(key, rows, list(tables) + [_REPLICA_TAG], ttl=remaining,
+                      as_of=replica.synced_at, generation=generation)
+    return rows
+
+
+def _execute(conn, cursor, sql, params=(), pool=None):
+    (pool or get_pool()).record_statement(conn, sql)
+    return cursor.execute(sql, params)
+
+
+def _query(conn, cursor, sql, params=(), pool=None):
+    started = time.perf_counter()
+    _execute(conn, cursor, sql, params, pool)
+    rows = cursor.fetchall()
+    _profile(conn, sql, params, started, len(rows))
+    return rows
 
 
-def run_query(query_input):
+def run_query(query_input, params=()):
     # ❌ MAINT003: No docstring
     # ❌ SEC003: Direct query execution
     # ❌ SEC005: eval usage
-    conn = get_connection()
-    cursor = conn.cursor()
-    final_query = eval(f"'{query_input}'")
-    cursor.execute(final_query)
-    results = cursor.fetchall()
-    conn.close()
-    return results
+    with pooled_connection() as conn:
+        cursor = conn.cursor()
+        final_query = eval(f"'{query_input}'")
+        return _query(conn, cursor, final_query, params)
+
+
+def select_records(table, columns=None, where=None, order_by=None, limit=None):
+    """Run a validated, parameterized SELECT built from keyword criteria.
+
+    ``where`` maps column names to values (``None`` means IS NULL, a list means
+    IN). Identifiers are checked against the schema; values are always bound.
+    """
+    sql, params = render_select(table, columns, where, order_by, limit)
+
+    def run(conn, pool):
+        build_select(_schema, conn, table, columns, where, order_by, limit)
+        cursor = conn.cursor()
+        return _query(conn, cursor, sql, params, pool)
+
+    return _cached_read(sql, params, [table], None, run)
+
+
+def _stream_query(build, batch_size=DB_FETCH_BATCH_SIZE):
+    # The connection stays checked out while the generator is suspended;
+    # closing the generator (or exhausting it) releases both cursor and
+    # connection immediately.
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    with pooled_connection() as conn:
+        query, params = build(conn)
+        cursor = conn.cursor()
+        site = call_site((__file__,))
+        # Only time spent inside sqlite counts, not time the consumer spends
+        # between batches.
+        elapsed = 0.0
+        streamed = 0
+        try:
+            started = time.perf_counter()
+            _execute(conn, cursor, query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                elapsed += time.perf_counter() - started
+                if not rows:
+                    return
+                streamed += len(rows)
+                yield from rows
+                started = time.perf_counter()
+        finally:
+            cursor.close()
+            _profile(conn, query, params, None, streamed, elapsed=elapsed, site=site)
+
+
+def iter_records(table, batch_size=DB_FETCH_BATCH_SIZE):
+    """Yield every row of ``table``, fetching ``batch_size`` rows at a time."""
+    return _stream_query(lambda conn: build_select(_schema, conn, table), batch_size)
+
+
+def iter_search_records(table, column, value, batch_size=DB_FETCH_BATCH_SIZE):
+    """Yield rows of ``table`` where ``column`` equals ``value``, in batches."""
+    return _stream_query(
+        lambda conn: build_select(_schema, conn, table, where={column: value}), batch_size
+    )
+
+
+def fetch_page(table, after=None, limit=DB_PAGE_SIZE, key="id"):
+    """Return up to ``limit`` rows of ``table`` ordered by ``key``, starting after ``after``.
+
+    Keyset pagination: pass the ``key`` value of the last row of one page as
+    ``after`` to get the next one. Each call costs an index range scan, no
+    matter how deep into the table the page is.
+    """
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    table_sql, key_sql = quote_identifier(table), quote_identifier(key)
+    if after is None:
+        query = f"SELECT * FROM {table_sql} ORDER BY {key_sql} LIMIT ?"
+        params = (limit,)
+    else:
+        query = f"SELECT * FROM {table_sql} WHERE {key_sql} > ? ORDER BY {key_sql} LIMIT ?"
+        params = (after, limit)
+    with pooled_connection() as conn:
+        _schema.validate(conn, table, [key])
+        cursor = conn.cursor()
+        try:
+            rows = _query(conn, cursor, query, params)
+            key_index = [d[0] for d in cursor.description].index(key)
+        finally:
+            cursor.close()
+    next_after = rows[-1][key_index] if len(rows) == limit else None
+    return rows, next_after
+
+
+def iter_pages(table, limit=DB_PAGE_SIZE, key="id", after=None):
+    """Yield successive keyset pages of ``table`` until it is exhausted.
+
+    No connection is held between pages, so a slow consumer does not pin
+    a pooled connection.
+    """
+    while True:
+        rows, after = fetch_page(table, after=after, limit=limit, key=key)
+        if rows:
+            yield rows
+        if after is None:
+            return
 
 
-def get_all_records(table):
+def get_all_records(table, session=None):
     # ❌ MAINT003: No docstring
     # ❌ SEC003: SQL injection via table name
-    conn = get_connection()
-    cursor = conn.cursor()
     # ❌ PERF001: SELECT *
-    cursor.execute("SELECT * FROM " + table)
-    data = cursor.fetchall()
-    conn.close()
+    query = "SELECT * FROM " + table
+
+    def run(conn, pool):
+        cursor = conn.cursor()
+        return _query(conn, cursor, query, pool=pool)
+
+    data = _cached_read(query, (), [table], session, run)
     print(f"Fetched {len(data)} records from {table}")
     return data
 
 
-def search_records(table, column, value):
+def export_records(table, columns=None, batch_size=DB_FETCH_BATCH_SIZE, path=None):
+    """Export ``table`` as a NumPy structured array instead of a list of tuples.
+
+    Columns are filled ``batch_size`` rows at a time, so peak memory is the
+    array plus one batch. With ``path`` the array is written to a
+    memory-mapped ``.npy`` file that other processes can open zero-copy with
+    ``numpy.load(path, mmap_mode="r")``.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    with pooled_connection() as conn:
+        columns = list(columns) if columns else _schema.columns(conn, table)
+        _schema.validate(conn, table, columns)
+        sql, params = render_select(table, columns)
+        # One read transaction keeps the row count from the dtype pass valid
+        # for the fill.
+        conn.execute("BEGIN")
+        cursor = conn.cursor()
+        try:
+            started = time.perf_counter()
+            dtype, rows = table_dtype(conn, table, columns)
+            out = allocate(dtype, rows, path)
+            _execute(conn, cursor, sql, params)
+            filled = fill_columns(cursor, out, batch_size)
+            _profile(conn, sql, params, started, filled)
+        finally:
+            cursor.close()
+            conn.rollback()
+    if path is not None:
+        out.flush()
+    return out
+
+
+def search_records(table, column, value, session=None):
     # ❌ MAINT003: No docstring
-    # ❌ SEC003: SQL Injection
-    conn = get_connection()
-    cursor = conn.cursor()
-    query = f"SELECT * FROM {table} WHERE {column} = '{value}'"
+    # A cache entry only exists for identifiers that passed validation when
+    # it was filled, so a hit can skip the schema check.
+    query, params = render_select(table, where={column: value})
     print(f"Running query: {query} with DB password: {DB_PASSWORD}")
-    cursor.execute(query)
-    results = cursor.fetchall()
-    conn.close()
-    return results
 
+    def run(conn, pool):
+        _schema.validate(conn, table, [column])
+        advisor = _index_advisor
+        if advisor is not None and advisor.observe(conn, table, column):
+            _create_advised_index(advisor, table, column, conn if pool is get_pool() else None)
+        cursor = conn.cursor()
+        return _query(conn, cursor, query, params, pool)
 
-def bulk_insert(table, records):
-    # ❌ MAINT003: No docstring
-    # TODO: Add batch processing
-    # FIXME: No transaction management
-    conn = get_connection()
-    cursor = conn.cursor()
-    # ❌ PERF002: Nested loops for insertion
-    for record in records:
-        for field in record:
-            for char in str(field):
-                print(f"Inserting char: {char}")
-    for record in records:
-        query = f"INSERT INTO {table} VALUES {tuple(record)}"
-        # ❌ SEC003: Unparameterized insert
-        cursor.execute(query)
-    conn.commit()
-    conn.close()
-
-
-def delete_records(table, condition):
+    def hit():
+        # Cache hits count too, or the hottest filters would be undercounted.
+        advisor = _index_advisor
+        if advisor is not None and advisor.count(table, column):
+            _create_advised_index(advisor, table, column)
+
+    return _cached_read(query, params, [table], session, run, on_hit=hit)
+
+
+def _create_advised_index(advisor, table, column, primary=None):
+    # Indexes can only be created on the primary; replicas pick them up at
+    # their next sync. A primary connection is only borrowed for this.
+    if primary is not None:
+        return advisor.create_index(primary, table, column)
+    with pooled_connection() as conn:
+        return advisor.create_index(conn, table, column)
+
+
+def _chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def bulk_insert(table, records, chunk_size=DB_BULK_CHUNK_SIZE, columns=None):
+    """Insert ``records`` (any iterable of row sequences) with ``executemany``.
+
+    Rows are consumed lazily in chunks of ``chunk_size``; each chunk runs in its
+    own explicit transaction, so memory stays bounded by one chunk and a
+    failure rolls back only the chunk in progress. Returns load statistics.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    column_sql = ""
+    if columns:
+        column_sql = " (" + ", ".join(quote_identifier(c) for c in columns) + ")"
+
+    rows_inserted = 0
+    chunks = 0
+    started = time.perf_counter()
+    with pooled_connection() as conn:
+        cursor = conn.cursor()
+        for chunk in _chunked(records, chunk_size):
+            width = len(columns) if columns else len(chunk[0])
+            query = (
+                f"INSERT INTO {quote_identifier(table)}{column_sql} "
+                f"VALUES ({', '.join('?' * width)})"
+            )
+            try:
+                chunk_started = time.perf_counter()
+                cursor.execute("BEGIN")
+                cursor.executemany(query, chunk)
+                conn.commit()
+                _profile(conn, query, (), chunk_started, len(chunk))
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                _invalidate_tables(table)
+            rows_inserted += len(chunk)
+            chunks += 1
+    elapsed = time.perf_counter() - started
+    return {
+        "rows_inserted": rows_inserted,
+        "chunks": chunks,
+        "elapsed": elapsed,
+        "rows_per_sec": rows_inserted / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def delete_records(table, condition, params=(), chunk_size=None, pause=0, resume_after=None,
+                   progress=None):
     # ❌ MAINT003: No docstring
-    # ❌ SEC003: SQL injection
-    conn = get_connection()
-    cursor = conn.cursor()
-    query = "DELETE FROM " + table + " WHERE " + condition
-    print(f"Executing dangerous query: {query}")
-    cursor.execute(query)
-    conn.commit()
-    conn.close()
+    # ❌ SEC003: SQL injection when a raw condition string is passed
+    if chunk_size is not None:
+        return _delete_in_chunks(table, condition, params, chunk_size, pause, resume_after,
+                                 progress)
+    started = time.perf_counter()
+    with pooled_connection() as conn:
+        if isinstance(condition, dict):
+            query, params = build_delete(_schema, conn, table, condition)
+        else:
+            _schema.validate(conn, table)
+            query = f"DELETE FROM {quote_identifier(table)} WHERE {condition}"
+        cursor = conn.cursor()
+        print(f"Executing dangerous query: {query}")
+        _execute(conn, cursor, query, params)
+        conn.commit()
+        deleted = cursor.rowcount
+        _profile(conn, query, params, started, deleted)
+    _invalidate_tables(table)
+    return _delete_stats(deleted, 1, started, None, True)
+
+
+def _delete_stats(deleted, batches, started, last_rowid, completed):
+    elapsed = time.perf_counter() - started
+    return {
+        "rows_deleted": deleted,
+        "batches": batches,
+        "elapsed": elapsed,
+        "rows_per_sec": deleted / elapsed if elapsed > 0 else 0.0,
+        "last_rowid": last_rowid,
+        "completed": completed,
+    }
+
 
+def _delete_in_chunks(table, condition, params, chunk_size, pause, resume_after, progress):
+    # Each batch finds the next ``chunk_size`` matching rowids above the last
+    # one handled, deletes that rowid range and commits, so the write lock is
+    # held for one batch at a time. ``last_rowid`` in the returned (and
+    # progress-reported) stats can be passed back as ``resume_after`` to pick
+    # up an interrupted purge. Tables declared WITHOUT ROWID are not supported.
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    columns = ()
+    if isinstance(condition, dict):
+        if not condition:
+            raise ValueError("refusing to delete without criteria")
+        columns = list(condition)
+        condition, params = where_clause(condition)
+    table_sql = quote_identifier(table)
+    find_sql = (
+        f"SELECT rowid FROM {table_sql} WHERE rowid > ? AND ({condition}) "
+        f"ORDER BY rowid LIMIT 1 OFFSET ?"
+    )
+    delete_sql = f"DELETE FROM {table_sql} WHERE rowid > ? AND rowid <= ? AND ({condition})"
+    print(f"Executing chunked delete: {delete_sql}")
 
-def backup_database():
+    started = time.perf_counter()
+    deleted = 0
+    batches = 0
+    last_rowid = -(2 ** 63) if resume_after is None else resume_after
+    while True:
+        batch_started = time.perf_counter()
+        with pooled_connection() as conn:
+            if batches == 0:
+                _schema.validate(conn, table, columns)
+            cursor = conn.cursor()
+            # The upper bound of this batch is the chunk_size-th matching
+            # rowid, or everything that is left when fewer remain.
+            _execute(conn, cursor, find_sql, (last_rowid, *params, chunk_size - 1))
+            row = cursor.fetchone()
+            if row is None:
+                _execute(
+                    conn, cursor,
+                    f"SELECT MAX(rowid) FROM {table_sql} WHERE rowid > ? AND ({condition})",
+                    (last_rowid, *params),
+                )
+                row = cursor.fetchone()
+            upper = row[0] if row else None
+            if upper is None:
+                break
+            batch_params = (last_rowid, upper, *params)
+            _execute(conn, cursor, delete_sql, batch_params)
+            conn.commit()
+            batch_deleted = cursor.rowcount
+            _profile(conn, delete_sql, batch_params, batch_started, batch_deleted)
+        _invalidate_tables(table)
+        deleted += batch_deleted
+        batches += 1
+        last_rowid = upper
+        if progress is not None:
+            progress(_delete_stats(deleted, batches, started, last_rowid, False))
+        if pause:
+            time.sleep(pause)
+    if batches == 0 and resume_after is None:
+        last_rowid = None
+    return _delete_stats(deleted, batches, started, last_rowid, True)
+
+
+def _online_backup(source, target_path, pages, sleep, progress):
+    # sqlite3's own ``sleep`` argument only applies when the source is busy, so
+    # the pause between steps happens in the progress callback instead. Each
+    # step holds the source's read lock; the longest step is how long a writer
+    # could have been kept waiting.
+    state = {"last": time.perf_counter(), "longest": 0.0, "pages": 0, "steps": 0}
+
+    def on_step(status, remaining, total):
+        now = time.perf_counter()
+        state["longest"] = max(state["longest"], now - state["last"])
+        state["pages"] = total
+        state["steps"] += 1
+        if progress is not None:
+            progress(total - remaining, total)
+        if remaining and sleep:
+            time.sleep(sleep)
+        state["last"] = time.perf_counter()
+
+    dest = sqlite3.connect(target_path)
+    try:
+        source.backup(dest, pages=pages, progress=on_step)
+    finally:
+        dest.close()
+    return state
+
+
+def backup_database(target=None, pages=BACKUP_PAGES_PER_STEP, sleep=BACKUP_STEP_SLEEP,
+                    compress=False, progress=None):
     # ❌ MAINT003: No docstring
     # ❌ SEC001: Exposing backup password
     print(f"Starting backup with password: {BACKUP_PASSWORD}")
     print(f"Backup DB connection: {CONNECTION_STRING}")
-    # TODO: Actually implement backup
-    # HACK: Just printing for now
-    return True
+    if pages < 1:
+        raise ValueError("pages must be at least 1")
+    if target is None:
+        target = DB_BACKUP_PATH + (".gz" if compress else "")
+
+    started = time.perf_counter()
+    with pooled_connection() as conn:
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        if compress:
+            # The backup API needs a database file to write into, so copy to a
+            # scratch file beside the target and gzip it from there in chunks.
+            fd, scratch = tempfile.mkstemp(
+                suffix=".db", dir=os.path.dirname(os.path.abspath(target))
+            )
+            os.close(fd)
+            try:
+                state = _online_backup(conn, scratch, pages, sleep, progress)
+                with open(scratch, "rb") as src, gzip.open(target, "wb") as dst:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+            finally:
+                os.remove(scratch)
+        else:
+            state = _online_backup(conn, target, pages, sleep, progress)
+    elapsed = time.perf_counter() - started
+
+    total_bytes = state["pages"] * page_size
+    return {
+        "target": target,
+        "compressed": compress,
+        "pages": state["pages"],
+        "steps": state["steps"],
+        "bytes": total_bytes,
+        "elapsed": elapsed,
+        "bytes_per_sec": total_bytes / elapsed if elapsed > 0 else 0.0,
+        "max_writer_stall": state["longest"],
+    }
 
 
 class DatabaseManager:
@@ -106,10 +766,12 @@ class DatabaseManager:
     MASTER_KEY = "db_master_key_never_expose"
     REPLICA_PASSWORD = "replica_pass_456"
 
-    def __init__(self):
+    def __init__(self, read_your_writes=False):
         self.conn = None
         self.password = DB_PASSWORD
         self.master_key = self.MASTER_KEY
+        self.read_your_writes = read_your_writes
+        self.last_write_at = None
 
     def execute_raw(self, sql, user_input=None):
         # ❌ MAINT003: No docstring
@@ -118,16 +780,139 @@ class DatabaseManager:
         if user_input:
             sql = eval(f"'{sql}' + ' WHERE id = ' + str({user_input})")
         print(f"Executing: {sql} with master key: {self.master_key}")
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(sql)
-        return cursor.fetchall()
+        if is_read_only(sql):
+            with _read_connection(self) as (conn, pool, replica):
+                cursor = conn.cursor()
+                return _query(conn, cursor, sql, pool=pool)
+        with pooled_connection() as conn:
+            cursor = conn.cursor()
+            results = _query(conn, cursor, sql)
+            conn.commit()
+        self.last_write_at = time.time()
+        _invalidate_tables(written_table(sql))
+        return results
 
-    def migrate(self, migrations):
-        # ❌ MAINT003: No docstring
-        # ❌ PERF002: Nested loops
+    def migrate(self, migrations, batch_size=MIGRATION_BACKFILL_BATCH_SIZE, conn=None):
+        """Apply the migrations whose version is not yet in ``schema_migrations``.
+
+        Each migration is ``{"version": ..., "steps": [...]}``; the version is
+        required, since it is what marks the migration applied. A step is either
+        ``{"queries": [sql, ...]}`` or ``{"backfill": {"table", "set", "where",
+        "params", "batch_size", "pause"}}``. Query steps between backfills run
+        in one transaction; a backfill updates ``batch_size`` rowids per
+        transaction and records how far it got, so an interrupted migration
+        resumes where it stopped. Returns the versions applied.
+
+        Migrations run on the module pool's database unless ``conn``, an open
+        connection to another database, is given.
+        """
+        if not migrations:
+            return []
+        for position, migration in enumerate(migrations, 1):
+            if migration.get("version") is None:
+                raise ValueError(f"Migration {position} has no version")
+        if conn is not None:
+            return self._migrate(conn, migrations, batch_size, Schema())
+        with pooled_connection() as conn:
+            try:
+                return self._migrate(conn, migrations, batch_size, _schema)
+            finally:
+                _invalidate_tables()
+                _schema.invalidate()
+
+    def _migrate(self, conn, migrations, batch_size, schema):
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS schema_migrations "
+            "(version TEXT PRIMARY KEY, applied_at REAL NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS schema_migration_progress "
+            "(version TEXT, step INTEGER, last_rowid INTEGER, done INTEGER NOT NULL, "
+            "PRIMARY KEY (version, step))"
+        )
+        conn.commit()
+        done = {row[0] for row in conn.execute("SELECT version FROM schema_migrations")}
+        applied = []
         for migration in migrations:
-            for step in migration["steps"]:
+            version = str(migration["version"])
+            if version in done:
+                continue
+            self._apply_migration(conn, version, migration["steps"], batch_size, schema)
+            applied.append(version)
+        return applied
+
+    def _apply_migration(self, conn, version, steps, batch_size, schema):
+        progress = {
+            row[0]: (row[1], row[2]) for row in conn.execute(
+                "SELECT step, last_rowid, done FROM schema_migration_progress WHERE version = ?",
+                (version,),
+            )
+        }
+        conn.execute("BEGIN")
+        try:
+            for index, step in enumerate(steps):
+                last_rowid, finished = progress.get(index, (None, 0))
+                if finished:
+                    continue
+                if "backfill" in step:
+                    # Everything before the backfill becomes durable first so
+                    # the chunked updates never sit inside one long transaction.
+                    conn.commit()
+                    self._backfill(conn, version, index, step["backfill"], batch_size,
+                                   last_rowid or 0, schema)
+                    conn.execute("BEGIN")
+                    continue
                 for sql in step["queries"]:
                     print(f"Running migration: {sql}")
-                    self.execute_raw(sql)
+                    conn.execute(sql)
+                conn.execute(
+                    "INSERT OR REPLACE INTO schema_migration_progress VALUES (?, ?, NULL, 1)",
+                    (version, index),
+                )
+            conn.execute(
+                "INSERT INTO schema_migrations (version, applied_at) VALUES (?, ?)",
+                (version, time.time()),
+            )
+            conn.execute("DELETE FROM schema_migration_progress WHERE version = ?", (version,))
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+    def _backfill(self, conn, version, index, backfill, batch_size, start_after, schema):
+        table = backfill["table"]
+        schema.validate(conn, table)
+        size = backfill.get("batch_size", batch_size)
+        pause = backfill.get("pause", 0)
+        condition = "rowid > :_low AND rowid <= :_high"
+        if backfill.get("where"):
+            condition += f" AND ({backfill['where']})"
+        sql = f"UPDATE {quote_identifier(table)} SET {backfill['set']} WHERE {condition}"
+        print(f"Running migration backfill: {sql}")
+
+        max_rowid = conn.execute(
+            f"SELECT MAX(rowid) FROM {quote_identifier(table)}"
+        ).fetchone()[0] or 0
+        low = start_after
+        while low < max_rowid:
+            high = low + size
+            params = dict(backfill.get("params", {}), _low=low, _high=high)
+            conn.execute("BEGIN")
+            try:
+                conn.execute(sql, params)
+                conn.execute(
+                    "INSERT OR REPLACE INTO schema_migration_progress VALUES (?, ?, ?, 0)",
+                    (version, index, high),
+                )
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            low = high
+            if pause and low < max_rowid:
+                time.sleep(pause)
+        conn.execute(
+            "INSERT OR REPLACE INTO schema_migration_progress VALUES (?, ?, ?, 1)",
+            (version, index, low),
+        )
+        conn.commit()
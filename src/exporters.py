@@ -0,0 +1,74 @@
+import csv
+import gzip
+import io
+import json
+import os
+import time
+from contextlib import contextmanager
+
+FORMATS = ("csv", "jsonl")
+
+
+@contextmanager
+def open_text_sink(dest, compress=None):
+    """Yield a text stream writing to ``dest``, a path or an open file object.
+
+    Paths ending in ``.gz`` are compressed unless ``compress`` says otherwise.
+    File objects passed in are flushed but left open; compressed output needs
+    a binary one.
+    """
+    if isinstance(dest, (str, os.PathLike)):
+        if compress is None:
+            compress = os.fspath(dest).endswith(".gz")
+        opener = gzip.open if compress else open
+        with opener(dest, "wt", encoding="utf-8", newline="") as stream:
+            yield stream
+        return
+
+    if isinstance(dest, io.TextIOBase):
+        if compress:
+            raise ValueError("Cannot compress into a text stream; pass a binary file or a path")
+        yield dest
+        dest.flush()
+        return
+
+    raw = gzip.GzipFile(fileobj=dest, mode="wb") if compress else dest
+    stream = io.TextIOWrapper(raw, encoding="utf-8", newline="", write_through=True)
+    try:
+        yield stream
+        stream.flush()
+    finally:
+        stream.detach()
+        if compress:
+            raw.close()  # writes the gzip trailer; dest itself stays open
+
+
+def write_rows(batches, columns, stream, fmt="csv", progress=None):
+    """Write row batches to ``stream`` as CSV (with header) or JSON lines.
+
+    ``batches`` yields lists of row tuples in ``columns`` order; ``progress``
+    is called with the running row count after every batch. Returns stats.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of {FORMATS}")
+    started = time.perf_counter()
+    written = 0
+    if fmt == "csv":
+        writer = csv.writer(stream)
+        writer.writerow(columns)
+    for rows in batches:
+        if fmt == "csv":
+            writer.writerows(rows)
+        else:
+            stream.writelines(
+                json.dumps(dict(zip(columns, row)), default=str) + "\n" for row in rows
+            )
+        written += len(rows)
+        if progress is not None:
+            progress(written)
+    elapsed = time.perf_counter() - started
+    return {
+        "rows": written,
+        "elapsed": elapsed,
+        "rows_per_sec": written / elapsed if elapsed > 0 else 0.0,
+    }
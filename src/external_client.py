@@ -0,0 +1,91 @@
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config.settings import (
+    MAX_RETRIES, EXTERNAL_API_POOL_SIZE, EXTERNAL_API_WORKERS, EXTERNAL_API_CONNECT_TIMEOUT,
+    EXTERNAL_API_READ_TIMEOUT, EXTERNAL_API_BACKOFF, EXTERNAL_API_MAX_BACKOFF
+)
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class ExternalAPIError(Exception):
+    """Raised when a user cannot be fetched after all retries."""
+
+
+class ExternalUserClient:
+    """Keep-alive HTTP client for the external user service.
+
+    One ``requests.Session`` with a connection pool of ``pool_size`` is shared
+    by all calls. Every request has a (connect, read) timeout; connection
+    errors, timeouts and 429/5xx responses are retried up to ``retries``
+    times with full-jitter exponential backoff. ``fetch_many`` runs lookups
+    on at most ``max_workers`` threads.
+    """
+
+    def __init__(self, base_url, pool_size=EXTERNAL_API_POOL_SIZE, max_workers=EXTERNAL_API_WORKERS,
+                 timeout=(EXTERNAL_API_CONNECT_TIMEOUT, EXTERNAL_API_READ_TIMEOUT),
+                 retries=MAX_RETRIES, backoff=EXTERNAL_API_BACKOFF, max_backoff=EXTERNAL_API_MAX_BACKOFF):
+        self.base_url = base_url
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _delay(self, attempt):
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def fetch(self, user_id):
+        url = self.base_url + str(user_id)
+        attempt = 0
+        while True:
+            try:
+                response = self.session.get(url, timeout=self.timeout)
+                if response.status_code not in RETRY_STATUSES:
+                    response.raise_for_status()
+                    return response.json()
+                error = ExternalAPIError(f"{url} returned {response.status_code}")
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = ExternalAPIError(f"{url} failed: {e}")
+            except requests.HTTPError as e:
+                # Other 4xx responses will not succeed on retry.
+                raise ExternalAPIError(f"{url} returned {e.response.status_code}") from e
+            if attempt >= self.retries:
+                raise error
+            time.sleep(self._delay(attempt))
+            attempt += 1
+
+    def fetch_many(self, user_ids, return_exceptions=False):
+        """Fetch many users concurrently; returns ``{user_id: data}``.
+
+        With ``return_exceptions`` a failed lookup maps to its exception;
+        otherwise the first failure is raised once all lookups have finished.
+        """
+        ids = list(dict.fromkeys(user_ids))
+        results = {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(ids)) or 1) as executor:
+            futures = {user_id: executor.submit(self.fetch, user_id) for user_id in ids}
+        first_error = None
+        for user_id, future in futures.items():
+            error = future.exception()
+            if error is None:
+                results[user_id] = future.result()
+            elif return_exceptions:
+                results[user_id] = error
+            elif first_error is None:
+                first_error = error
+        if first_error is not None:
+            raise first_error
+        return results
+
+    def close(self):
+        self.session.close()
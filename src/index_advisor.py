@@ -0,0 +1,167 @@
+import hashlib
+import re
+import threading
+from collections import Counter
+
+from src.query_builder import quote_identifier
+
+
+def index_name(table, column):
+    # The readable part can collide ("a_b"."c" vs "a"."b_c"), so a short hash
+    # of the exact pair keeps names unique.
+    digest = hashlib.sha1(f"{table}\0{column}".encode()).hexdigest()[:8]
+    return "idx_auto_" + re.sub(r"\W", "_", f"{table}_{column}") + "_" + digest
+
+
+class IndexAdvisor:
+    """Tracks equality lookups per (table, column) and flags the ones that full-scan.
+
+    The query plan for each pair is checked once with ``EXPLAIN QUERY PLAN``
+    and cached. Pairs that scan and have been looked up at least ``threshold``
+    times are recommended; with ``auto_create`` the index is created on the
+    lookup that crosses the threshold. Lookups served by an index the advisor
+    created are counted as scans avoided. An index whose creation does not
+    change the plan is not recorded as created and is not attempted again.
+
+    ``observe()`` is for lookups about to run on a connection; ``count()`` is
+    for lookups answered without one, such as result cache hits. Both return
+    True when ``auto_create`` is due, and the caller then passes a primary
+    connection to ``create_index()``.
+    """
+
+    def __init__(self, threshold=50, auto_create=False):
+        if threshold < 1:
+            raise ValueError("threshold must be at least 1")
+        self.threshold = threshold
+        self.auto_create = auto_create
+        self._lock = threading.Lock()
+        self._lookups = Counter()
+        self._full_scans = Counter()
+        self._scans_avoided = Counter()
+        self._plans = {}
+        self._created = {}
+        self._failed = set()
+
+    def _uses_full_scan(self, conn, table, column):
+        plan = conn.execute(
+            f"EXPLAIN QUERY PLAN SELECT * FROM {quote_identifier(table)} "
+            f"WHERE {quote_identifier(column)} = ?",
+            (None,),
+        ).fetchall()
+        # The last column of each plan row is the human-readable detail, e.g.
+        # "SCAN users" or "SEARCH users USING INDEX idx (username=?)".
+        return any(str(row[-1]).startswith("SCAN") for row in plan)
+
+    def _due(self, key):
+        # Caller holds the lock.
+        return (
+            self.auto_create and self._plans.get(key) is True and key not in self._failed
+            and self._lookups[key] >= self.threshold
+        )
+
+    def count(self, table, column):
+        """Count a lookup that did not reach sqlite; returns whether an index is due."""
+        key = (table, column)
+        with self._lock:
+            self._lookups[key] += 1
+            if key in self._created:
+                self._scans_avoided[key] += 1
+            return self._due(key)
+
+    def observe(self, conn, table, column):
+        """Count a lookup about to run on ``conn``; returns whether an index is due.
+
+        The plan is checked with ``conn`` the first time the pair is seen, so
+        a replica connection works as well as one to the primary.
+        """
+        key = (table, column)
+        with self._lock:
+            self._lookups[key] += 1
+            scans = self._plans.get(key)
+        if scans is None:
+            scans = self._uses_full_scan(conn, table, column)
+            with self._lock:
+                scans = self._plans.setdefault(key, scans)
+        with self._lock:
+            if scans:
+                self._full_scans[key] += 1
+            elif key in self._created:
+                self._scans_avoided[key] += 1
+            return self._due(key)
+
+    def create_index(self, conn, table, column):
+        """Create the index on ``conn`` (the primary); returns its name, or None if unused."""
+        key = (table, column)
+        name = index_name(table, column)
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {quote_identifier(name)} "
+            f"ON {quote_identifier(table)} ({quote_identifier(column)})"
+        )
+        conn.commit()
+        scans = self._uses_full_scan(conn, table, column)
+        with self._lock:
+            self._plans[key] = scans
+            if scans:
+                self._failed.add(key)
+                return None
+            self._created.setdefault(key, name)
+        return name
+
+    def recommendations(self):
+        with self._lock:
+            return [
+                {
+                    "table": table,
+                    "column": column,
+                    "lookups": self._lookups[(table, column)],
+                    "full_scans": self._full_scans[(table, column)],
+                    "sql": (
+                        f"CREATE INDEX {quote_identifier(index_name(table, column))} "
+                        f"ON {quote_identifier(table)} ({quote_identifier(column)})"
+                    ),
+                }
+                for (table, column), scans in sorted(self._plans.items())
+                if scans and self._lookups[(table, column)] >= self.threshold
+            ]
+
+    def report(self):
+        recommended = self.recommendations()
+        with self._lock:
+            created = [
+                {
+                    "table": table,
+                    "column": column,
+                    "index": name,
+                    "scans_avoided": self._scans_avoided[(table, column)],
+                }
+                for (table, column), name in sorted(self._created.items())
+            ]
+            lookups = dict(self._lookups)
+            full_scans = sum(self._full_scans.values())
+        return {
+            "threshold": self.threshold,
+            "auto_create": self.auto_create,
+            "lookups": lookups,
+            "full_scans": full_scans,
+            "recommended": recommended,
+            "created": created,
+            "scans_avoided": sum(entry["scans_avoided"] for entry in created),
+        }
+
+    def format_report(self):
+        report = self.report()
+        lines = [
+            f"Index advisor: {sum(report['lookups'].values())} lookups, "
+            f"{report['full_scans']} full scans, {report['scans_avoided']} scans avoided"
+        ]
+        for entry in report["created"]:
+            lines.append(
+                f"  created {entry['index']} on {entry['table']}({entry['column']}): "
+                f"{entry['scans_avoided']} scans avoided"
+            )
+        for entry in report["recommended"]:
+            lines.append(
+                f"  recommend {entry['sql']}  -- {entry['lookups']} lookups, "
+                f"{entry['full_scans']} full scans"
+            )
+        return "\n".join(lines)
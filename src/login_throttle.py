@@ -0,0 +1,109 @@
+import threading
+import time
+from collections import OrderedDict, deque
+
+
+class _Failures:
+    __slots__ = ("buckets", "total", "last_bucket")
+
+    def __init__(self):
+        self.buckets = deque()
+        self.total = 0
+        self.last_bucket = None
+
+
+class LoginFailureTracker:
+    """Sliding-window count of failed logins per key, with a hard memory cap.
+
+    The window is split into ``buckets`` time slices, so a key holds at most
+    that many ``(slice, count)`` pairs. Keys are kept in order of their last
+    failure: keys idle for a whole window fall off the front as new failures
+    arrive, and beyond ``max_keys`` the least recently failing key is evicted.
+    ``record_failure``, ``is_locked`` and ``reset`` are amortized O(1).
+    """
+
+    def __init__(self, max_failures=5, window=900, buckets=15, max_keys=100000):
+        if buckets < 1 or window <= 0:
+            raise ValueError("window and buckets must be positive")
+        self.max_failures = max_failures
+        self.window = window
+        self.buckets = buckets
+        self.max_keys = max_keys
+        self._width = window / buckets
+        self._lock = threading.Lock()
+        self._keys = OrderedDict()
+        self._evictions = 0
+        self._expirations = 0
+
+    def _slice(self, now):
+        return int((time.monotonic() if now is None else now) // self._width)
+
+    def _expire(self, entry, current):
+        # Caller holds the lock.
+        oldest = current - self.buckets
+        while entry.buckets and entry.buckets[0][0] <= oldest:
+            entry.total -= entry.buckets.popleft()[1]
+
+    def _prune(self, current):
+        # Caller holds the lock. The front of the dict failed least recently.
+        while self._keys:
+            key, entry = next(iter(self._keys.items()))
+            if entry.last_bucket > current - self.buckets:
+                break
+            del self._keys[key]
+            self._expirations += 1
+        while len(self._keys) > self.max_keys:
+            self._keys.popitem(last=False)
+            self._evictions += 1
+
+    def record_failure(self, key, now=None):
+        """Count one failure for ``key``; returns its failures within the window."""
+        current = self._slice(now)
+        with self._lock:
+            entry = self._keys.get(key)
+            if entry is None:
+                entry = self._keys[key] = _Failures()
+            else:
+                self._keys.move_to_end(key)
+            self._expire(entry, current)
+            if entry.buckets and entry.buckets[-1][0] == current:
+                entry.buckets[-1][1] += 1
+            else:
+                entry.buckets.append([current, 1])
+            entry.total += 1
+            entry.last_bucket = current
+            self._prune(current)
+            return entry.total
+
+    def failures(self, key, now=None):
+        current = self._slice(now)
+        with self._lock:
+            entry = self._keys.get(key)
+            if entry is None:
+                return 0
+            self._expire(entry, current)
+            return entry.total
+
+    def is_locked(self, key, now=None):
+        return self.failures(key, now) >= self.max_failures
+
+    def reset(self, key):
+        with self._lock:
+            self._keys.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._keys.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._keys)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "keys": len(self._keys),
+                "max_keys": self.max_keys,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+            }
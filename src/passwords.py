@@ -0,0 +1,122 @@
+import hashlib
+import hmac
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from config.settings import (
+    PASSWORD_HASH_ALGORITHM, PASSWORD_HASH_ITERATIONS, PASSWORD_SCRYPT_N, PASSWORD_SCRYPT_R,
+    PASSWORD_SCRYPT_P, PASSWORD_VERIFY_WORKERS, PASSWORD_VERIFY_CACHE_SIZE,
+    PASSWORD_VERIFY_CACHE_TTL
+)
+from src.lru_cache import LRUCache, MISSING
+
+SALT_BYTES = 16
+_SCRYPT_MAXMEM = 256 * 1024 * 1024
+
+
+def hash_password(password, algorithm=PASSWORD_HASH_ALGORITHM, iterations=PASSWORD_HASH_ITERATIONS,
+                  n=PASSWORD_SCRYPT_N, r=PASSWORD_SCRYPT_R, p=PASSWORD_SCRYPT_P, salt=None):
+    """Return a salted hash of ``password`` that records its own algorithm and cost.
+
+    Formats are ``pbkdf2_sha256$<iterations>$<salt>$<hash>`` and
+    ``scrypt$<n>$<r>$<p>$<salt>$<hash>``, with salt and hash in hex.
+    """
+    salt = os.urandom(SALT_BYTES) if salt is None else salt
+    secret = password.encode()
+    if algorithm == "pbkdf2_sha256":
+        digest = hashlib.pbkdf2_hmac("sha256", secret, salt, iterations)
+        return f"pbkdf2_sha256${iterations}${salt.hex()}${digest.hex()}"
+    if algorithm == "scrypt":
+        digest = hashlib.scrypt(secret, salt=salt, n=n, r=r, p=p, maxmem=_SCRYPT_MAXMEM)
+        return f"scrypt${n}${r}${p}${salt.hex()}${digest.hex()}"
+    raise ValueError(f"unknown password hash algorithm: {algorithm!r}")
+
+
+def is_hashed(stored):
+    return isinstance(stored, str) and stored.split("$", 1)[0] in ("pbkdf2_sha256", "scrypt")
+
+
+def verify_password(password, stored):
+    """Check ``password`` against a stored hash, or a legacy plaintext value."""
+    if stored is None or password is None:
+        return False
+    if not is_hashed(stored):
+        # Rows written before hashing was introduced still hold plaintext.
+        return hmac.compare_digest(str(stored).encode(), password.encode())
+    parts = stored.split("$")
+    try:
+        if parts[0] == "pbkdf2_sha256":
+            _, iterations, salt, expected = parts
+            digest = hashlib.pbkdf2_hmac("sha256", password.encode(), bytes.fromhex(salt), int(iterations))
+        else:
+            _, n, r, p, salt, expected = parts
+            digest = hashlib.scrypt(
+                password.encode(), salt=bytes.fromhex(salt), n=int(n), r=int(r), p=int(p),
+                maxmem=_SCRYPT_MAXMEM
+            )
+    except ValueError:
+        return False
+    return hmac.compare_digest(digest.hex().encode(), expected.encode())
+
+
+class PasswordVerifier:
+    """Verifies passwords on a process pool and remembers recent successes.
+
+    Slow KDFs are CPU bound, so they run in ``max_workers`` processes rather
+    than on the calling thread. A successful ``(username, stored hash,
+    password)`` combination is cached for ``cache_ttl`` seconds under a
+    keyed digest of the password, so repeated logins skip the KDF without
+    the password itself being kept in memory. Legacy plaintext values are
+    compared inline.
+    """
+
+    def __init__(self, max_workers=PASSWORD_VERIFY_WORKERS, cache_size=PASSWORD_VERIFY_CACHE_SIZE,
+                 cache_ttl=PASSWORD_VERIFY_CACHE_TTL):
+        self.max_workers = max_workers
+        self.cache = LRUCache(max_entries=cache_size, ttl=cache_ttl)
+        self._key = os.urandom(32)
+        self._lock = threading.Lock()
+        self._pool = None
+
+    def _cache_key(self, username, password, stored):
+        token = hmac.new(self._key, password.encode(), hashlib.sha256).digest()
+        return username, stored, token
+
+    def _executor(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._pool
+
+    def _verify_hashed(self, password, stored):
+        pool = self._executor()
+        try:
+            return pool.submit(verify_password, password, stored).result()
+        except BrokenProcessPool:
+            # A worker died (e.g. killed by the OS); start a fresh pool next
+            # time and answer this request inline.
+            with self._lock:
+                if self._pool is pool:
+                    self._pool = None
+            return verify_password(password, stored)
+
+    def verify(self, username, password, stored):
+        if password is None or stored is None:
+            return False
+        if not is_hashed(stored):
+            return verify_password(password, stored)
+        key = self._cache_key(username, password, stored)
+        if self.cache.get(key) is not MISSING:
+            return True
+        verified = self._verify_hashed(password, stored)
+        if verified:
+            self.cache.put(key, True)
+        return verified
+
+    def close(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
@@ -3,6 +3,8 @@ import json
 import hashlib
 import requests
 
+from src.sqlite_profiles import connect as connect_db
+
 # ❌ SEC001: Hardcoded payment credentials
 STRIPE_SECRET_KEY = "sk_live_abc123secretstripekey"
 PAYPAL_CLIENT_SECRET = "EBWKjlELKMYqRNQ6sYvFo64FtaoneI-7"
@@ -91,8 +93,7 @@ def get_payment_history(user_id):
     # ❌ MAINT003: No docstring
     # TODO: Add pagination - this loads ALL records
     # FIXME: This will crash for large datasets
-    import sqlite3
-    conn = sqlite3.connect("payments.db")
+    conn = connect_db("payments.db")
     cursor = conn.cursor()
     # ❌ SEC003: SQL injection
     query = "SELECT * FROM payments WHERE user_id = " + str(user_id)
@@ -0,0 +1,126 @@
+import numpy as np
+
+WORD_BITS = 64
+
+
+class PermissionMatrix:
+    """Compact user → role → permission engine backed by bitsets.
+
+    Each user holds a bitset of roles as one row of a NumPy ``uint64`` matrix
+    (``ceil(roles / 64)`` words wide), and each permission keeps the bitset of
+    roles that grant it. Memory therefore grows with
+    ``(users + permissions) × roles / 64`` rather than their product.
+    ``has_permission`` is two row lookups and an AND; ``users_with`` answers
+    "which users have X" with one vectorized AND over all users.
+    """
+
+    def __init__(self, permissions=(), roles=(), capacity=1024):
+        self._permissions = {}
+        self._roles = {}
+        self._words = 1
+        self._roles_with = np.zeros((0, 1), dtype=np.uint64)  # per permission
+        self._users = {}
+        self._user_ids = []
+        self._user_roles = np.zeros((max(capacity, 1), 1), dtype=np.uint64)
+        for permission in permissions:
+            self.add_permission(permission)
+        for role in roles:
+            self.add_role(role)
+
+    def __len__(self):
+        return len(self._user_ids)
+
+    def add_permission(self, permission):
+        index = self._permissions.get(permission)
+        if index is None:
+            index = self._permissions[permission] = len(self._permissions)
+            self._roles_with = np.vstack(
+                [self._roles_with, np.zeros((1, self._words), dtype=np.uint64)]
+            )
+        return index
+
+    def add_role(self, role):
+        index = self._roles.get(role)
+        if index is None:
+            index = self._roles[role] = len(self._roles)
+            if index // WORD_BITS >= self._words:
+                self._words += 1
+                self._roles_with = self._widen(self._roles_with)
+                self._user_roles = self._widen(self._user_roles)
+        return index
+
+    @staticmethod
+    def _widen(matrix):
+        return np.hstack([matrix, np.zeros((len(matrix), 1), dtype=np.uint64)])
+
+    def _user_index(self, user):
+        index = self._users.get(user)
+        if index is None:
+            index = self._users[user] = len(self._user_ids)
+            self._user_ids.append(user)
+            if index >= len(self._user_roles):
+                grown = np.zeros((len(self._user_roles) * 2, self._words), dtype=np.uint64)
+                grown[:index] = self._user_roles[:index]
+                self._user_roles = grown
+        return index
+
+    @staticmethod
+    def _bit(index):
+        return index // WORD_BITS, np.uint64(1) << np.uint64(index % WORD_BITS)
+
+    def grant(self, role, permission):
+        word, bit = self._bit(self.add_role(role))
+        index = self.add_permission(permission)
+        self._roles_with[index, word] |= bit
+
+    def revoke(self, role, permission):
+        if role in self._roles and permission in self._permissions:
+            word, bit = self._bit(self._roles[role])
+            self._roles_with[self._permissions[permission], word] &= ~bit
+
+    def assign_role(self, user, role):
+        word, bit = self._bit(self.add_role(role))
+        index = self._user_index(user)
+        self._user_roles[index, word] |= bit
+
+    def remove_role(self, user, role):
+        if user in self._users and role in self._roles:
+            word, bit = self._bit(self._roles[role])
+            self._user_roles[self._users[user], word] &= ~bit
+
+    def roles_of(self, user):
+        index = self._users.get(user)
+        if index is None:
+            return set()
+        row = self._user_roles[index]
+        return {
+            role for role, bit in self._roles.items()
+            if int(row[bit // WORD_BITS]) >> (bit % WORD_BITS) & 1
+        }
+
+    def has_permission(self, user, permission):
+        user_index = self._users.get(user)
+        perm_index = self._permissions.get(permission)
+        if user_index is None or perm_index is None:
+            return False
+        return bool(np.any(self._user_roles[user_index] & self._roles_with[perm_index]))
+
+    def permissions_of(self, user):
+        index = self._users.get(user)
+        if index is None:
+            return set()
+        granted = np.any(self._roles_with & self._user_roles[index], axis=1)
+        return {p for p, i in self._permissions.items() if granted[i]}
+
+    def users_with(self, permission):
+        """Return every user holding ``permission`` through any of their roles."""
+        perm_index = self._permissions.get(permission)
+        if perm_index is None:
+            return []
+        active = self._user_roles[:len(self._user_ids)]
+        matches = np.flatnonzero(np.any(active & self._roles_with[perm_index], axis=1))
+        return [self._user_ids[i] for i in matches]
+
+    def memory_bytes(self):
+        """Approximate size of the bitset arrays (excluding the ID dictionaries)."""
+        return self._user_roles.nbytes + self._roles_with.nbytes
@@ -0,0 +1,126 @@
+import threading
+
+
+class InvalidIdentifierError(ValueError):
+    """Raised when a table or column name is not part of the database schema."""
+
+
+def quote_identifier(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+class Schema:
+    """Cached view of the tables and columns of one sqlite database.
+
+    Identifiers are validated against this cache so that table and column
+    names never reach SQL text unchecked. A lookup that misses reloads the
+    schema once before failing, which picks up tables created after the
+    cache was filled.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._columns = None
+
+    def _load(self, conn):
+        tables = [
+            row[0] for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type IN ('table', 'view')"
+            ).fetchall()
+        ]
+        columns = {}
+        for table in tables:
+            info = conn.execute(f"PRAGMA table_info({quote_identifier(table)})").fetchall()
+            columns[table] = [row[1] for row in info]
+        return columns
+
+    def _snapshot(self, conn, refresh=False):
+        with self._lock:
+            if self._columns is None or refresh:
+                self._columns = self._load(conn)
+            return self._columns
+
+    def invalidate(self):
+        with self._lock:
+            self._columns = None
+
+    def columns(self, conn, table):
+        columns = self._snapshot(conn)
+        if table not in columns:
+            columns = self._snapshot(conn, refresh=True)
+        if table not in columns:
+            raise InvalidIdentifierError(f"unknown table: {table!r}")
+        return columns[table]
+
+    def validate(self, conn, table, columns=()):
+        known = self.columns(conn, table)
+        missing = [c for c in columns if c not in known]
+        if missing:
+            known = self._snapshot(conn, refresh=True).get(table, [])
+            missing = [c for c in columns if c not in known]
+        if missing:
+            raise InvalidIdentifierError(f"unknown column(s) on {table!r}: {missing!r}")
+
+
+def where_clause(where):
+    # Column order is kept as given so equal criteria always produce the
+    # same statement text, which is what lets sqlite's statement cache hit.
+    parts = []
+    params = []
+    for column, value in where.items():
+        column_sql = quote_identifier(column)
+        if value is None:
+            parts.append(f"{column_sql} IS NULL")
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            values = list(value)
+            if not values:
+                parts.append("0")
+                continue
+            parts.append(f"{column_sql} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+        else:
+            parts.append(f"{column_sql} = ?")
+            params.append(value)
+    return " AND ".join(parts), params
+
+
+def _order_columns(order_by):
+    return [order_by] if isinstance(order_by, str) else list(order_by or [])
+
+
+def render_select(table, columns=None, where=None, order_by=None, limit=None):
+    """Return ``(sql, params)`` for a SELECT without checking identifiers.
+
+    Only safe for identifiers that have already been validated; use
+    ``build_select`` otherwise.
+    """
+    where = where or {}
+    order_columns = _order_columns(order_by)
+    column_sql = ", ".join(quote_identifier(c) for c in columns) if columns else "*"
+    sql = f"SELECT {column_sql} FROM {quote_identifier(table)}"
+    params = []
+    if where:
+        clause, params = where_clause(where)
+        sql += f" WHERE {clause}"
+    if order_columns:
+        sql += " ORDER BY " + ", ".join(quote_identifier(c) for c in order_columns)
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+    return sql, tuple(params)
+
+
+def build_select(schema, conn, table, columns=None, where=None, order_by=None, limit=None):
+    """Return ``(sql, params)`` for a validated, fully parameterized SELECT."""
+    where = where or {}
+    schema.validate(conn, table, list(columns or []) + list(where) + _order_columns(order_by))
+    return render_select(table, columns, where, order_by, limit)
+
+
+def build_delete(schema, conn, table, where):
+    """Return ``(sql, params)`` for a validated, parameterized DELETE."""
+    if not where:
+        raise ValueError("refusing to build a DELETE without criteria")
+    schema.validate(conn, table, list(where))
+    clause, params = where_clause(where)
+    return f"DELETE FROM {quote_identifier(table)} WHERE {clause}", tuple(params)
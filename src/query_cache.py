@@ -0,0 +1,189 @@
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+_WHITESPACE = re.compile(r"\s+")
+_IDENTIFIER = r'(?:"(?:[^"]|"")+"|`[^`]+`|\[[^\]]+\]|\w+)'
+_WRITE_TARGET = re.compile(
+    r"^\s*(?:INSERT\s+(?:OR\s+\w+\s+)?INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM"
+    r"|DROP\s+TABLE(?:\s+IF\s+EXISTS)?|ALTER\s+TABLE)\s+"
+    rf"({_IDENTIFIER})(?:\s*\.\s*({_IDENTIFIER}))?",
+    re.IGNORECASE,
+)
+
+
+def normalize_query(sql):
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def table_tag(name):
+    """Return the cache tag for a table name: unquoted and lowercased.
+
+    sqlite table names are case-insensitive, so ``Users``, ``"users"`` and
+    ``[USERS]`` all tag the same entries.
+    """
+    quote = name[:1]
+    if quote in ('"', "`", "[") and len(name) > 1:
+        name = name[1:-1]
+        if quote == '"':
+            name = name.replace('""', '"')
+    return name.lower()
+
+
+def written_table(sql):
+    """Return the tag of the table a write statement modifies, or None if it cannot tell.
+
+    A schema prefix (``main.users``) is dropped, so attached databases that
+    share table names share tags too.
+    """
+    match = _WRITE_TARGET.match(sql)
+    if not match:
+        return None
+    return table_tag(match.group(2) or match.group(1))
+
+
+def approximate_size(rows):
+    size = sys.getsizeof(rows)
+    for row in rows:
+        size += sys.getsizeof(row)
+        for value in row:
+            size += sys.getsizeof(value)
+    return size
+
+
+class _Entry:
+    __slots__ = ("rows", "tables", "expires_at", "as_of", "size")
+
+    def __init__(self, rows, tables, expires_at, as_of, size):
+        self.rows = rows
+        self.tables = tables
+        self.expires_at = expires_at
+        self.as_of = as_of
+        self.size = size
+
+
+class QueryCache:
+    """In-process LRU cache of query results with TTL and table-level invalidation.
+
+    Entries are keyed by normalized SQL plus bound parameters and tagged with
+    the tables they read. The cache is bounded both by entry count and by an
+    approximate byte size of the cached rows; the least recently used entries
+    are evicted first. ``as_of`` records how current the cached data is, so
+    callers that need to see their own writes can reject older entries.
+
+    Every invalidation bumps a generation counter. Readers take
+    ``generation()`` before querying and pass it to ``put()``; if a write
+    invalidated anything in between, the possibly stale rows are not cached.
+    """
+
+    def __init__(self, ttl=3600, max_entries=1024, max_bytes=64 * 1024 * 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._by_table = {}
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+        self._generation = 0
+
+    @staticmethod
+    def make_key(sql, params=()):
+        return normalize_query(sql), tuple(params)
+
+    def _remove(self, key):
+        # Caller holds the lock.
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        for table in entry.tables:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_table[table]
+        return entry
+
+    def generation(self):
+        with self._lock:
+            return self._generation
+
+    def get(self, key, min_as_of=None):
+        """Return the cached rows for ``key`` or None on a miss."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= now:
+                self._remove(key)
+                self._expirations += 1
+                entry = None
+            if entry is None or (min_as_of is not None and entry.as_of < min_as_of):
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return list(entry.rows)
+
+    def put(self, key, rows, tables, ttl=None, as_of=None, generation=None):
+        now = time.time()
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return False
+        rows = list(rows)
+        size = approximate_size(rows)
+        if size > self.max_bytes:
+            return False
+        entry = _Entry(rows, frozenset(table_tag(t) for t in tables), now + ttl, now if as_of is None else as_of, size)
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return False
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += size
+            for table in entry.tables:
+                self._by_table.setdefault(table, set()).add(key)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+        return True
+
+    def invalidate_table(self, table):
+        table = table_tag(table)
+        with self._lock:
+            keys = list(self._by_table.get(table, ()))
+            for key in keys:
+                self._remove(key)
+            self._invalidations += len(keys)
+            self._generation += 1
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._invalidations += len(self._entries)
+            self._generation += 1
+            self._entries.clear()
+            self._by_table.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+            }
@@ -0,0 +1,214 @@
+import math
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w\"])-?\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+# Memo tables for the per-statement work in record(); each is emptied when it
+# reaches its bound. Plain dict reads and writes are atomic, so no lock.
+_MEMO_SIZE = 4096
+_fingerprints = {}
+_sites = {}
+_skipped_files = {}
+
+
+def _memo(table, key, compute):
+    value = table.get(key)
+    if value is None:
+        if len(table) >= _MEMO_SIZE:
+            table.clear()
+        value = table[key] = compute()
+    return value
+
+
+def _fingerprint(sql):
+    shape = _STRING_LITERAL.sub("?", sql)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _IN_LIST.sub("IN (...)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+def fingerprint(sql):
+    """Reduce ``sql`` to its shape: literals become ``?`` and IN lists collapse."""
+    return _memo(_fingerprints, sql, lambda: _fingerprint(sql))
+
+
+class LatencyHistogram:
+    """Fixed log-scale latency buckets; percentiles are accurate to one bucket (~25%)."""
+
+    BASE = 1e-5
+    GROWTH = 1.25
+    BUCKETS = 80
+
+    def __init__(self):
+        self.counts = [0] * (self.BUCKETS + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+
+    def _bucket(self, seconds):
+        # The first index whose upper bound is >= seconds, found with one log
+        # and nudged by one if rounding put it on the wrong side of a bound.
+        if seconds <= self.BASE:
+            return 0
+        index = min(math.ceil(math.log(seconds / self.BASE, self.GROWTH)), self.BUCKETS)
+        if index > 0 and seconds <= self.upper_bound(index - 1):
+            index -= 1
+        elif seconds > self.upper_bound(index):
+            index += 1
+        return index
+
+    def upper_bound(self, index):
+        if index >= self.BUCKETS:
+            return float("inf")
+        return self.BASE * self.GROWTH ** index
+
+    def add(self, seconds, rows=0):
+        self.counts[self._bucket(seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.rows += rows
+
+    def percentile(self, fraction):
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self.upper_bound(index), self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(0.50),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "max": self.max,
+            "rows": self.rows,
+        }
+
+
+def _is_skipped(filename, skip_files):
+    filename = os.path.abspath(filename)
+    skip = {os.path.abspath(f) for f in skip_files} | {os.path.abspath(__file__)}
+    return filename in skip or filename.endswith("contextlib.py")
+
+
+def call_site(skip_files=()):
+    """Return ``file:line in function`` for the first frame outside ``skip_files``.
+
+    ``skip_files`` must be hashable (a tuple). Path handling runs once per
+    file and once per ``(code, line)``; later calls are dict lookups.
+    """
+    frame = sys._getframe(1)
+    while frame is not None:
+        code = frame.f_code
+        skipped = _memo(
+            _skipped_files, (code.co_filename, skip_files),
+            lambda: _is_skipped(code.co_filename, skip_files),
+        )
+        if not skipped:
+            line = frame.f_lineno
+            return _memo(
+                _sites, (code, line),
+                lambda: f"{os.path.relpath(os.path.abspath(code.co_filename))}:{line} in {code.co_name}",
+            )
+        frame = frame.f_back
+    return "<unknown>"
+
+
+class QueryProfiler:
+    """Per-fingerprint latency histograms, a bounded slow-query log and hooks.
+
+    ``record()`` is called once per statement. Statements slower than
+    ``slow_threshold`` seconds are logged together with their
+    ``EXPLAIN QUERY PLAN``. Hooks are called with one event dict per statement
+    and must not raise; a failing hook is reported and skipped.
+    """
+
+    def __init__(self, slow_threshold=0.5, slow_log_size=100):
+        self.slow_threshold = slow_threshold
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._call_sites = {}
+        self._slow = deque(maxlen=slow_log_size)
+        self._hooks = []
+
+    def add_hook(self, hook):
+        with self._lock:
+            self._hooks.append(hook)
+
+    def remove_hook(self, hook):
+        with self._lock:
+            self._hooks.remove(hook)
+
+    def _explain(self, conn, sql, params):
+        try:
+            return [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()]
+        except (sqlite3.Error, ValueError) as e:
+            return [f"<no plan: {e}>"]
+
+    def record(self, conn, sql, params, elapsed, rows, site):
+        shape = fingerprint(sql)
+        slow = elapsed >= self.slow_threshold
+        plan = self._explain(conn, sql, params) if slow else None
+        event = {
+            "sql": sql,
+            "fingerprint": shape,
+            "elapsed": elapsed,
+            "rows": rows,
+            "call_site": site,
+            "slow": slow,
+            "plan": plan,
+            "timestamp": time.time(),
+        }
+        with self._lock:
+            histogram = self._histograms.get(shape)
+            if histogram is None:
+                histogram = self._histograms[shape] = LatencyHistogram()
+                self._call_sites[shape] = set()
+            histogram.add(elapsed, rows)
+            self._call_sites[shape].add(site)
+            if slow:
+                self._slow.append(event)
+            hooks = list(self._hooks)
+        for hook in hooks:
+            try:
+                hook(event)
+            except Exception as e:
+                print(f"Query hook {hook!r} failed: {e}")
+        return event
+
+    def snapshot(self):
+        with self._lock:
+            queries = {
+                shape: dict(histogram.summary(), call_sites=sorted(self._call_sites[shape]))
+                for shape, histogram in self._histograms.items()
+            }
+            slow = list(self._slow)
+        return {
+            "slow_threshold": self.slow_threshold,
+            "queries": queries,
+            "slow_queries": slow,
+        }
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._call_sites.clear()
+            self._slow.clear()
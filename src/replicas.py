@@ -0,0 +1,185 @@
+import itertools
+import re
+import sqlite3
+import threading
+import time
+
+from src.connection_pool import ConnectionPool
+
+_READ_ONLY = re.compile(r"^\s*(SELECT|WITH|EXPLAIN)\b", re.IGNORECASE)
+_WRITE_KEYWORD = re.compile(r"\b(INSERT|UPDATE|DELETE|REPLACE|CREATE|DROP|ALTER)\b", re.IGNORECASE)
+
+
+def is_read_only(sql):
+    """Best-effort check that ``sql`` only reads, so it may go to a replica."""
+    return bool(_READ_ONLY.match(sql)) and not _WRITE_KEYWORD.search(sql)
+
+
+class Replica:
+    """One read-only copy of the primary database kept current by snapshots."""
+
+    def __init__(self, path, pool_size=5, timeout=30, max_idle=300):
+        self.path = path
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.pool = None
+        self.synced_at = None
+        self.syncs = 0
+        self.lock = threading.Lock()
+
+    def sync_from(self, source):
+        # The backup API copies the whole snapshot in one step under a read
+        # lock taken at the start, so the copy contains every write committed
+        # before ``started`` and readers on the replica never see a mixture.
+        with self.lock:
+            started = time.time()
+            dest = sqlite3.connect(self.path)
+            try:
+                source.backup(dest)
+            finally:
+                dest.close()
+            self.synced_at = started
+            self.syncs += 1
+            if self.pool is None:
+                self.pool = ConnectionPool(
+                    f"file:{self.path}?mode=ro",
+                    max_size=self.pool_size,
+                    timeout=self.timeout,
+                    max_idle=self.max_idle,
+                    uri=True,
+                )
+
+    def mark_current(self, checked_at):
+        """Record that the primary had no new commits as of ``checked_at``."""
+        with self.lock:
+            if self.synced_at is not None:
+                self.synced_at = max(self.synced_at, checked_at)
+
+    def load(self):
+        return self.pool.stats()["in_use"] if self.pool is not None else 0
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+
+
+class ReplicaSet:
+    """Routes reads across replicas that are fresh enough for the caller.
+
+    ``selection`` is ``"round_robin"`` or ``"least_loaded"`` (fewest
+    connections checked out). A replica older than ``max_staleness`` seconds
+    is never chosen; neither is one last synced before ``min_synced_at``,
+    which is how read-your-writes sessions avoid reading stale data.
+    """
+
+    SELECTIONS = ("round_robin", "least_loaded")
+
+    def __init__(self, paths, selection="round_robin", max_staleness=5, pool_size=5,
+                 timeout=30, max_idle=300, on_sync=None):
+        if selection not in self.SELECTIONS:
+            raise ValueError(f"selection must be one of {self.SELECTIONS}")
+        self.selection = selection
+        self.max_staleness = max_staleness
+        self.on_sync = on_sync
+        self.replicas = [Replica(p, pool_size, timeout, max_idle) for p in paths]
+        self._counter = itertools.count()
+        self._stop = threading.Event()
+        self._thread = None
+        self._reads = {replica.path: 0 for replica in self.replicas}
+        self._stats_lock = threading.Lock()
+
+    def sync(self, source):
+        for replica in self.replicas:
+            replica.sync_from(source)
+        if self.on_sync is not None:
+            self.on_sync()
+
+    def mark_current(self, checked_at):
+        for replica in self.replicas:
+            replica.mark_current(checked_at)
+
+    @staticmethod
+    def _open_watcher(source):
+        # A connection that never writes sees PRAGMA data_version change on
+        # every commit made by any other connection to the primary.
+        for _, name, path in source.execute("PRAGMA database_list").fetchall():
+            if name == "main" and path:
+                return sqlite3.connect(path)
+        return None
+
+    def start_periodic_sync(self, source_factory, interval):
+        """Re-sync every ``interval`` seconds; ``source_factory`` yields a primary connection.
+
+        When the primary has had no commits since the last sync, the copy is
+        skipped and the replicas are only marked current.
+        """
+        def run():
+            watcher = None
+            synced_version = None
+            try:
+                while not self._stop.wait(interval):
+                    try:
+                        with source_factory() as source:
+                            if watcher is None:
+                                watcher = self._open_watcher(source)
+                            checked_at = time.time()
+                            version = None
+                            if watcher is not None:
+                                version = watcher.execute("PRAGMA data_version").fetchone()[0]
+                            if version is not None and version == synced_version:
+                                self.mark_current(checked_at)
+                                continue
+                            self.sync(source)
+                            synced_version = version
+                    except Exception as e:
+                        # A failed sync only delays freshness; stale replicas
+                        # are skipped by choose() until the next one succeeds.
+                        # Whatever went wrong, the loop must keep running.
+                        print(f"Replica sync failed: {e!r}")
+            finally:
+                if watcher is not None:
+                    watcher.close()
+
+        self._thread = threading.Thread(target=run, name="replica-sync", daemon=True)
+        self._thread.start()
+
+    def choose(self, min_synced_at=None):
+        now = time.time()
+        fresh = [
+            r for r in self.replicas
+            if r.synced_at is not None
+            and now - r.synced_at <= self.max_staleness
+            and (min_synced_at is None or r.synced_at >= min_synced_at)
+        ]
+        if not fresh:
+            return None
+        if self.selection == "least_loaded":
+            replica = min(fresh, key=lambda r: r.load())
+        else:
+            replica = fresh[next(self._counter) % len(fresh)]
+        with self._stats_lock:
+            self._reads[replica.path] += 1
+        return replica
+
+    def stats(self):
+        now = time.time()
+        with self._stats_lock:
+            reads = dict(self._reads)
+        return [
+            {
+                "path": r.path,
+                "reads": reads[r.path],
+                "age": None if r.synced_at is None else now - r.synced_at,
+                "syncs": r.syncs,
+                "in_use": r.load(),
+            }
+            for r in self.replicas
+        ]
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        for replica in self.replicas:
+            replica.close()
@@ -0,0 +1,61 @@
+import sqlite3
+
+from config.settings import SQLITE_PROFILE, SQLITE_PROFILES
+from src.query_builder import quote_identifier
+
+_CHOICES = {
+    "journal_mode": {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"},
+    "synchronous": {"OFF", "NORMAL", "FULL", "EXTRA"},
+    "temp_store": {"DEFAULT", "FILE", "MEMORY"},
+}
+_INTEGERS = ("page_size", "cache_size", "mmap_size")
+# page_size must be set before the switch to WAL, after which it is fixed.
+_ORDER = ("page_size", "journal_mode", "synchronous", "cache_size", "mmap_size", "temp_store")
+_GLOBAL = {"temp_store"}
+
+
+def get_profile(name=None):
+    name = SQLITE_PROFILE if name is None else name
+    try:
+        return SQLITE_PROFILES[name]
+    except KeyError:
+        raise ValueError(f"unknown sqlite profile {name!r}; expected one of {sorted(SQLITE_PROFILES)}")
+
+
+def _pragma_value(setting, value):
+    if setting in _INTEGERS:
+        return str(int(value))
+    value = str(value).upper()
+    if value not in _CHOICES[setting]:
+        raise ValueError(f"invalid {setting}: {value!r}")
+    return value
+
+
+def apply_profile(conn, name=None, schemas=("main",)):
+    """Set the PRAGMAs of profile ``name`` (default ``SQLITE_PROFILE``) on ``conn``.
+
+    Per-database settings are applied to every schema in ``schemas``, so
+    ATTACHed files get the same treatment as the main one.
+    """
+    profile = get_profile(name)
+    for setting in _ORDER:
+        if setting not in profile:
+            continue
+        value = _pragma_value(setting, profile[setting])
+        targets = [None] if setting in _GLOBAL else schemas
+        for schema in targets:
+            prefix = "" if schema is None else quote_identifier(schema) + "."
+            # journal_mode reports its result as a row, which must be consumed.
+            conn.execute(f"PRAGMA {prefix}{setting} = {value}").fetchall()
+    return conn
+
+
+def connect(database, profile=None, **connect_kwargs):
+    """``sqlite3.connect`` followed by ``apply_profile``."""
+    conn = sqlite3.connect(database, **connect_kwargs)
+    try:
+        apply_profile(conn, profile)
+    except BaseException:
+        conn.close()
+        raise
+    return conn
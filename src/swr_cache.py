@@ -0,0 +1,201 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+_ABSENT = object()
+
+
+class _Entry:
+    __slots__ = ("value", "loaded_at")
+
+    def __init__(self, value, loaded_at):
+        self.value = value
+        self.loaded_at = loaded_at
+
+
+class StaleWhileRevalidateCache:
+    """Read-through cache that serves stale values while refreshing them.
+
+    Entries younger than ``soft_ttl`` are served as is. Between ``soft_ttl``
+    and ``hard_ttl`` the cached value is still returned at once, and a single
+    background refresh is started. Past ``hard_ttl`` the entry is dropped and
+    the caller loads it. Concurrent loads of one key are collapsed: the first
+    caller runs ``loader`` and everyone else waits for its result. At most
+    ``max_entries`` entries are kept, least recently used first out.
+
+    ``batch_loader``, if given, takes a list of keys and returns a dict of the
+    ones it found; ``get_many`` uses it to load all misses in one call.
+    """
+
+    def __init__(self, loader, soft_ttl=60, hard_ttl=3600, max_entries=10000, refresh_workers=4,
+                 batch_loader=None):
+        if soft_ttl > hard_ttl:
+            raise ValueError("soft_ttl must not exceed hard_ttl")
+        self.loader = loader
+        self.batch_loader = batch_loader
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = hard_ttl
+        self.max_entries = max_entries
+        self.refresh_workers = refresh_workers
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._executor = None
+        self._stats = dict.fromkeys(
+            ("hits", "stale_hits", "misses", "coalesced", "refreshes", "refresh_errors",
+             "evictions", "expirations"), 0
+        )
+
+    def _lookup(self, key, now):
+        """Return ``(value, future, owner)`` for ``key``; caller holds the lock."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = now - entry.loaded_at
+            if age < self.hard_ttl:
+                self._entries.move_to_end(key)
+                if age >= self.soft_ttl:
+                    self._stats["stale_hits"] += 1
+                    self._schedule_refresh(key)
+                else:
+                    self._stats["hits"] += 1
+                return entry.value, None, False
+            del self._entries[key]
+            self._stats["expirations"] += 1
+        future = self._inflight.get(key)
+        if future is not None:
+            self._stats["coalesced"] += 1
+            return _ABSENT, future, False
+        future = self._inflight[key] = Future()
+        self._stats["misses"] += 1
+        return _ABSENT, future, True
+
+    def _schedule_refresh(self, key):
+        # Caller holds the lock.
+        if key in self._inflight:
+            return
+        future = self._inflight[key] = Future()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.refresh_workers, thread_name_prefix="swr-refresh")
+        self._executor.submit(self._refresh, key, future)
+
+    def _refresh(self, key, future):
+        try:
+            value = self.loader(key)
+        except Exception as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+                self._stats["refresh_errors"] += 1
+            future.set_exception(e)
+            # The stale value keeps being served until hard_ttl.
+            print(f"Background refresh of {key!r} failed: {e}")
+            return
+        with self._lock:
+            self._stats["refreshes"] += 1
+        self._store(key, value, future)
+
+    def _store(self, key, value, future):
+        with self._lock:
+            self._entries[key] = _Entry(value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+            self._inflight.pop(key, None)
+        future.set_result(value)
+
+    def _fail(self, keys_to_futures, error):
+        with self._lock:
+            for key in keys_to_futures:
+                self._inflight.pop(key, None)
+        for future in keys_to_futures.values():
+            future.set_exception(error)
+
+    def get(self, key):
+        with self._lock:
+            value, future, owner = self._lookup(key, time.monotonic())
+        if future is None:
+            return value
+        if owner:
+            try:
+                value = self.loader(key)
+            except BaseException as e:
+                self._fail({key: future}, e)
+                raise
+            self._store(key, value, future)
+            return value
+        value = future.result()
+        if value is _ABSENT:
+            raise KeyError(key)
+        return value
+
+    def get_many(self, keys):
+        """Return ``{key: value}`` for ``keys``, loading all misses together.
+
+        Keys the batch loader does not return are left out of the result.
+        """
+        results = {}
+        owned = {}
+        waiting = {}
+        now = time.monotonic()
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                value, future, owner = self._lookup(key, now)
+                if future is None:
+                    results[key] = value
+                elif owner:
+                    owned[key] = future
+                else:
+                    waiting[key] = future
+        if owned:
+            try:
+                if self.batch_loader is not None:
+                    loaded = self.batch_loader(list(owned))
+                else:
+                    loaded = {key: self.loader(key) for key in owned}
+            except BaseException as e:
+                self._fail(owned, e)
+                raise
+            for key, future in owned.items():
+                if key in loaded:
+                    self._store(key, loaded[key], future)
+                    results[key] = loaded[key]
+                else:
+                    with self._lock:
+                        self._inflight.pop(key, None)
+                    future.set_result(_ABSENT)
+        for key, future in waiting.items():
+            try:
+                value = future.result()
+            except Exception:
+                continue
+            if value is not _ABSENT:
+                results[key] = value
+        return results
+
+    def invalidate(self, key):
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            for name in self._stats:
+                self._stats[name] = 0
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats, entries=len(self._entries), max_entries=self.max_entries)
+        lookups = stats["hits"] + stats["stale_hits"] + stats["misses"] + stats["coalesced"]
+        stats["hit_ratio"] = (stats["hits"] + stats["stale_hits"]) / lookups if lookups else 0.0
+        return stats
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
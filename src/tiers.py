@@ -0,0 +1,41 @@
+import numpy as np
+
+from config.settings import USER_TIER_THRESHOLDS, USER_TIERS
+
+
+def classify(values, thresholds=USER_TIER_THRESHOLDS):
+    """Return the tier code of each value as a ``uint8`` array.
+
+    The code is the number of ``thresholds`` (ascending) a value strictly
+    exceeds, so with ``(499, 9999)`` it matches ``get_user_report``:
+    0 = free, 1 = standard, 2 = premium. NaN (NULL) is tier 0.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    codes = np.searchsorted(np.asarray(thresholds, dtype=np.float64), values, side="left")
+    codes[np.isnan(values)] = 0
+    return codes.astype(np.uint8)
+
+
+def tier_counts(codes, tiers=USER_TIERS):
+    """Return ``{tier name: count}`` for an array of tier codes."""
+    counts = np.bincount(codes, minlength=len(tiers))
+    return {tier: int(count) for tier, count in zip(tiers, counts)}
+
+
+def load_chunks(cursor, batch_size):
+    """Read ``(id, value)`` rows from ``cursor`` into ``(ids, values)`` arrays.
+
+    Rows are fetched ``batch_size`` at a time, so only one batch is held as
+    Python objects; NULL values become NaN.
+    """
+    ids, values = [], []
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        chunk_ids, chunk_values = zip(*rows)
+        ids.append(np.array(chunk_ids, dtype=np.int64))
+        values.append(np.array(chunk_values, dtype=np.float64))
+    if not ids:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float64)
+    return np.concatenate(ids), np.concatenate(values)
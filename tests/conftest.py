@@ -25,3 +25,14 @@ def project_root():
 def suppress_print(capsys):
     """Allow print capture in all tests."""
     yield
+
+
+@pytest.fixture(autouse=True)
+def clear_user_service_state():
+    """Start every test with empty user caches and no recorded login failures."""
+    from src.user_service import users_cache, failed_logins, external_user_cache
+    users_cache.clear()
+    external_user_cache.clear()
+    users_cache.reset_stats()
+    failed_logins.clear()
+    yield
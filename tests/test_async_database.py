@@ -0,0 +1,199 @@
+import pytest
+import asyncio
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.async_database import AsyncDatabase
+from src.database import (
+    close_pool, configure_pool, configure_profiler, configure_query_cache, get_all_records,
+    profiler_snapshot, query_cache_stats
+)
+
+# Counts far enough that it only finishes if nothing interrupts it.
+SLOW_QUERY = (
+    "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) "
+    "SELECT count(*) FROM n WHERE i < 1000000000"
+)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "async.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, username TEXT, role TEXT)")
+    conn.executemany(
+        "INSERT INTO users VALUES (?, ?, ?)",
+        [(i, f"user{i}", "admin" if i % 10 == 0 else "user") for i in range(1, 251)],
+    )
+    conn.commit()
+    conn.close()
+    return path
+
+
+def run(coro_fn, path, **kwargs):
+    async def main():
+        async with AsyncDatabase(path, **kwargs) as db:
+            return await coro_fn(db)
+    return asyncio.run(main())
+
+
+# ─── Query Tests ───────────────────────────────────────────────────────────
+
+class TestAsyncQueries:
+    def test_fetch(self, db_path):
+        """Should return all matching rows."""
+        rows = run(lambda db: db.fetch("SELECT id FROM users WHERE role = ?", ("admin",)), db_path)
+        assert [r[0] for r in rows] == list(range(10, 251, 10))
+
+    def test_execute_commits(self, db_path):
+        """Should commit writes and report the affected row count."""
+        async def work(db):
+            changed = await db.execute("UPDATE users SET role = 'guest' WHERE id <= ?", (5,))
+            count = await db.fetch_one("SELECT count(*) FROM users WHERE role = 'guest'")
+            return changed, count[0]
+        assert run(work, db_path) == (5, 5)
+
+    def test_one_connection_per_worker(self, db_path):
+        """Should keep one connection per worker thread, never sharing one."""
+        async def work(db):
+            def who(conn):
+                time.sleep(0.05)
+                return threading.get_ident(), id(conn)
+            pairs = await asyncio.gather(*(db._run(who) for _ in range(8)))
+            return pairs, len(db._connections)
+        pairs, opened = run(work, db_path, max_workers=2)
+        by_thread = {}
+        for thread, conn in pairs:
+            by_thread.setdefault(thread, set()).add(conn)
+        assert len(by_thread) == 2
+        assert all(len(conns) == 1 for conns in by_thread.values())
+        assert opened == 2
+
+    def test_closed_database_rejects_work(self, db_path):
+        """Should refuse new work once closed."""
+        async def main():
+            db = AsyncDatabase(db_path)
+            await db.close()
+            await db.fetch("SELECT 1")
+        with pytest.raises(RuntimeError):
+            asyncio.run(main())
+
+
+# ─── Database Integration Tests ────────────────────────────────────────────
+
+class TestDatabaseIntegration:
+    @pytest.fixture
+    def primary(self, db_path):
+        configure_pool(db_path)
+        configure_query_cache()
+        configure_profiler()
+        yield db_path
+        close_pool()
+        configure_query_cache()
+        configure_profiler()
+
+    def test_async_write_invalidates_cached_reads(self, primary):
+        """Should drop cached results for the table an async write changed."""
+        assert len(get_all_records("users")) == 250
+        run(lambda db: db.execute("DELETE FROM users WHERE id <= ?", (10,)), primary)
+        assert len(get_all_records("users")) == 240
+
+    def test_async_executemany_invalidates_cached_reads(self, primary):
+        """Should invalidate after batched writes too."""
+        assert len(get_all_records("users")) == 250
+        run(lambda db: db.executemany("INSERT INTO users VALUES (?, ?, ?)",
+                                      [(251, "a", "user"), (252, "b", "user")]), primary)
+        assert len(get_all_records("users")) == 252
+
+    def test_writes_to_other_databases_keep_cache(self, primary, tmp_path):
+        """Should leave the result cache alone for writes to another file."""
+        other = str(tmp_path / "other.db")
+        sqlite3.connect(other).execute("CREATE TABLE users (id INTEGER)").connection.close()
+        get_all_records("users")
+        run(lambda db: db.execute("INSERT INTO users VALUES (1)"), other)
+        assert query_cache_stats()["entries"] == 1
+
+    def test_statements_are_profiled(self, primary):
+        """Should record async statements with the caller as call site."""
+        async def work(db):
+            await db.fetch("SELECT * FROM users WHERE id = ?", (1,))
+            await db.execute("UPDATE users SET role = 'x' WHERE id = ?", (1,))
+        run(work, primary)
+        queries = profiler_snapshot()["queries"]
+        assert queries["SELECT * FROM users WHERE id = ?"]["rows"] == 1
+        update = queries["UPDATE users SET role = ? WHERE id = ?"]
+        assert update["rows"] == 1
+        assert any("test_async_database.py" in site for site in update["call_sites"])
+
+    def test_streams_are_profiled(self, primary):
+        """Should record a stream once with every row it yielded."""
+        sql = "SELECT id FROM users ORDER BY id"
+
+        async def work(db):
+            return [row async for row in db.stream(sql, batch_size=7)]
+        run(work, primary)
+        stream = profiler_snapshot()["queries"][sql]
+        assert stream["count"] == 1
+        assert stream["rows"] == 250
+        assert any("test_async_database.py" in site for site in stream["call_sites"])
+
+
+# ─── Cancellation Tests ────────────────────────────────────────────────────
+
+class TestCancellation:
+    def test_timeout_interrupts_running_query(self, db_path):
+        """Should abort the statement on timeout and free the worker."""
+        async def work(db):
+            with pytest.raises(asyncio.TimeoutError):
+                await db.fetch(SLOW_QUERY, timeout=0.1)
+            started = time.perf_counter()
+            row = await db.fetch_one("SELECT count(*) FROM users")
+            return row[0], time.perf_counter() - started
+        count, elapsed = run(work, db_path, max_workers=1)
+        assert count == 250
+        assert elapsed < 2
+
+    def test_cancel_interrupts_running_query(self, db_path):
+        """Should abort the statement when the awaiting task is cancelled."""
+        async def work(db):
+            task = asyncio.ensure_future(db.fetch(SLOW_QUERY))
+            await asyncio.sleep(0.1)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            return await db.fetch_one("SELECT 1", timeout=2)
+        assert run(work, db_path, max_workers=1) == (1,)
+
+
+# ─── Streaming Tests ───────────────────────────────────────────────────────
+
+class TestAsyncStream:
+    def test_stream_yields_all_rows(self, db_path):
+        """Should yield every row across batches."""
+        async def work(db):
+            return [row[0] async for row in db.stream("SELECT id FROM users ORDER BY id", batch_size=7)]
+        assert run(work, db_path) == list(range(1, 251))
+
+    def test_stream_early_exit_frees_worker(self, db_path):
+        """Should stop the producer when the consumer leaves early."""
+        async def work(db):
+            seen = []
+            async for row in db.stream("SELECT id FROM users ORDER BY id", batch_size=10):
+                seen.append(row[0])
+                if len(seen) == 3:
+                    break
+            row = await db.fetch_one("SELECT count(*) FROM users", timeout=2)
+            return seen, row[0]
+        assert run(work, db_path, max_workers=1) == ([1, 2, 3], 250)
+
+    def test_stream_propagates_errors(self, db_path):
+        """Should raise sqlite errors in the consumer."""
+        async def work(db):
+            return [row async for row in db.stream("SELECT * FROM missing")]
+        with pytest.raises(sqlite3.OperationalError):
+            run(work, db_path)
@@ -0,0 +1,51 @@
+import pytest
+import os
+import sqlite3
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.columnar import allocate, fill_columns, table_dtype
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE t (i INTEGER, n INTEGER, r REAL, s TEXT, b BLOB)")
+    conn.executemany(
+        "INSERT INTO t VALUES (?, ?, ?, ?, ?)",
+        [(1, 1, 1.5, "a", b"x"), (2, None, 2, "abcd", b"y"), (3, 3, None, None, None)],
+    )
+    yield conn
+    conn.close()
+
+
+class TestTableDtype:
+    def test_dtype_follows_stored_types(self, conn):
+        """Should pick dtypes from the values actually stored."""
+        dtype, rows = table_dtype(conn, "t", ["i", "n", "r", "s", "b"])
+        assert rows == 3
+        assert dtype["i"] == np.int64
+        assert dtype["n"] == np.float64  # NULL forces NaN-capable floats
+        assert dtype["r"] == np.float64
+        assert dtype["s"] == np.dtype("U4")
+        assert dtype["b"] == np.dtype(object)
+
+
+class TestFillColumns:
+    def test_fill_maps_nulls(self, conn):
+        """Should fill NULLs as NaN or empty strings."""
+        dtype, rows = table_dtype(conn, "t", ["n", "s"])
+        out = allocate(dtype, rows)
+        cursor = conn.execute("SELECT n, s FROM t")
+        assert fill_columns(cursor, out, batch_size=2) == 3
+        assert np.isnan(out["n"][1])
+        assert out["s"].tolist() == ["a", "abcd", ""]
+
+    def test_object_columns_cannot_be_memory_mapped(self, conn, tmp_path):
+        """Should refuse to spill object columns to .npy."""
+        dtype, rows = table_dtype(conn, "t", ["b"])
+        with pytest.raises(ValueError):
+            allocate(dtype, rows, str(tmp_path / "b.npy"))
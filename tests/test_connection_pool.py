@@ -0,0 +1,174 @@
+import pytest
+import sqlite3
+import os
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.connection_pool import ConnectionPool, PoolTimeoutError, PoolClosedError
+
+
+# ─── Fixtures ──────────────────────────────────────────────────────────────
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "pool.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+    conn.commit()
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def pool(db_path):
+    pool = ConnectionPool(db_path, max_size=2, timeout=1, max_idle=60)
+    yield pool
+    pool.close()
+
+
+# ─── Checkout / release Tests ──────────────────────────────────────────────
+
+class TestCheckout:
+    def test_checkout_returns_working_connection(self, pool):
+        """Should hand out a usable sqlite3 connection."""
+        conn = pool.checkout()
+        assert conn.execute("SELECT COUNT(*) FROM items").fetchone() == (0,)
+        pool.release(conn)
+
+    def test_released_connection_is_reused(self, pool):
+        """Should reuse an idle connection instead of opening a new one."""
+        first = pool.checkout()
+        pool.release(first)
+        second = pool.checkout()
+        assert second is first
+        pool.release(second)
+        assert pool.stats()["created"] == 1
+
+    def test_context_manager_releases_on_error(self, pool):
+        """Should return the connection even when the block raises."""
+        with pytest.raises(RuntimeError):
+            with pool.connection():
+                raise RuntimeError("boom")
+        assert pool.stats()["in_use"] == 0
+        assert pool.stats()["idle"] == 1
+
+    def test_release_rolls_back_open_transaction(self, pool, db_path):
+        """Should not leak uncommitted writes to the next borrower."""
+        with pool.connection() as conn:
+            conn.execute("INSERT INTO items (name) VALUES ('pending')")
+        with pool.connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM items").fetchone() == (0,)
+
+    def test_release_foreign_connection_raises(self, pool, db_path):
+        """Should reject connections that did not come from the pool."""
+        other = sqlite3.connect(db_path)
+        with pytest.raises(ValueError):
+            pool.release(other)
+        other.close()
+
+    def test_on_connect_runs_once_per_new_connection(self, db_path):
+        """Should initialize each opened connection before handing it out."""
+        opened = []
+        pool = ConnectionPool(db_path, max_size=2, on_connect=opened.append)
+        with pool.connection() as conn:
+            assert opened == [conn]
+        with pool.connection():
+            pass
+        assert len(opened) == 1
+        pool.close()
+
+    def test_failed_on_connect_frees_the_slot(self, db_path):
+        """Should not leak a pool slot when on_connect raises."""
+        def fail(conn):
+            raise sqlite3.OperationalError("attach failed")
+        pool = ConnectionPool(db_path, max_size=1, on_connect=fail)
+        with pytest.raises(sqlite3.OperationalError):
+            pool.checkout()
+        assert pool.stats()["in_use"] == 0
+        pool.close()
+
+
+# ─── Bounds and waiting Tests ──────────────────────────────────────────────
+
+class TestBounds:
+    def test_times_out_when_exhausted(self, pool):
+        """Should raise once max_size connections are all checked out."""
+        a, b = pool.checkout(), pool.checkout()
+        with pytest.raises(PoolTimeoutError):
+            pool.checkout(timeout=0.05)
+        pool.release(a)
+        pool.release(b)
+
+    def test_waiter_gets_released_connection(self, pool):
+        """Should wake a waiting thread when a connection comes back."""
+        a, b = pool.checkout(), pool.checkout()
+        got = []
+
+        def borrower():
+            with pool.connection() as conn:
+                got.append(conn)
+
+        thread = threading.Thread(target=borrower)
+        thread.start()
+        time.sleep(0.05)
+        pool.release(a)
+        thread.join(timeout=2)
+        pool.release(b)
+        assert got == [a]
+        stats = pool.stats()
+        assert stats["waits"] == 1
+        assert stats["max_wait_time"] > 0
+
+    def test_concurrent_use_never_exceeds_max_size(self, pool):
+        """Should keep at most max_size connections open under contention."""
+        def worker():
+            for _ in range(20):
+                with pool.connection() as conn:
+                    conn.execute("SELECT 1").fetchone()
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        stats = pool.stats()
+        assert stats["created"] <= 2
+        assert stats["in_use"] == 0
+        assert stats["checkouts"] == 160
+
+    def test_closed_pool_rejects_checkout(self, pool):
+        """Should refuse new checkouts after close()."""
+        pool.close()
+        with pytest.raises(PoolClosedError):
+            pool.checkout()
+
+
+# ─── Health and eviction Tests ─────────────────────────────────────────────
+
+class TestHealth:
+    def test_broken_idle_connection_is_replaced(self, pool):
+        """Should discard an idle connection that fails its health check."""
+        conn = pool.checkout()
+        pool.release(conn)
+        conn.close()
+        fresh = pool.checkout()
+        assert fresh is not conn
+        pool.release(fresh)
+        assert pool.stats()["discarded"] == 1
+
+    def test_idle_connections_evicted_after_max_idle(self, db_path):
+        """Should close connections idle for longer than max_idle."""
+        pool = ConnectionPool(db_path, max_size=2, max_idle=10)
+        with patch('src.connection_pool.time.monotonic', return_value=100.0):
+            conn = pool.checkout()
+            pool.release(conn)
+        with patch('src.connection_pool.time.monotonic', return_value=200.0):
+            fresh = pool.checkout()
+        assert fresh is not conn
+        assert pool.stats()["evicted"] == 1
+        pool.release(fresh)
+        pool.close()
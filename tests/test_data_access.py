@@ -0,0 +1,81 @@
+import pytest
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.data_access import DataAccess
+
+
+# ─── Fixtures ──────────────────────────────────────────────────────────────
+
+@pytest.fixture
+def facade(tmp_path):
+    users = sqlite3.connect(str(tmp_path / "users.db"))
+    users.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, username TEXT)")
+    users.executemany("INSERT INTO users VALUES (?, ?)", [(1, "alice"), (2, "bob"), (3, "carol"), (4, "dave")])
+    users.commit()
+    users.close()
+    payments = sqlite3.connect(str(tmp_path / "payments.db"))
+    payments.execute("CREATE TABLE payments (id INTEGER PRIMARY KEY, user_id INTEGER, amount REAL)")
+    payments.executemany(
+        "INSERT INTO payments (user_id, amount) VALUES (?, ?)",
+        [(1, 10.0), (1, 15.5), (3, 100.0), (4, 20.0), (4, -30.0)],
+    )
+    payments.commit()
+    payments.close()
+    facade = DataAccess(
+        str(tmp_path / "app.db"),
+        attachments={"users": str(tmp_path / "users.db"), "payments": str(tmp_path / "payments.db")},
+        max_size=2,
+    )
+    yield facade
+    facade.close()
+
+
+# ─── Join Tests ────────────────────────────────────────────────────────────
+
+class TestDataAccess:
+    def test_users_with_payment_totals(self, facade):
+        """Should join users to their payment totals inside sqlite."""
+        assert list(facade.users_with_payment_totals()) == [
+            (1, "alice", 2, 25.5),
+            (2, "bob", 0, 0),
+            (3, "carol", 1, 100.0),
+            (4, "dave", 2, -10.0),
+        ]
+
+    def test_min_total_filters(self, facade):
+        """Should only return users whose total reaches min_total."""
+        assert [row[0] for row in facade.users_with_payment_totals(min_total=50)] == [3]
+        assert [row[0] for row in facade.users_with_payment_totals(min_total=0)] == [1, 2, 3]
+
+    def test_negative_totals_included_by_default(self, facade):
+        """Should keep users whose refunds leave a net negative total."""
+        totals = {row[0]: row[3] for row in facade.users_with_payment_totals()}
+        assert totals[4] == -10.0
+
+    def test_every_pooled_connection_is_attached(self, facade):
+        """Should attach the databases on each new pooled connection."""
+        first = facade.pool.checkout()
+        second = facade.pool.checkout()
+        for conn in (first, second):
+            names = {row[1] for row in conn.execute("PRAGMA database_list")}
+            assert {"users", "payments"} <= names
+            facade.pool.release(conn)
+
+    def test_stream_releases_connection_when_closed(self, facade):
+        """Should give the connection back when the consumer stops early."""
+        rows = facade.stream("SELECT id FROM users.users ORDER BY id", batch_size=1)
+        assert next(rows) == (1,)
+        assert facade.stats()["in_use"] == 1
+        rows.close()
+        assert facade.stats()["in_use"] == 0
+
+    def test_rejects_invalid_schema_names(self, tmp_path):
+        """Should refuse schema names that are not plain identifiers."""
+        with pytest.raises(ValueError):
+            DataAccess(str(tmp_path / "app.db"), attachments={"x; DROP": "x.db"})
+        with pytest.raises(ValueError):
+            DataAccess(str(tmp_path / "app.db"), attachments={"main": "x.db"})
@@ -1,7 +1,9 @@
 import pytest
+import numpy as np
 import sqlite3
 import os
 import sys
+import time
 from unittest.mock import patch, MagicMock, call
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
@@ -9,8 +11,18 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from src.database import (
     get_connection, run_query, get_all_records,
     search_records, bulk_insert, delete_records,
-    backup_database, DatabaseManager
+    backup_database, DatabaseManager,
+    configure_pool, close_pool, pool_stats, pooled_connection,
+    iter_records, iter_search_records, fetch_page, iter_pages,
+    select_records, statement_cache_stats,
+    enable_index_advisor, disable_index_advisor, index_advisor_report,
+    configure_replicas, sync_replicas, close_replicas, replica_stats,
+    configure_query_cache, query_cache_stats,
+    configure_profiler, add_query_hook, remove_query_hook, profiler_snapshot,
+    export_records
 )
+from src.index_advisor import IndexAdvisor, index_name
+from src.query_builder import InvalidIdentifierError
 
 
 # ─── Fixtures ──────────────────────────────────────────────────────────────
@@ -20,6 +32,18 @@ def db_manager():
     return DatabaseManager()
 
 
+@pytest.fixture(autouse=True)
+def fresh_pool():
+    """Give every test its own pool so pooled (mock) connections do not leak."""
+    close_pool()
+    yield
+    close_replicas()
+    close_pool()
+    disable_index_advisor()
+    configure_query_cache()
+    configure_profiler()
+
+
 @pytest.fixture
 def mock_db():
     with patch('src.database.sqlite3.connect') as mock_conn:
@@ -48,6 +72,18 @@ class TestGetConnection:
             assert "Prod@DB#Pass123!" in captured.out
 
 
+class TestConnectionPooling:
+    def test_pooled_connection_against_real_database(self, tmp_path):
+        """Should run queries on a real file through the configured pool."""
+        configure_pool(str(tmp_path / "app.db"), max_size=2)
+        with pooled_connection() as conn:
+            conn.execute("CREATE TABLE t (id INTEGER)")
+            conn.execute("INSERT INTO t VALUES (1)")
+            conn.commit()
+        assert run_query("SELECT id FROM t") == [(1,)]
+        assert pool_stats()["created"] == 1
+
+
 # ─── run_query Tests ───────────────────────────────────────────────────────
 
 class TestRunQuery:
@@ -68,12 +104,23 @@ class TestRunQuery:
             run_query("SELECT * FROM users")
             assert mock_cursor.execute.called
 
-    def test_run_query_closes_connection(self, mock_db):
-        """Should close connection after query."""
+    def test_run_query_returns_connection_to_pool(self, mock_db):
+        """Should hand the connection back to the pool instead of closing it."""
+        mock_conn, mock_cursor = mock_db
+        mock_cursor.fetchall.return_value = []
+        run_query("SELECT 1")
+        mock_conn.return_value.close.assert_not_called()
+        stats = pool_stats()
+        assert stats["in_use"] == 0
+        assert stats["idle"] == 1
+
+    def test_run_query_reuses_pooled_connection(self, mock_db):
+        """Should open a single connection across repeated queries."""
         mock_conn, mock_cursor = mock_db
         mock_cursor.fetchall.return_value = []
         run_query("SELECT 1")
-        mock_conn.return_value.close.assert_called_once()
+        run_query("SELECT 2")
+        assert mock_conn.call_count == 1
 
 
 # ─── get_all_records Tests ─────────────────────────────────────────────────
@@ -111,40 +158,231 @@ class TestGetAllRecords:
         assert result == []
 
 
+# ─── Streaming and pagination Tests ───────────────────────────────────────
+
+@pytest.fixture
+def populated_db(tmp_path):
+    configure_pool(str(tmp_path / "app.db"))
+    with pooled_connection() as conn:
+        conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, username TEXT, role TEXT)")
+        conn.executemany(
+            "INSERT INTO users VALUES (?, ?, ?)",
+            [(i, f"user{i}", "admin" if i % 10 == 0 else "user") for i in range(1, 251)]
+        )
+        conn.commit()
+
+
+class TestStreaming:
+    def test_iter_records_yields_every_row(self, populated_db):
+        """Should stream the whole table in fetchmany batches."""
+        rows = list(iter_records("users", batch_size=40))
+        assert len(rows) == 250
+        assert rows[0] == (1, "user1", "user")
+
+    def test_iter_records_uses_fetchmany(self, mock_db):
+        """Should never call fetchall on the streaming path."""
+        mock_conn, mock_cursor = mock_db
+        mock_cursor.fetchmany.side_effect = [[(1,), (2,)], [(3,)], []]
+        with patch('src.database._schema'):
+            assert list(iter_records("users", batch_size=2)) == [(1,), (2,), (3,)]
+        mock_cursor.fetchmany.assert_called_with(2)
+        mock_cursor.fetchall.assert_not_called()
+
+    def test_early_termination_releases_connection(self, populated_db):
+        """Should close the cursor and return the connection when abandoned."""
+        stream = iter_records("users", batch_size=10)
+        next(stream)
+        assert pool_stats()["in_use"] == 1
+        stream.close()
+        assert pool_stats()["in_use"] == 0
+
+    def test_iter_search_records_binds_value(self, populated_db):
+        """Should stream only matching rows."""
+        rows = list(iter_search_records("users", "role", "admin", batch_size=7))
+        assert len(rows) == 25
+        assert all(row[2] == "admin" for row in rows)
+
+
+class TestColumnarExport:
+    def test_export_records_builds_typed_columns(self, populated_db):
+        """Should return a structured array with one typed field per column."""
+        out = export_records("users", batch_size=40)
+        assert out.dtype["id"] == np.int64
+        assert out.dtype["username"].kind == "U"
+        assert len(out) == 250
+        assert out["id"].tolist() == list(range(1, 251))
+        assert (out["role"] == "admin").sum() == 25
+
+    def test_export_records_selected_columns(self, populated_db):
+        """Should export only the requested columns, validated against the schema."""
+        out = export_records("users", columns=["id"])
+        assert out.dtype.names == ("id",)
+        with pytest.raises(InvalidIdentifierError):
+            export_records("users", columns=["id; DROP TABLE users"])
+
+    def test_export_records_spills_to_npy(self, populated_db, tmp_path):
+        """Should write a memory-mapped .npy file other processes can load."""
+        path = str(tmp_path / "users.npy")
+        export_records("users", path=path)
+        loaded = np.load(path, mmap_mode="r")
+        assert isinstance(loaded, np.memmap)
+        assert loaded["username"][9] == "user10"
+
+
+class TestKeysetPagination:
+    def test_first_page(self, populated_db):
+        """Should return the first `limit` rows and a cursor for the next page."""
+        rows, after = fetch_page("users", limit=100)
+        assert len(rows) == 100
+        assert after == 100
+
+    def test_next_page_starts_after_cursor(self, populated_db):
+        """Should continue strictly after the given key."""
+        rows, after = fetch_page("users", after=200, limit=100)
+        assert rows[0][0] == 201
+        assert len(rows) == 50
+        assert after is None
+
+    def test_iter_pages_covers_table_once(self, populated_db):
+        """Should walk the table page by page without gaps or repeats."""
+        pages = list(iter_pages("users", limit=100))
+        assert [len(p) for p in pages] == [100, 100, 50]
+        ids = [row[0] for page in pages for row in page]
+        assert ids == list(range(1, 251))
+        assert pool_stats()["in_use"] == 0
+
+
 # ─── search_records Tests ──────────────────────────────────────────────────
 
 class TestSearchRecords:
-    def test_search_returns_matching_records(self, mock_db):
+    def test_search_returns_matching_records(self, populated_db):
         """Should return matching records."""
-        mock_conn, mock_cursor = mock_db
-        mock_cursor.fetchall.return_value = [(1, "john", "john@test.com")]
-        result = search_records("users", "username", "john")
-        assert len(result) == 1
+        result = search_records("users", "username", "user7")
+        assert result == [(7, "user7", "user")]
 
-    def test_search_sql_injection_vulnerability(self, mock_db):
-        """Demonstrates SEC003 - search value is not parameterized."""
+    def test_search_binds_value_as_parameter(self, mock_db):
+        """Should bind the search value instead of splicing it into SQL."""
         mock_conn, mock_cursor = mock_db
         mock_cursor.fetchall.return_value = []
         malicious_value = "' OR '1'='1"
-        search_records("users", "username", malicious_value)
-        query = mock_cursor.execute.call_args[0][0]
-        assert malicious_value in query
-
-    def test_search_logs_db_password(self, mock_db, capsys):
+        with patch('src.database._schema'):
+            search_records("users", "username", malicious_value)
+        query, params = mock_cursor.execute.call_args[0]
+        assert query == 'SELECT * FROM "users" WHERE "username" = ?'
+        assert params == (malicious_value,)
+
+    def test_search_injection_value_matches_nothing(self, populated_db):
+        """Should treat an injection payload as a literal value."""
+        assert search_records("users", "username", "' OR '1'='1") == []
+
+    def test_search_rejects_unknown_identifiers(self, populated_db):
+        """Should refuse table or column names that are not in the schema."""
+        with pytest.raises(InvalidIdentifierError):
+            search_records("users; DROP TABLE users;--", "id", 1)
+        with pytest.raises(InvalidIdentifierError):
+            search_records("users", "id = 1 OR 1", 1)
+
+    def test_search_logs_db_password(self, populated_db, capsys):
         """Demonstrates SEC001 - DB password logged during search."""
-        mock_conn, mock_cursor = mock_db
-        mock_cursor.fetchall.return_value = []
         search_records("users", "id", "1")
         captured = capsys.readouterr()
         assert "Prod@DB#Pass123!" in captured.out
 
-    def test_search_no_results(self, mock_db):
+    def test_search_no_results(self, populated_db):
         """Should return empty list when no records match."""
-        mock_conn, mock_cursor = mock_db
-        mock_cursor.fetchall.return_value = []
         result = search_records("users", "username", "nonexistent")
         assert result == []
 
+    def test_repeated_search_hits_statement_cache(self, populated_db):
+        """Should reuse the same statement text for different values."""
+        for i in range(1, 6):
+            search_records("users", "id", i)
+        stats = statement_cache_stats()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 4
+
+    def test_select_records_builds_parameterized_query(self, populated_db):
+        """Should filter, order and limit through the query builder."""
+        rows = select_records(
+            "users", columns=["id"], where={"role": "admin"}, order_by="id", limit=3
+        )
+        assert rows == [(10,), (20,), (30,)]
+        assert select_records("users", columns=["id"], where={"id": [1, 2]}) == [(1,), (2,)]
+
+
+class TestIndexAdvisor:
+    def test_disabled_by_default(self, populated_db):
+        """Should not record anything until enabled."""
+        search_records("users", "username", "user1")
+        assert index_advisor_report() is None
+
+    def test_recommends_index_for_frequent_full_scans(self, populated_db):
+        """Should recommend an index once a scanning lookup crosses the threshold."""
+        enable_index_advisor(threshold=3)
+        for i in range(3):
+            search_records("users", "username", f"user{i}")
+        report = index_advisor_report()
+        assert report["full_scans"] == 3
+        assert report["recommended"][0]["column"] == "username"
+        assert "CREATE INDEX" in report["recommended"][0]["sql"]
+
+    def test_primary_key_lookups_not_flagged(self, populated_db):
+        """Should not flag lookups already served by an index."""
+        enable_index_advisor(threshold=1)
+        search_records("users", "id", 5)
+        assert index_advisor_report()["recommended"] == []
+
+    def test_auto_create_and_scans_avoided(self, populated_db):
+        """Should create the index at the threshold and count avoided scans."""
+        advisor = enable_index_advisor(threshold=2, auto_create=True)
+        for i in range(5):
+            search_records("users", "role", "admin")
+        report = index_advisor_report()
+        name = index_name("users", "role")
+        assert report["lookups"] == {("users", "role"): 5}
+        assert report["created"][0]["index"] == name
+        assert report["scans_avoided"] == 3
+        assert report["recommended"] == []
+        assert "3 scans avoided" in advisor.format_report()
+        plan = run_query("EXPLAIN QUERY PLAN SELECT * FROM users WHERE role = ?", ("admin",))
+        assert name in plan[0][-1]
+
+    def test_cache_hits_are_counted(self, populated_db):
+        """Should count lookups served by the result cache toward the threshold."""
+        enable_index_advisor(threshold=3)
+        for _ in range(10):
+            search_records("users", "role", "admin")
+        report = index_advisor_report()
+        assert report["lookups"] == {("users", "role"): 10}
+        assert report["recommended"][0]["column"] == "role"
+
+    def test_index_names_do_not_collide(self):
+        """Should give differently split table/column pairs different names."""
+        assert index_name("a_b", "c") != index_name("a", "b_c")
+
+    def test_unused_index_is_not_reported_as_created(self, tmp_path):
+        """Should re-check the plan after CREATE INDEX instead of assuming it is used."""
+        conn = sqlite3.connect(str(tmp_path / "x.db"))
+        conn.execute("CREATE TABLE a (b_c TEXT)")
+        advisor = IndexAdvisor(threshold=1, auto_create=True)
+        with patch.object(IndexAdvisor, "_uses_full_scan", return_value=True):
+            assert advisor.observe(conn, "a", "b_c") is True
+            assert advisor.create_index(conn, "a", "b_c") is None
+            assert advisor.observe(conn, "a", "b_c") is False
+        assert advisor.report()["created"] == []
+        conn.close()
+
+    def test_replica_reads_do_not_borrow_primary(self, populated_db, tmp_path):
+        """Should check plans on the replica connection and leave the primary pool alone."""
+        configure_query_cache(enabled=False)
+        enable_index_advisor(threshold=100)
+        configure_replicas([str(tmp_path / "r.db")], sync_interval=None)
+        with patch('src.database.pooled_connection', side_effect=AssertionError("primary used")):
+            for _ in range(3):
+                search_records("users", "role", "admin")
+        assert replica_stats()[0]["reads"] == 3
+        assert index_advisor_report()["full_scans"] == 3
+
 
 # ─── bulk_insert Tests ─────────────────────────────────────────────────────
 
@@ -157,44 +395,407 @@ class TestBulkInsert:
         mock_conn.return_value.commit.assert_called_once()
 
     def test_bulk_insert_empty_records(self, mock_db):
-        """Should handle empty records list gracefully."""
+        """Should handle empty records without opening a transaction."""
         mock_conn, mock_cursor = mock_db
-        bulk_insert("users", [])
-        mock_conn.return_value.commit.assert_called_once()
+        result = bulk_insert("users", [])
+        assert result["rows_inserted"] == 0
+        mock_conn.return_value.commit.assert_not_called()
 
-    def test_bulk_insert_uses_nested_loops(self, mock_db, capsys):
-        """Demonstrates PERF002 - triple nested loop in bulk insert."""
+    def test_bulk_insert_is_parameterized(self, mock_db):
+        """Should bind values with executemany instead of formatting SQL."""
         mock_conn, mock_cursor = mock_db
         records = [("john", "john@test.com", "pass")]
         bulk_insert("users", records)
-        captured = capsys.readouterr()
-        # The nested loop prints each character
-        assert "Inserting char:" in captured.out
+        query, rows = mock_cursor.executemany.call_args[0]
+        assert query == 'INSERT INTO "users" VALUES (?, ?, ?)'
+        assert rows == records
+
+    def test_bulk_insert_streams_generator_in_chunks(self, tmp_path):
+        """Should consume a generator lazily and commit once per chunk."""
+        configure_pool(str(tmp_path / "app.db"))
+        with pooled_connection() as conn:
+            conn.execute("CREATE TABLE users (id INTEGER, name TEXT)")
+        rows = ((i, f"user{i}") for i in range(2500))
+        result = bulk_insert("users", rows, chunk_size=1000)
+        assert result["rows_inserted"] == 2500
+        assert result["chunks"] == 3
+        assert result["rows_per_sec"] > 0
+        assert run_query("SELECT COUNT(*) FROM users") == [(2500,)]
+
+    def test_bulk_insert_with_columns(self, tmp_path):
+        """Should insert into the named columns only."""
+        configure_pool(str(tmp_path / "app.db"))
+        with pooled_connection() as conn:
+            conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)")
+        bulk_insert("users", [("alice",), ("bob",)], columns=["name"])
+        assert run_query("SELECT id, name FROM users") == [(1, "alice"), (2, "bob")]
+
+    def test_bulk_insert_failed_chunk_rolls_back(self, tmp_path):
+        """Should keep earlier chunks and roll back only the failing one."""
+        configure_pool(str(tmp_path / "app.db"))
+        with pooled_connection() as conn:
+            conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY)")
+        rows = [(1,), (2,), (3,), (3,)]
+        with pytest.raises(sqlite3.IntegrityError):
+            bulk_insert("users", rows, chunk_size=2)
+        assert run_query("SELECT id FROM users ORDER BY id") == [(1,), (2,)]
 
 
 # ─── delete_records Tests ──────────────────────────────────────────────────
 
 class TestDeleteRecords:
-    def test_delete_executes_query(self, mock_db):
+    def test_delete_executes_query(self, populated_db):
         """Should execute a DELETE query."""
-        mock_conn, mock_cursor = mock_db
         delete_records("users", "id = 1")
-        assert mock_cursor.execute.called
+        assert search_records("users", "id", 1) == []
 
     def test_delete_sql_injection(self, mock_db):
-        """Demonstrates SEC003 - condition is not sanitized."""
+        """Demonstrates SEC003 - a raw condition string is not sanitized."""
         mock_conn, mock_cursor = mock_db
+        mock_cursor.rowcount = 250
         malicious = "1=1"
-        delete_records("users", malicious)
+        with patch('src.database._schema'):
+            delete_records("users", malicious)
         query = mock_cursor.execute.call_args[0][0]
         assert malicious in query
 
     def test_delete_commits(self, mock_db):
         """Should commit after delete."""
         mock_conn, mock_cursor = mock_db
-        delete_records("users", "id = 1")
+        mock_cursor.rowcount = 1
+        with patch('src.database._schema'):
+            assert delete_records("users", "id = 1")["rows_deleted"] == 1
         mock_conn.return_value.commit.assert_called_once()
 
+    def test_delete_with_criteria_dict(self, populated_db):
+        """Should build a parameterized DELETE from keyword criteria."""
+        delete_records("users", {"role": "admin"})
+        assert search_records("users", "role", "admin") == []
+        assert len(get_all_records("users")) == 225
+
+    def test_delete_with_bound_params(self, populated_db):
+        """Should bind parameters for a raw condition."""
+        delete_records("users", "id <= ?", (100,))
+        assert len(get_all_records("users")) == 150
+
+
+class TestChunkedDelete:
+    def test_deletes_in_batches(self, populated_db):
+        """Should delete matching rows chunk by chunk and report throughput."""
+        stats = delete_records("users", {"role": "user"}, chunk_size=100)
+        assert stats["rows_deleted"] == 225
+        assert stats["batches"] == 3
+        assert stats["completed"] is True
+        assert stats["rows_per_sec"] > 0
+        assert len(get_all_records("users")) == 25
+
+    def test_raw_condition_with_params(self, populated_db):
+        """Should accept a raw condition with bound parameters."""
+        stats = delete_records("users", "id > ?", (200,), chunk_size=20)
+        assert stats["rows_deleted"] == 50
+        assert stats["last_rowid"] == 250
+
+    def test_commits_between_batches(self, populated_db):
+        """Should make each batch durable before starting the next."""
+        seen = []
+
+        def progress(stats):
+            seen.append((stats["rows_deleted"], run_query("SELECT COUNT(*) FROM users")[0][0]))
+
+        delete_records("users", "id <= 100", chunk_size=40, progress=progress)
+        assert seen == [(40, 210), (80, 170), (100, 150)]
+
+    def test_resumes_after_interruption(self, populated_db):
+        """Should continue from last_rowid after a crash mid-purge."""
+        checkpoints = []
+
+        def interrupt(stats):
+            checkpoints.append(stats["last_rowid"])
+            if stats["batches"] == 2:
+                raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            delete_records("users", "id <= 100", chunk_size=30, progress=interrupt)
+        assert len(get_all_records("users")) == 190
+        stats = delete_records("users", "id <= 100", chunk_size=30, resume_after=checkpoints[-1])
+        assert stats["rows_deleted"] == 40
+        assert len(get_all_records("users")) == 150
+
+    def test_pause_between_batches(self, populated_db):
+        """Should sleep between batches when a pause is configured."""
+        with patch('src.database.time.sleep') as mock_sleep:
+            delete_records("users", "id <= 50", chunk_size=25, pause=0.5)
+        mock_sleep.assert_called_with(0.5)
+
+    def test_nothing_to_delete(self, populated_db):
+        """Should finish immediately when nothing matches."""
+        stats = delete_records("users", {"username": "nobody"}, chunk_size=10)
+        assert stats["rows_deleted"] == 0
+        assert stats["last_rowid"] is None
+
+    def test_rejects_unknown_column(self, populated_db):
+        """Should validate criteria columns before deleting anything."""
+        with pytest.raises(InvalidIdentifierError):
+            delete_records("users", {"rol": "rol"}, chunk_size=3)
+        assert len(get_all_records("users")) == 250
+
+
+# ─── backup_database Tests ─────────────────────────────────────────────────
+
+class TestBackupDatabase:
+    def test_backup_copies_database(self, populated_db, tmp_path):
+        """Should produce a readable copy of the live database."""
+        target = str(tmp_path / "backup.db")
+        stats = backup_database(target, pages=1, sleep=0)
+        copy = sqlite3.connect(target)
+        assert copy.execute("SELECT COUNT(*) FROM users").fetchone() == (250,)
+        copy.close()
+        assert stats["steps"] == stats["pages"]
+        assert stats["bytes"] > 0
+        assert stats["bytes_per_sec"] > 0
+        assert stats["max_writer_stall"] >= 0
+
+    def test_backup_reports_progress(self, populated_db, tmp_path):
+        """Should call the progress callback after every step."""
+        seen = []
+        backup_database(str(tmp_path / "b.db"), pages=1, sleep=0,
+                        progress=lambda done, total: seen.append((done, total)))
+        assert len(seen) > 1
+        assert seen[-1][0] == seen[-1][1]
+
+    def test_backup_sleeps_between_steps(self, populated_db, tmp_path):
+        """Should pause between steps but not after the last one."""
+        with patch('src.database.time.sleep') as mock_sleep:
+            stats = backup_database(str(tmp_path / "b.db"), pages=1, sleep=0.01)
+        assert mock_sleep.call_count == stats["steps"] - 1
+
+    def test_compressed_backup(self, populated_db, tmp_path):
+        """Should write a gzip file that decompresses to a valid database."""
+        import gzip
+        target = str(tmp_path / "backup.db.gz")
+        stats = backup_database(target, sleep=0, compress=True)
+        restored = tmp_path / "restored.db"
+        with gzip.open(target, "rb") as src:
+            restored.write_bytes(src.read())
+        copy = sqlite3.connect(str(restored))
+        assert copy.execute("SELECT COUNT(*) FROM users").fetchone() == (250,)
+        copy.close()
+        assert stats["compressed"] is True
+        assert [p.name for p in tmp_path.iterdir() if p.suffix == ".db" and p.name != "app.db"] == ["restored.db"]
+
+
+# ─── Query result cache Tests ──────────────────────────────────────────────
+
+class TestQueryCache:
+    def test_repeated_search_served_from_cache(self, populated_db):
+        """Should hit sqlite once for repeated identical lookups."""
+        first = search_records("users", "username", "user3")
+        with patch('src.database._read_connection') as mock_read:
+            assert search_records("users", "username", "user3") == first
+            mock_read.assert_not_called()
+        stats = query_cache_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_bulk_insert_invalidates_table(self, populated_db):
+        """Should drop cached results for a table after inserting into it."""
+        assert len(get_all_records("users")) == 250
+        bulk_insert("users", [(251, "user251", "user")])
+        assert len(get_all_records("users")) == 251
+
+    def test_delete_records_invalidates_table(self, populated_db):
+        """Should drop cached results for a table after deleting from it."""
+        assert search_records("users", "id", 1) != []
+        delete_records("users", {"id": 1})
+        assert search_records("users", "id", 1) == []
+
+    def test_execute_raw_write_invalidates_table(self, populated_db):
+        """Should recognise the table modified by a raw write."""
+        assert len(select_records("users", where={"role": "admin"})) == 25
+        DatabaseManager().execute_raw("UPDATE users SET role = 'admin'")
+        assert len(select_records("users", where={"role": "admin"})) == 250
+
+    def test_raw_write_with_qualified_or_cased_name_invalidates(self, populated_db):
+        """Should match the cache tag however the written table is spelled."""
+        assert len(get_all_records("users")) == 250
+        DatabaseManager().execute_raw("DELETE FROM main.users WHERE id <= 10")
+        assert len(get_all_records("users")) == 240
+        assert select_records("users", where={"role": "gone"}) == []
+        DatabaseManager().execute_raw("UPDATE Users SET role = 'gone' WHERE id <= 20")
+        assert len(select_records("users", where={"role": "gone"})) == 10
+
+    def test_unparsed_raw_write_clears_cache(self, populated_db):
+        """Should drop everything when the written table cannot be determined."""
+        get_all_records("users")
+        DatabaseManager().execute_raw("WITH doomed AS (SELECT 1) DELETE FROM users WHERE id = 1")
+        assert query_cache_stats()["entries"] == 0
+        assert len(get_all_records("users")) == 249
+
+    def test_invalidation_is_per_table(self, populated_db):
+        """Should keep entries for tables that were not written."""
+        with pooled_connection() as conn:
+            conn.execute("CREATE TABLE other (id INTEGER)")
+        get_all_records("users")
+        get_all_records("other")
+        bulk_insert("other", [(1,)])
+        assert query_cache_stats()["entries"] == 1
+
+    def test_expired_entries_are_refetched(self, populated_db):
+        """Should not serve entries past their TTL."""
+        configure_query_cache(ttl=60)
+        get_all_records("users")
+        with patch('src.query_cache.time.time', return_value=time.time() + 120):
+            get_all_records("users")
+        assert query_cache_stats()["expirations"] == 1
+
+    def test_entry_count_bound_evicts_lru(self, populated_db):
+        """Should evict the least recently used entry at capacity."""
+        configure_query_cache(max_entries=2)
+        for i in (1, 2, 3):
+            search_records("users", "id", i)
+        stats = query_cache_stats()
+        assert stats["entries"] == 2
+        assert stats["evictions"] == 1
+
+    def test_byte_bound_skips_oversized_results(self, populated_db):
+        """Should not cache a result larger than the byte budget."""
+        configure_query_cache(max_bytes=1024)
+        get_all_records("users")
+        assert query_cache_stats()["entries"] == 0
+
+
+# ─── Query profiling Tests ─────────────────────────────────────────────────
+
+class TestQueryProfiling:
+    @pytest.fixture(autouse=True)
+    def fresh_profiler(self):
+        configure_profiler()
+        configure_query_cache(enabled=False)
+
+    def test_statements_grouped_by_fingerprint(self, populated_db):
+        """Should aggregate latency for statements that differ only in values."""
+        for i in range(1, 11):
+            search_records("users", "id", i)
+        queries = profiler_snapshot()["queries"]
+        stats = queries['SELECT * FROM "users" WHERE "id" = ?']
+        assert stats["count"] == 10
+        assert stats["rows"] == 10
+        assert 0 < stats["p50"] <= stats["p95"] <= stats["p99"] <= stats["max"]
+
+    def test_records_call_site_outside_database_module(self, populated_db):
+        """Should attribute statements to the caller, not the database layer."""
+        get_all_records("users")
+        stats = profiler_snapshot()["queries"]["SELECT * FROM users"]
+        assert any("test_database.py" in site for site in stats["call_sites"])
+
+    def test_streams_profiled_on_close(self, populated_db):
+        """Should record a stream's rows once it is exhausted or closed."""
+        stream = iter_records("users", batch_size=10)
+        next(stream)
+        stream.close()
+        stats = profiler_snapshot()["queries"]['SELECT * FROM "users"']
+        assert stats["count"] == 1
+        assert stats["rows"] == 10
+
+    def test_slow_queries_logged_with_plan(self, populated_db):
+        """Should keep statements over the threshold with their query plan."""
+        configure_profiler(slow_threshold=0)
+        search_records("users", "username", "user5")
+        slow = profiler_snapshot()["slow_queries"]
+        assert slow[-1]["fingerprint"] == 'SELECT * FROM "users" WHERE "username" = ?'
+        assert any(line.startswith("SCAN") for line in slow[-1]["plan"])
+
+    def test_fast_queries_not_logged(self, populated_db):
+        """Should leave the slow log empty below the threshold."""
+        configure_profiler(slow_threshold=60)
+        search_records("users", "id", 1)
+        assert profiler_snapshot()["slow_queries"] == []
+
+    def test_hooks_receive_every_statement(self, populated_db):
+        """Should call registered hooks with one event per statement."""
+        events = []
+        hook = add_query_hook(events.append)
+        delete_records("users", {"id": 1})
+        remove_query_hook(hook)
+        get_all_records("users")
+        assert [e["rows"] for e in events] == [1]
+        assert events[0]["sql"] == 'DELETE FROM "users" WHERE "id" = ?'
+
+    def test_disabled_profiler(self, populated_db):
+        """Should record nothing when profiling is turned off."""
+        configure_profiler(enabled=False)
+        get_all_records("users")
+        assert profiler_snapshot() is None
+
+
+# ─── Read replica Tests ────────────────────────────────────────────────────
+
+class TestReplicas:
+    @pytest.fixture
+    def replicas(self, populated_db, tmp_path):
+        paths = [str(tmp_path / "replica1.db"), str(tmp_path / "replica2.db")]
+        configure_replicas(paths, sync_interval=None)
+        return paths
+
+    def test_reads_round_robin_across_replicas(self, replicas):
+        """Should spread reads evenly over the replicas."""
+        configure_query_cache(enabled=False)
+        for _ in range(4):
+            assert len(get_all_records("users")) == 250
+        assert [s["reads"] for s in replica_stats()] == [2, 2]
+
+    def test_writes_go_to_primary(self, replicas):
+        """Should send writes to the primary, leaving replicas until next sync."""
+        manager = DatabaseManager()
+        manager.execute_raw("DELETE FROM users WHERE id > 10")
+        assert len(get_all_records("users")) == 250
+        sync_replicas()
+        assert len(get_all_records("users")) == 10
+
+    def test_replicas_are_read_only(self, replicas):
+        """Should never let a write land on a replica file."""
+        from src.database import _replicas
+        with _replicas.replicas[0].pool.connection() as conn:
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("DELETE FROM users")
+
+    def test_read_your_writes_session(self, replicas):
+        """Should read from the primary until a replica has the session's write."""
+        session = DatabaseManager(read_your_writes=True)
+        session.execute_raw("DELETE FROM users WHERE id > 10")
+        assert len(session.execute_raw("SELECT * FROM users")) == 10
+        assert len(search_records("users", "role", "user", session=session)) == 9
+        # Sessions without the option may read the stale replica.
+        assert len(DatabaseManager().execute_raw("SELECT * FROM users")) == 250
+        sync_replicas()
+        assert len(session.execute_raw("SELECT * FROM users")) == 10
+        assert sum(s["reads"] for s in replica_stats()) == 2
+
+    def test_stale_replicas_fall_back_to_primary(self, populated_db, tmp_path):
+        """Should skip replicas older than the staleness bound."""
+        configure_replicas([str(tmp_path / "r.db")], max_staleness=0, sync_interval=None)
+        with patch('src.replicas.time.time', return_value=time.time() + 60):
+            get_all_records("users")
+        assert replica_stats()[0]["reads"] == 0
+
+    def test_least_loaded_selection(self, populated_db, tmp_path):
+        """Should pick the replica with the fewest connections checked out."""
+        from src.database import _read_connection
+        configure_replicas([str(tmp_path / "a.db"), str(tmp_path / "b.db")],
+                           selection="least_loaded", sync_interval=None)
+        with _read_connection() as (first, first_pool, _):
+            with _read_connection() as (second, second_pool, _):
+                assert first_pool is not second_pool
+
+    def test_periodic_sync(self, populated_db, tmp_path):
+        """Should refresh replicas in the background."""
+        configure_replicas([str(tmp_path / "r.db")], sync_interval=0.05)
+        DatabaseManager().execute_raw("DELETE FROM users")
+        deadline = time.time() + 2
+        while get_all_records("users") and time.time() < deadline:
+            time.sleep(0.02)
+        assert get_all_records("users") == []
+
 
 # ─── DatabaseManager Tests ─────────────────────────────────────────────────
 
@@ -216,21 +817,103 @@ class TestDatabaseManager:
         result = db_manager.execute_raw("SELECT 1")
         assert result == [(1,)]
 
-    def test_migrate_runs_all_steps(self, mock_db, db_manager):
-        """Should run all migration queries."""
+    def test_execute_raw_releases_connection(self, mock_db, db_manager):
+        """Should return its connection to the pool rather than leaking it."""
         mock_conn, mock_cursor = mock_db
         mock_cursor.fetchall.return_value = []
+        db_manager.execute_raw("SELECT 1")
+        assert pool_stats()["in_use"] == 0
+
+    def test_migrate_runs_all_steps(self, tmp_path, db_manager):
+        """Should run all migration queries."""
+        configure_pool(str(tmp_path / "app.db"))
         migrations = [{
+            "version": "001",
             "steps": [
                 {"queries": ["CREATE TABLE test (id INT)", "ALTER TABLE test ADD COLUMN name TEXT"]},
                 {"queries": ["CREATE INDEX idx_test ON test(id)"]}
             ]
         }]
-        db_manager.migrate(migrations)
-        assert mock_cursor.execute.call_count == 3
+        assert db_manager.migrate(migrations) == ["001"]
+        assert select_records("test") == []
+        assert run_query("SELECT name FROM sqlite_master WHERE name = ?", ("idx_test",)) == [("idx_test",)]
 
     def test_migrate_empty(self, mock_db, db_manager):
         """Should handle empty migrations."""
         mock_conn, mock_cursor = mock_db
         db_manager.migrate([])
         assert mock_cursor.execute.call_count == 0
+
+
+class TestMigrations:
+    @pytest.fixture
+    def manager(self, tmp_path):
+        configure_pool(str(tmp_path / "app.db"))
+        return DatabaseManager()
+
+    def test_rerun_skips_applied_versions(self, manager):
+        """Should record applied versions and not repeat them."""
+        migrations = [{"version": "001", "steps": [{"queries": ["CREATE TABLE a (id INT)"]}]}]
+        assert manager.migrate(migrations) == ["001"]
+        assert manager.migrate(migrations) == []
+        migrations.append({"version": "002", "steps": [{"queries": ["CREATE TABLE b (id INT)"]}]})
+        assert manager.migrate(migrations) == ["002"]
+        assert run_query("SELECT version FROM schema_migrations ORDER BY version") == [("001",), ("002",)]
+
+    def test_version_is_required(self, manager):
+        """Should refuse a migration without a version before running anything."""
+        migrations = [
+            {"version": "001", "steps": [{"queries": ["CREATE TABLE a (id INT)"]}]},
+            {"steps": [{"queries": ["CREATE TABLE b (id INT)"]}]},
+        ]
+        with pytest.raises(ValueError):
+            manager.migrate(migrations)
+        assert run_query("SELECT name FROM sqlite_master WHERE name = ?", ("a",)) == []
+
+    def test_failed_migration_rolls_back_whole_migration(self, manager):
+        """Should apply all of a migration's queries or none of them."""
+        migrations = [{"version": "001", "steps": [
+            {"queries": ["CREATE TABLE a (id INT)"]},
+            {"queries": ["THIS IS NOT SQL"]},
+        ]}]
+        with pytest.raises(sqlite3.OperationalError):
+            manager.migrate(migrations)
+        assert run_query("SELECT name FROM sqlite_master WHERE name = ?", ("a",)) == []
+        assert run_query("SELECT COUNT(*) FROM schema_migrations") == [(0,)]
+
+    def test_backfill_updates_in_rowid_chunks(self, manager):
+        """Should backfill a large table one bounded transaction at a time."""
+        with pooled_connection() as conn:
+            conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)")
+            conn.executemany("INSERT INTO users (name) VALUES (?)", [(f"u{i}",) for i in range(1000)])
+            conn.commit()
+        migrations = [{"version": "001", "steps": [
+            {"queries": ["ALTER TABLE users ADD COLUMN tier TEXT"]},
+            {"backfill": {"table": "users", "set": "tier = :tier", "params": {"tier": "free"},
+                          "where": "tier IS NULL", "batch_size": 300}},
+            {"queries": ["CREATE INDEX idx_users_tier ON users(tier)"]},
+        ]}]
+        with patch('src.database.DatabaseManager._backfill', wraps=manager._backfill) as spy:
+            manager.migrate(migrations)
+        assert spy.call_count == 1
+        assert run_query("SELECT COUNT(*) FROM users WHERE tier = ?", ("free",)) == [(1000,)]
+        assert run_query("SELECT COUNT(*) FROM schema_migration_progress") == [(0,)]
+
+    def test_interrupted_backfill_resumes(self, manager):
+        """Should resume a backfill after the last committed chunk."""
+        with pooled_connection() as conn:
+            conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, n INTEGER)")
+            conn.executemany("INSERT INTO users (n) VALUES (?)", [(0,) for _ in range(100)])
+            conn.commit()
+        migrations = [{"version": "001", "steps": [
+            {"queries": ["CREATE TABLE marker (id INT)"]},
+            {"backfill": {"table": "users", "set": "n = n + 1", "batch_size": 10}},
+            {"queries": ["THIS IS NOT SQL"]},
+        ]}]
+        with pytest.raises(sqlite3.OperationalError):
+            manager.migrate(migrations)
+        # The backfill ran to completion exactly once before the failing step.
+        assert run_query("SELECT SUM(n) FROM users") == [(100,)]
+        migrations[0]["steps"][2] = {"queries": ["CREATE TABLE done (id INT)"]}
+        assert manager.migrate(migrations) == ["001"]
+        assert run_query("SELECT SUM(n) FROM users") == [(100,)]
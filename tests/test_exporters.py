@@ -0,0 +1,39 @@
+import pytest
+import gzip
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.exporters import open_text_sink, write_rows
+
+
+class TestExporters:
+    def test_text_stream_is_written_directly(self):
+        """Should write to a text stream without wrapping or closing it."""
+        out = io.StringIO()
+        with open_text_sink(out) as stream:
+            write_rows(iter([[(1, "a")], [(2, "b,c")]]), ["id", "name"], stream)
+        assert out.getvalue().splitlines() == ["id,name", "1,a", '2,"b,c"']
+
+    def test_gzip_inferred_from_suffix(self, tmp_path):
+        """Should compress paths ending in .gz."""
+        path = tmp_path / "out.jsonl.gz"
+        with open_text_sink(str(path)) as stream:
+            stats = write_rows(iter([[(1,)]]), ["id"], stream, fmt="jsonl")
+        assert gzip.decompress(path.read_bytes()) == b'{"id": 1}\n'
+        assert stats["rows"] == 1
+
+    def test_compressing_into_text_stream_raises(self):
+        """Should refuse compress=True for a text stream before writing anything."""
+        out = io.StringIO()
+        with pytest.raises(ValueError):
+            with open_text_sink(out, compress=True):
+                pass
+        assert out.getvalue() == ""
+
+    def test_unknown_format_raises(self):
+        """Should reject formats other than csv and jsonl."""
+        with pytest.raises(ValueError):
+            write_rows(iter([]), ["id"], io.StringIO(), fmt="xml")
@@ -0,0 +1,136 @@
+import pytest
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.external_client import ExternalAPIError, ExternalUserClient
+
+
+# ─── Fixtures ──────────────────────────────────────────────────────────────
+
+class StandInUserService(BaseHTTPRequestHandler):
+    """Serves /users/<id>; ids starting with "flaky" fail twice, "slow" sleeps, "gone" is 404."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        user_id = self.path.rsplit("/", 1)[-1]
+        with server.lock:
+            server.hits[user_id] = server.hits.get(user_id, 0) + 1
+            hits = server.hits[user_id]
+            server.connections.add(self.client_address)
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            if user_id.startswith("slow"):
+                time.sleep(0.5)
+            if user_id.startswith("flaky") and hits <= 2:
+                self._send(503, {"error": "unavailable"})
+            elif user_id.startswith("gone"):
+                self._send(404, {"error": "not found"})
+            else:
+                time.sleep(0.05)
+                self._send(200, {"id": user_id})
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInUserService)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.hits = {}
+    server.connections = set()
+    server.active = 0
+    server.max_active = 0
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(server):
+    client = ExternalUserClient(
+        f"http://127.0.0.1:{server.server_address[1]}/users/",
+        max_workers=4, timeout=(1, 0.2), retries=3, backoff=0.01, max_backoff=0.05,
+    )
+    yield client
+    client.close()
+
+
+# ─── Client Tests ──────────────────────────────────────────────────────────
+
+class TestExternalUserClient:
+    def test_fetch_reuses_connection(self, client, server):
+        """Should keep one connection alive across sequential calls."""
+        for i in range(5):
+            assert client.fetch(i) == {"id": str(i)}
+        assert len(server.connections) == 1
+
+    def test_retries_transient_errors(self, client, server):
+        """Should retry 5xx responses with backoff until one succeeds."""
+        assert client.fetch("flaky1") == {"id": "flaky1"}
+        assert server.hits["flaky1"] == 3
+
+    def test_client_errors_are_not_retried(self, client, server):
+        """Should give up immediately on a 404."""
+        with pytest.raises(ExternalAPIError):
+            client.fetch("gone1")
+        assert server.hits["gone1"] == 1
+
+    def test_timeout_is_retried_then_raised(self, client, server):
+        """Should apply the read timeout to every attempt."""
+        with pytest.raises(ExternalAPIError):
+            client.fetch("slow1")
+        assert server.hits["slow1"] == 4
+
+    def test_fetch_many_is_concurrent_and_bounded(self, client, server):
+        """Should run lookups in parallel without exceeding max_workers."""
+        ids = list(range(20))
+        started = time.perf_counter()
+        results = client.fetch_many(ids + ids[:5])
+        elapsed = time.perf_counter() - started
+        assert results == {i: {"id": str(i)} for i in ids}
+        assert 1 < server.max_active <= 4
+        assert elapsed < 20 * 0.05
+
+    def test_fetch_many_return_exceptions(self, client):
+        """Should map failed IDs to their error when asked to."""
+        results = client.fetch_many(["1", "gone2"], return_exceptions=True)
+        assert results["1"] == {"id": "1"}
+        assert isinstance(results["gone2"], ExternalAPIError)
+        with pytest.raises(ExternalAPIError):
+            client.fetch_many(["1", "gone3"])
+
+    def test_user_service_uses_shared_client(self, client, server, monkeypatch):
+        """Should route fetch_external_user_data through the shared client and cache."""
+        import src.user_service as user_service
+        monkeypatch.setattr(user_service, "external_client", client)
+        assert user_service.fetch_external_user_data(7) == {"id": "7"}
+        assert user_service.fetch_external_user_data(7) == {"id": "7"}
+        assert server.hits["7"] == 1
+        assert user_service.fetch_external_users([7, 1, 2, "gone4"]) == {
+            7: {"id": "7"}, 1: {"id": "1"}, 2: {"id": "2"}
+        }
+        assert server.hits["7"] == 1
@@ -64,6 +64,16 @@ class TestUserAuthFlow:
         assert "error" in result
         assert result["error"] == "unauthorized"
 
+    def test_login_lockout_flow(self):
+        """Should lock a user out of handle_login after repeated failures."""
+        with patch('sqlite3.connect') as mock_conn:
+            mock_conn.return_value.cursor.return_value.fetchone.return_value = None
+            for _ in range(5):
+                assert handle_login({"username": "mallory", "password": "guess"}) == {"authenticated": False}
+            result = handle_login({"username": "mallory", "password": "guess"})
+            assert result == {"authenticated": False, "locked": True}
+            assert mock_conn.call_count == 5
+
     def test_admin_bypass_vulnerability(self):
         """Demonstrates admin bypass token vulnerability."""
         from src.api_routes import ADMIN_TOKEN
@@ -221,15 +231,17 @@ class TestSDLCViolationShowcase:
             execute_call = mock_cursor.execute.call_args[0][0]
             assert malicious_id in execute_call
 
-    def test_perf002_nested_loops_detected(self):
-        """PERF002: Nested loops cause O(n³) complexity."""
+    def test_perf002_permissions_scale_with_users_not_product(self):
+        """PERF002 fixed: permissions are bitsets, not a users×perms×roles product."""
         from src.user_service import process_user_permissions
         users = ["u1", "u2"]
         perms = ["read", "write"]
         roles = ["admin", "user"]
         result = process_user_permissions(users, perms, roles)
-        # 2 * 2 * 2 = 8 combinations due to nested loops
-        assert len(result) == 8
+        # One role mask per user instead of 2 * 2 * 2 = 8 entries
+        assert len(result) == 2
+        assert result.has_permission("u1", "write")
+        assert result.users_with("read") == ["u1", "u2"]
 
     def test_maint003_no_docstrings(self):
         """MAINT003: Functions missing docstrings."""
@@ -0,0 +1,54 @@
+import pytest
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.login_throttle import LoginFailureTracker
+
+
+class TestLoginFailureTracker:
+    def test_locks_after_max_failures(self):
+        """Should lock a key once it reaches max_failures in the window."""
+        tracker = LoginFailureTracker(max_failures=3, window=60, buckets=6)
+        for _ in range(2):
+            tracker.record_failure("alice", now=0)
+        assert not tracker.is_locked("alice", now=0)
+        tracker.record_failure("alice", now=5)
+        assert tracker.is_locked("alice", now=5)
+
+    def test_window_slides(self):
+        """Should forget failures older than the window."""
+        tracker = LoginFailureTracker(max_failures=3, window=60, buckets=6)
+        tracker.record_failure("alice", now=0)
+        tracker.record_failure("alice", now=30)
+        tracker.record_failure("alice", now=55)
+        assert tracker.is_locked("alice", now=55)
+        assert tracker.failures("alice", now=65) == 2
+        assert not tracker.is_locked("alice", now=65)
+
+    def test_reset_clears_key(self):
+        """Should unlock a key after a successful login."""
+        tracker = LoginFailureTracker(max_failures=1)
+        tracker.record_failure("alice", now=0)
+        tracker.reset("alice")
+        assert tracker.failures("alice", now=0) == 0
+        assert len(tracker) == 0
+
+    def test_idle_keys_expire(self):
+        """Should drop keys with no failures in the last window."""
+        tracker = LoginFailureTracker(window=60, buckets=6)
+        tracker.record_failure("old", now=0)
+        tracker.record_failure("new", now=100)
+        assert len(tracker) == 1
+        assert tracker.stats()["expirations"] == 1
+
+    def test_capacity_evicts_least_recent(self):
+        """Should never hold more than max_keys keys."""
+        tracker = LoginFailureTracker(max_keys=100)
+        for i in range(1000):
+            tracker.record_failure(f"user{i}", now=0)
+        assert len(tracker) == 100
+        assert tracker.failures("user999", now=0) == 1
+        assert tracker.failures("user0", now=0) == 0
+        assert tracker.stats()["evictions"] == 900
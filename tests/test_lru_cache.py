@@ -0,0 +1,66 @@
+import pytest
+import os
+import sys
+import threading
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.lru_cache import LRUCache, MISSING
+
+
+class TestLRUCache:
+    def test_none_is_a_cacheable_value(self):
+        """Should distinguish a cached None from a miss."""
+        cache = LRUCache()
+        assert cache.get("a") is MISSING
+        cache.put("a", None)
+        assert cache.get("a") is None
+
+    def test_evicts_least_recently_used(self):
+        """Should drop the least recently used entry when full."""
+        cache = LRUCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        assert cache.get("b") is MISSING
+        assert cache.get("a") == 1
+        assert cache.stats()["evictions"] == 1
+
+    def test_entries_expire(self):
+        """Should miss once an entry's TTL has passed."""
+        cache = LRUCache(ttl=10)
+        with patch("src.lru_cache.time.monotonic", return_value=100.0):
+            cache.put("a", 1, ttl=5)
+        with patch("src.lru_cache.time.monotonic", return_value=104.0):
+            assert cache.get("a") == 1
+        with patch("src.lru_cache.time.monotonic", return_value=106.0):
+            assert cache.get("a") is MISSING
+        assert cache.stats()["expirations"] == 1
+
+    def test_put_after_invalidation_is_dropped(self):
+        """Should not cache a value loaded before a concurrent invalidation."""
+        cache = LRUCache()
+        generation = cache.generation()
+        cache.invalidate("a")
+        assert cache.put("a", 1, generation=generation) is False
+        assert cache.get("a") is MISSING
+
+    def test_concurrent_access_keeps_bounds(self):
+        """Should stay within max_entries under concurrent writers."""
+        cache = LRUCache(max_entries=50)
+
+        def worker(offset):
+            for i in range(500):
+                cache.put(offset + i, i)
+                cache.get(offset + i // 2)
+
+        threads = [threading.Thread(target=worker, args=(n * 1000,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        stats = cache.stats()
+        assert len(cache) == 50
+        assert stats["hits"] + stats["misses"] == 8 * 500
@@ -0,0 +1,77 @@
+import pytest
+import os
+import sys
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.passwords import PasswordVerifier, hash_password, is_hashed, verify_password
+
+
+# ─── Hashing Tests ─────────────────────────────────────────────────────────
+
+class TestHashing:
+    def test_pbkdf2_round_trip(self):
+        """Should verify the right password and reject others."""
+        stored = hash_password("s3cret", iterations=1000)
+        assert stored.startswith("pbkdf2_sha256$1000$")
+        assert verify_password("s3cret", stored)
+        assert not verify_password("wrong", stored)
+
+    def test_scrypt_round_trip(self):
+        """Should support scrypt with its cost recorded in the hash."""
+        stored = hash_password("s3cret", algorithm="scrypt", n=1024, r=8, p=1)
+        assert stored.startswith("scrypt$1024$8$1$")
+        assert verify_password("s3cret", stored)
+        assert not verify_password("wrong", stored)
+
+    def test_hashes_are_salted(self):
+        """Should produce different hashes for the same password."""
+        assert hash_password("same", iterations=1000) != hash_password("same", iterations=1000)
+
+    def test_legacy_plaintext_still_verifies(self):
+        """Should accept rows stored before hashing was introduced."""
+        assert not is_hashed("pass123")
+        assert verify_password("pass123", "pass123")
+        assert not verify_password("pass12", "pass123")
+
+    def test_malformed_hash_is_rejected(self):
+        """Should fail closed on a corrupt stored hash."""
+        assert not verify_password("x", "pbkdf2_sha256$notanumber$00$00")
+
+
+# ─── PasswordVerifier Tests ────────────────────────────────────────────────
+
+class TestPasswordVerifier:
+    def test_verifies_on_process_pool_and_caches_success(self):
+        """Should run the KDF in a worker process once, then serve from cache."""
+        verifier = PasswordVerifier(max_workers=2)
+        stored = hash_password("pw", iterations=1000)
+        try:
+            assert verifier.verify("alice", "pw", stored)
+            with patch.object(verifier, "_verify_hashed") as mock_verify:
+                assert verifier.verify("alice", "pw", stored)
+                mock_verify.assert_not_called()
+        finally:
+            verifier.close()
+
+    def test_failures_are_not_cached(self):
+        """Should verify a wrong password every time."""
+        verifier = PasswordVerifier(max_workers=1)
+        stored = hash_password("pw", iterations=1000)
+        try:
+            assert not verifier.verify("alice", "nope", stored)
+            assert verifier.cache.stats()["entries"] == 0
+            assert not verifier.verify("alice", "nope", stored)
+        finally:
+            verifier.close()
+
+    def test_cached_success_requires_same_password(self):
+        """Should not let a cached success vouch for a different password."""
+        verifier = PasswordVerifier(max_workers=1)
+        stored = hash_password("pw", iterations=1000)
+        try:
+            assert verifier.verify("alice", "pw", stored)
+            assert not verifier.verify("alice", "pw2", stored)
+        finally:
+            verifier.close()
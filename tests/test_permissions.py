@@ -0,0 +1,74 @@
+import pytest
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.permissions import PermissionMatrix
+from src.user_service import process_user_permissions
+
+
+@pytest.fixture
+def matrix():
+    matrix = PermissionMatrix(capacity=2)
+    matrix.grant("admin", "read")
+    matrix.grant("admin", "write")
+    matrix.grant("viewer", "read")
+    matrix.assign_role("alice", "admin")
+    matrix.assign_role("bob", "viewer")
+    matrix.assign_role("carol", "viewer")
+    return matrix
+
+
+class TestPermissionMatrix:
+    def test_has_permission_through_roles(self, matrix):
+        """Should grant permissions through any assigned role."""
+        assert matrix.has_permission("alice", "write")
+        assert matrix.has_permission("bob", "read")
+        assert not matrix.has_permission("bob", "write")
+        assert not matrix.has_permission("nobody", "read")
+        assert not matrix.has_permission("alice", "delete")
+
+    def test_users_with_is_vectorized_over_all_users(self, matrix):
+        """Should list every user holding a permission."""
+        assert matrix.users_with("read") == ["alice", "bob", "carol"]
+        assert matrix.users_with("write") == ["alice"]
+        assert matrix.users_with("unknown") == []
+
+    def test_revoke_and_remove_role(self, matrix):
+        """Should take effect immediately for every user of the role."""
+        matrix.revoke("viewer", "read")
+        assert matrix.users_with("read") == ["alice"]
+        matrix.remove_role("alice", "admin")
+        assert matrix.permissions_of("alice") == set()
+
+    def test_permissions_and_roles_of(self, matrix):
+        """Should report a user's effective permissions and roles."""
+        matrix.assign_role("bob", "admin")
+        assert matrix.roles_of("bob") == {"admin", "viewer"}
+        assert matrix.permissions_of("bob") == {"read", "write"}
+
+    def test_more_than_64_roles(self):
+        """Should keep roles past the first 64-bit word apart."""
+        roles = {f"r{i}": [f"p{i}"] for i in range(130)}
+        users = {"alice": ["r0", "r64"], "bob": ["r129"]}
+        matrix = process_user_permissions(users, [f"p{i}" for i in range(130)], roles)
+        assert matrix.roles_of("alice") == {"r0", "r64"}
+        assert matrix.permissions_of("alice") == {"p0", "p64"}
+        assert matrix.has_permission("bob", "p129")
+        assert not matrix.has_permission("bob", "p65")
+        assert matrix.users_with("p64") == ["alice"]
+        matrix.remove_role("alice", "r64")
+        assert not matrix.has_permission("alice", "p64")
+        assert matrix.has_permission("alice", "p0")
+
+    def test_memory_grows_with_users_not_product(self):
+        """Should store one mask per user regardless of roles and permissions."""
+        users = [f"u{i}" for i in range(10000)]
+        perms = [f"p{i}" for i in range(50)]
+        roles = {f"r{i}": perms for i in range(20)}
+        matrix = process_user_permissions(
+            {u: [f"r{i % 20}"] for i, u in enumerate(users)}, perms, roles
+        )
+        assert matrix.memory_bytes() <= 8 * len(users) + 8 * len(perms)
+        assert len(matrix.users_with("p7")) == len(users)
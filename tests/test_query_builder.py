@@ -0,0 +1,83 @@
+import pytest
+import sqlite3
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.query_builder import (
+    Schema, InvalidIdentifierError, build_select, build_delete, quote_identifier
+)
+
+
+# ─── Fixtures ──────────────────────────────────────────────────────────────
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, username TEXT, role TEXT)")
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def schema():
+    return Schema()
+
+
+# ─── Schema Tests ──────────────────────────────────────────────────────────
+
+class TestSchema:
+    def test_columns_of_known_table(self, schema, conn):
+        """Should list the columns of an existing table."""
+        assert schema.columns(conn, "users") == ["id", "username", "role"]
+
+    def test_unknown_table_raises(self, schema, conn):
+        """Should reject tables that do not exist."""
+        with pytest.raises(InvalidIdentifierError):
+            schema.validate(conn, "missing")
+
+    def test_unknown_column_raises(self, schema, conn):
+        """Should reject columns that do not exist on the table."""
+        with pytest.raises(InvalidIdentifierError):
+            schema.validate(conn, "users", ["password"])
+
+    def test_picks_up_new_tables(self, schema, conn):
+        """Should reload the cached schema when a lookup misses."""
+        schema.validate(conn, "users")
+        conn.execute("CREATE TABLE orders (id INTEGER, user_id INTEGER)")
+        schema.validate(conn, "orders", ["user_id"])
+
+
+# ─── Builder Tests ─────────────────────────────────────────────────────────
+
+class TestBuilders:
+    def test_quote_identifier_escapes_quotes(self):
+        """Should double embedded quotes."""
+        assert quote_identifier('we"ird') == '"we""ird"'
+
+    def test_select_text_is_stable_across_values(self, schema, conn):
+        """Should produce identical SQL for different bound values."""
+        first = build_select(schema, conn, "users", where={"username": "a"})
+        second = build_select(schema, conn, "users", where={"username": "b"})
+        assert first[0] == second[0]
+        assert (first[1], second[1]) == (("a",), ("b",))
+
+    def test_select_null_and_in(self, schema, conn):
+        """Should translate None to IS NULL and lists to IN."""
+        sql, params = build_select(
+            schema, conn, "users", columns=["id"], where={"role": None, "id": [1, 2]}, limit=5
+        )
+        assert sql == 'SELECT "id" FROM "users" WHERE "role" IS NULL AND "id" IN (?, ?) LIMIT ?'
+        assert params == (1, 2, 5)
+
+    def test_delete_requires_criteria(self, schema, conn):
+        """Should refuse an unconditional DELETE."""
+        with pytest.raises(ValueError):
+            build_delete(schema, conn, "users", {})
+
+    def test_delete_is_parameterized(self, schema, conn):
+        """Should bind delete criteria."""
+        sql, params = build_delete(schema, conn, "users", {"id": 3})
+        assert sql == 'DELETE FROM "users" WHERE "id" = ?'
+        assert params == (3,)
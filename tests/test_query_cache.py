@@ -0,0 +1,70 @@
+import pytest
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.query_cache import QueryCache, written_table, normalize_query
+
+
+class TestHelpers:
+    def test_normalize_collapses_whitespace(self):
+        """Should key equivalent statements identically."""
+        assert normalize_query(" SELECT *\n  FROM users ") == "SELECT * FROM users"
+
+    def test_written_table(self):
+        """Should find the target table of common write statements."""
+        assert written_table("INSERT INTO users VALUES (1)") == "users"
+        assert written_table("insert or replace into users VALUES (1)") == "users"
+        assert written_table('UPDATE "users" SET x = 1') == "users"
+        assert written_table("DELETE FROM users WHERE id = 1") == "users"
+        assert written_table("DROP TABLE IF EXISTS users") == "users"
+        assert written_table("VACUUM") is None
+
+    def test_written_table_is_normalized(self):
+        """Should lowercase the target and drop quoting and schema prefixes."""
+        assert written_table("UPDATE Users SET x = 1") == "users"
+        assert written_table("INSERT INTO main.users VALUES (1)") == "users"
+        assert written_table('DELETE FROM "main" . [Users]') == "users"
+
+    def test_tags_are_case_insensitive(self):
+        """Should invalidate entries regardless of how the table name is spelled."""
+        cache = QueryCache()
+        cache.put(("q", ()), [(1,)], ["Users"])
+        assert cache.invalidate_table('"USERS"') == 1
+
+
+class TestQueryCache:
+    def test_get_returns_copy(self):
+        """Should not let callers mutate cached rows."""
+        cache = QueryCache()
+        key = cache.make_key("SELECT 1")
+        cache.put(key, [(1,)], ["t"])
+        cache.get(key).append((2,))
+        assert cache.get(key) == [(1,)]
+
+    def test_min_as_of_rejects_older_entries(self):
+        """Should miss when the entry predates the caller's last write."""
+        cache = QueryCache()
+        key = cache.make_key("SELECT 1")
+        cache.put(key, [(1,)], ["t"], as_of=100.0)
+        assert cache.get(key, min_as_of=200.0) is None
+        assert cache.get(key, min_as_of=50.0) == [(1,)]
+
+    def test_put_after_concurrent_invalidation_is_dropped(self):
+        """Should not cache rows read before an invalidation landed."""
+        cache = QueryCache()
+        key = cache.make_key("SELECT * FROM t")
+        generation = cache.generation()
+        cache.invalidate_table("t")
+        assert cache.put(key, [(1,)], ["t"], generation=generation) is False
+        assert cache.get(key) is None
+
+    def test_hit_ratio(self):
+        """Should report hits over lookups."""
+        cache = QueryCache()
+        key = cache.make_key("SELECT 1")
+        cache.get(key)
+        cache.put(key, [(1,)], ["t"])
+        cache.get(key)
+        assert cache.stats()["hit_ratio"] == pytest.approx(0.5)
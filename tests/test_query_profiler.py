@@ -0,0 +1,96 @@
+import pytest
+import sqlite3
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src import query_profiler
+from src.query_profiler import QueryProfiler, LatencyHistogram, call_site, fingerprint
+
+
+class TestFingerprint:
+    def test_literals_replaced(self):
+        """Should strip string and numeric literals."""
+        assert fingerprint("SELECT * FROM t1 WHERE a = 'x''y' AND b = 42") == \
+            "SELECT * FROM t1 WHERE a = ? AND b = ?"
+
+    def test_in_lists_collapsed(self):
+        """Should give IN lists of any length the same shape."""
+        assert fingerprint("SELECT * FROM t WHERE id IN (?, ?, ?)") == \
+            fingerprint("SELECT * FROM t WHERE id IN (?)")
+
+    def test_memo_is_bounded(self, monkeypatch):
+        """Should keep at most _MEMO_SIZE remembered statements."""
+        monkeypatch.setattr(query_profiler, "_MEMO_SIZE", 3)
+        monkeypatch.setattr(query_profiler, "_fingerprints", {})
+        for i in range(10):
+            assert fingerprint(f"SELECT {i}") == "SELECT ?"
+        assert len(query_profiler._fingerprints) <= 3
+
+
+class TestCallSite:
+    def test_reports_caller_line(self):
+        """Should name the calling file, line and function, and stay stable when memoized."""
+        sites = set()
+        for _ in range(2):
+            sites.add(call_site(()))
+        assert len(sites) == 1
+        site = sites.pop()
+        assert "test_query_profiler.py:" in site
+        assert site.endswith(" in test_reports_caller_line")
+
+    def test_skips_listed_files(self):
+        """Should skip frames from skip_files."""
+        assert "test_query_profiler.py" not in call_site((__file__,))
+
+
+class TestLatencyHistogram:
+    def test_percentiles(self):
+        """Should place percentiles in the right bucket."""
+        histogram = LatencyHistogram()
+        for _ in range(90):
+            histogram.add(0.001)
+        for _ in range(10):
+            histogram.add(0.1)
+        assert histogram.percentile(0.5) == pytest.approx(0.001, rel=0.25)
+        assert histogram.percentile(0.99) == pytest.approx(0.1, rel=0.25)
+        assert histogram.summary()["count"] == 100
+
+    def test_empty(self):
+        """Should report zeros before any sample."""
+        assert LatencyHistogram().summary()["p99"] == 0.0
+
+    def test_bucket_matches_upper_bounds(self):
+        """Should put every sample in the first bucket whose upper bound holds it."""
+        histogram = LatencyHistogram()
+        samples = [0.0, 1e-9, 1e6] + [histogram.upper_bound(i) * f
+                                       for i in range(histogram.BUCKETS) for f in (0.999, 1.0, 1.001)]
+        for seconds in samples:
+            index = histogram._bucket(seconds)
+            assert seconds <= histogram.upper_bound(index)
+            assert index == 0 or seconds > histogram.upper_bound(index - 1)
+
+
+class TestQueryProfiler:
+    def test_failing_hook_does_not_break_recording(self):
+        """Should keep recording when a hook raises."""
+        profiler = QueryProfiler()
+
+        def broken(event):
+            raise RuntimeError("boom")
+
+        profiler.add_hook(broken)
+        conn = sqlite3.connect(":memory:")
+        profiler.record(conn, "SELECT 1", (), 0.01, 1, "here")
+        assert profiler.snapshot()["queries"]["SELECT ?"]["count"] == 1
+        conn.close()
+
+    def test_slow_log_is_bounded(self):
+        """Should keep only the most recent slow queries."""
+        profiler = QueryProfiler(slow_threshold=0, slow_log_size=2)
+        conn = sqlite3.connect(":memory:")
+        for i in range(5):
+            profiler.record(conn, f"SELECT {i}", (), 0.01, 1, "here")
+        assert [e["sql"] for e in profiler.snapshot()["slow_queries"]] == ["SELECT 3", "SELECT 4"]
+        conn.close()
@@ -0,0 +1,111 @@
+import pytest
+import os
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.replicas import ReplicaSet, is_read_only
+
+
+@pytest.fixture
+def primary(tmp_path):
+    path = str(tmp_path / "primary.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE t (id INTEGER)")
+    conn.commit()
+    conn.close()
+    return path
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while not predicate():
+        if time.time() > deadline:
+            raise AssertionError("condition not met in time")
+        time.sleep(0.01)
+
+
+class TestIsReadOnly:
+    def test_select_is_read_only(self):
+        """Should route plain selects to replicas."""
+        assert is_read_only("SELECT * FROM users")
+        assert is_read_only("  with t AS (SELECT 1) SELECT * FROM t")
+
+    def test_writes_are_not_read_only(self):
+        """Should keep DML and DDL on the primary."""
+        assert not is_read_only("DELETE FROM users")
+        assert not is_read_only("WITH t AS (SELECT 1) DELETE FROM users")
+        assert not is_read_only("CREATE TABLE x (id INT)")
+        assert not is_read_only("PRAGMA journal_mode=WAL")
+
+
+class TestReplicaSet:
+    def test_rejects_unknown_selection(self):
+        """Should validate the selection strategy."""
+        with pytest.raises(ValueError):
+            ReplicaSet(["a.db"], selection="random")
+
+    def test_unsynced_replicas_are_not_chosen(self):
+        """Should return None until a replica has been synced."""
+        assert ReplicaSet(["a.db"]).choose() is None
+
+    def test_idle_primary_is_not_copied_again(self, primary, tmp_path):
+        """Should skip the backup when nothing was committed, yet keep replicas fresh."""
+        replicas = ReplicaSet([str(tmp_path / "r.db")], max_staleness=0.5)
+
+        @contextmanager
+        def source():
+            conn = sqlite3.connect(primary)
+            try:
+                yield conn
+            finally:
+                conn.close()
+
+        replicas.start_periodic_sync(source, 0.02)
+        try:
+            wait_for(lambda: replicas.stats()[0]["syncs"] == 1)
+            time.sleep(0.6)
+            assert replicas.stats()[0]["syncs"] == 1
+            assert replicas.choose() is not None
+            writer = sqlite3.connect(primary)
+            writer.execute("INSERT INTO t VALUES (1)")
+            writer.commit()
+            writer.close()
+            wait_for(lambda: replicas.stats()[0]["syncs"] == 2)
+        finally:
+            replicas.close()
+
+    def test_periodic_sync_survives_any_error(self, primary, tmp_path, capsys):
+        """Should report a failed sync and keep the background loop running."""
+        calls = []
+
+        def flaky_on_sync():
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError("hook failed")
+
+        replicas = ReplicaSet([str(tmp_path / "r.db")], on_sync=flaky_on_sync)
+        attempts = []
+
+        @contextmanager
+        def source():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise TimeoutError("no connection available")
+            conn = sqlite3.connect(primary)
+            try:
+                yield conn
+            finally:
+                conn.close()
+
+        replicas.start_periodic_sync(source, 0.02)
+        try:
+            wait_for(lambda: len(calls) >= 2)
+        finally:
+            replicas.close()
+        output = capsys.readouterr().out
+        assert "no connection available" in output
+        assert "hook failed" in output
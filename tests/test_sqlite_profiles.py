@@ -0,0 +1,51 @@
+import pytest
+import os
+import sqlite3
+import sys
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from config.settings import SQLITE_PROFILES
+from src.sqlite_profiles import apply_profile, connect, get_profile
+
+
+class TestProfiles:
+    def test_every_profile_uses_wal(self):
+        """Should configure WAL and all tuned settings in every profile."""
+        for name in ("durable", "balanced", "bulk-load", "read-mostly"):
+            profile = get_profile(name)
+            assert profile["journal_mode"] == "WAL"
+            assert {"mmap_size", "cache_size", "synchronous", "temp_store", "page_size"} <= set(profile)
+
+    def test_unknown_profile_raises(self):
+        """Should reject profile names that are not configured."""
+        with pytest.raises(ValueError):
+            get_profile("turbo")
+
+    def test_connect_applies_profile(self, tmp_path):
+        """Should set the profile's PRAGMAs on a new database file."""
+        conn = connect(str(tmp_path / "p.db"), "bulk-load")
+        expected = SQLITE_PROFILES["bulk-load"]
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 0
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == expected["cache_size"]
+        assert conn.execute("PRAGMA page_size").fetchone()[0] == expected["page_size"]
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2
+        conn.close()
+
+    def test_attached_schemas_get_profile(self, tmp_path):
+        """Should apply per-database settings to every listed schema."""
+        conn = sqlite3.connect(str(tmp_path / "main.db"))
+        conn.execute("ATTACH DATABASE ? AS other", (str(tmp_path / "other.db"),))
+        apply_profile(conn, "durable", schemas=["main", "other"])
+        assert conn.execute("PRAGMA other.journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA other.synchronous").fetchone()[0] == 2
+        conn.close()
+
+    def test_invalid_setting_is_rejected(self):
+        """Should not interpolate unexpected values into PRAGMA statements."""
+        bad = {"synchronous": "NORMAL; DROP TABLE users"}
+        with patch.dict(SQLITE_PROFILES, {"bad": bad}):
+            with pytest.raises(ValueError):
+                apply_profile(sqlite3.connect(":memory:"), "bad")
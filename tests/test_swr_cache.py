@@ -0,0 +1,184 @@
+import pytest
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.swr_cache import StaleWhileRevalidateCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr("src.swr_cache.time.monotonic", clock)
+    return clock
+
+
+class CountingLoader:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+        self.version = 1
+        self.fail = False
+        self.lock = threading.Lock()
+
+    def __call__(self, key):
+        with self.lock:
+            self.calls.append(key)
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("upstream down")
+        return f"{key}-v{self.version}"
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        if time.perf_counter() > deadline:
+            raise AssertionError("condition not met in time")
+        time.sleep(0.01)
+
+
+# ─── Stale-While-Revalidate Tests ──────────────────────────────────────────
+
+class TestStaleWhileRevalidateCache:
+    def test_fresh_entries_are_served_from_cache(self, clock):
+        """Should call the loader once while an entry is fresh."""
+        loader = CountingLoader()
+        cache = StaleWhileRevalidateCache(loader, soft_ttl=10, hard_ttl=100)
+        assert cache.get("a") == "a-v1"
+        clock.now += 5
+        assert cache.get("a") == "a-v1"
+        assert loader.calls == ["a"]
+        assert cache.stats()["hits"] == 1
+
+    def test_stale_entry_served_while_refreshing(self, clock):
+        """Should return the stale value at once and refresh it in the background."""
+        loader = CountingLoader()
+        cache = StaleWhileRevalidateCache(loader, soft_ttl=10, hard_ttl=100)
+        cache.get("a")
+        loader.version = 2
+        loader.delay = 0.1
+        clock.now += 20
+        started = time.perf_counter()
+        assert cache.get("a") == "a-v1"
+        assert cache.get("a") == "a-v1"
+        assert time.perf_counter() - started < 0.1
+        wait_for(lambda: cache.stats()["refreshes"] == 1)
+        assert cache.get("a") == "a-v2"
+        assert loader.calls == ["a", "a"]
+        cache.close()
+
+    def test_failed_refresh_keeps_stale_value(self, clock):
+        """Should keep serving the stale value when a background refresh fails."""
+        loader = CountingLoader()
+        cache = StaleWhileRevalidateCache(loader, soft_ttl=10, hard_ttl=100)
+        cache.get("a")
+        loader.fail = True
+        clock.now += 20
+        assert cache.get("a") == "a-v1"
+        wait_for(lambda: cache.stats()["refresh_errors"] == 1)
+        assert cache.get("a") == "a-v1"
+        cache.close()
+
+    def test_hard_expired_entry_is_reloaded(self, clock):
+        """Should drop entries past hard_ttl and load them synchronously."""
+        loader = CountingLoader()
+        cache = StaleWhileRevalidateCache(loader, soft_ttl=10, hard_ttl=100)
+        cache.get("a")
+        loader.version = 2
+        clock.now += 150
+        assert cache.get("a") == "a-v2"
+        assert cache.stats()["expirations"] == 1
+
+    def test_concurrent_misses_share_one_load(self):
+        """Should collapse simultaneous misses for one key into a single loader call."""
+        loader = CountingLoader(delay=0.1)
+        cache = StaleWhileRevalidateCache(loader, soft_ttl=10, hard_ttl=100)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get("a"))) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == ["a-v1"] * 10
+        assert loader.calls == ["a"]
+        assert cache.stats()["coalesced"] == 9
+
+    def test_load_error_reaches_every_waiter_and_is_not_cached(self):
+        """Should raise the loader's error to all waiters and retry on the next call."""
+        loader = CountingLoader(delay=0.1)
+        loader.fail = True
+        cache = StaleWhileRevalidateCache(loader, soft_ttl=10, hard_ttl=100)
+        errors = []
+
+        def call():
+            try:
+                cache.get("a")
+            except RuntimeError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(errors) == 5
+        assert loader.calls == ["a"]
+        loader.fail = False
+        assert cache.get("a") == "a-v1"
+
+    def test_bounded_by_max_entries(self):
+        """Should evict the least recently used entry past max_entries."""
+        loader = CountingLoader()
+        cache = StaleWhileRevalidateCache(loader, soft_ttl=10, hard_ttl=100, max_entries=2)
+        cache.get("a")
+        cache.get("b")
+        cache.get("a")
+        cache.get("c")
+        assert len(cache) == 2
+        assert cache.stats()["evictions"] == 1
+        cache.get("a")
+        assert loader.calls == ["a", "b", "c"]
+
+    def test_get_many_batches_misses(self):
+        """Should load all misses in one batch call and leave out unknown keys."""
+        loader = CountingLoader()
+        batches = []
+
+        def batch_loader(keys):
+            batches.append(keys)
+            return {key: f"{key}-batch" for key in keys if key != "missing"}
+
+        cache = StaleWhileRevalidateCache(loader, soft_ttl=10, hard_ttl=100, batch_loader=batch_loader)
+        cache.get("a")
+        result = cache.get_many(["a", "b", "c", "b", "missing"])
+        assert result == {"a": "a-v1", "b": "b-batch", "c": "c-batch"}
+        assert batches == [["b", "c", "missing"]]
+        assert cache.get_many(["b", "c"]) == {"b": "b-batch", "c": "c-batch"}
+        assert len(batches) == 1
+
+    def test_invalidate(self):
+        """Should reload an invalidated entry on the next call."""
+        loader = CountingLoader()
+        cache = StaleWhileRevalidateCache(loader, soft_ttl=10, hard_ttl=100)
+        cache.get("a")
+        assert cache.invalidate("a") is True
+        assert cache.invalidate("a") is False
+        cache.get("a")
+        assert loader.calls == ["a", "a"]
+
+    def test_rejects_soft_ttl_above_hard_ttl(self):
+        """Should refuse a soft TTL longer than the hard TTL."""
+        with pytest.raises(ValueError):
+            StaleWhileRevalidateCache(CountingLoader(), soft_ttl=100, hard_ttl=10)
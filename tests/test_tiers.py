@@ -0,0 +1,55 @@
+import pytest
+import os
+import sqlite3
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.tiers import classify, load_chunks, tier_counts
+
+
+# ─── Classification Tests ──────────────────────────────────────────────────
+
+class TestClassify:
+    def test_matches_get_user_report_thresholds(self):
+        """Should apply the same strict > 499 / > 9999 boundaries as get_user_report."""
+        codes = classify([0, 499, 500, 9999, 10000, -5.5])
+        assert codes.tolist() == [0, 0, 1, 1, 2, 0]
+        assert codes.dtype == np.uint8
+
+    def test_null_values_are_lowest_tier(self):
+        """Should put NULL (NaN) values in tier 0."""
+        assert classify([None, float("nan"), 20000]).tolist() == [0, 0, 2]
+
+    def test_custom_thresholds(self):
+        """Should accept any ascending thresholds."""
+        assert classify([1, 5, 10], thresholds=(1, 5)).tolist() == [0, 1, 2]
+
+    def test_tier_counts_include_empty_tiers(self):
+        """Should report every tier, including those with no users."""
+        assert tier_counts(np.array([0, 0, 2], dtype=np.uint8)) == {
+            "free": 2, "standard": 0, "premium": 1
+        }
+
+
+# ─── Loading Tests ─────────────────────────────────────────────────────────
+
+class TestLoadChunks:
+    def test_loads_in_batches(self):
+        """Should read every row through fetchmany into int64/float64 arrays."""
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, v REAL)")
+        conn.executemany("INSERT INTO t VALUES (?, ?)", [(i, i * 1.5) for i in range(1, 8)] + [(8, None)])
+        ids, values = load_chunks(conn.execute("SELECT id, v FROM t ORDER BY id"), batch_size=3)
+        assert ids.dtype == np.int64 and ids.tolist() == list(range(1, 9))
+        assert values[:7].tolist() == [i * 1.5 for i in range(1, 8)]
+        assert np.isnan(values[7])
+
+    def test_empty_cursor(self):
+        """Should return empty arrays when there are no rows."""
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE t (id INTEGER, v REAL)")
+        ids, values = load_chunks(conn.execute("SELECT id, v FROM t"), batch_size=3)
+        assert len(ids) == 0 and len(values) == 0
@@ -1,6 +1,10 @@
 import pytest
 import sqlite3
 import os
+import csv
+import gzip
+import io
+import json
 from unittest.mock import patch, MagicMock, call
 import sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
@@ -8,7 +12,8 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from src.user_service import (
     get_user, authenticate_user, create_user,
     delete_user, get_all_users_with_orders,
-    validate_user_input, get_user_report, UserManager
+    validate_user_input, get_user_report, UserManager, user_cache_stats, get_users,
+    get_user_tier_report, migrate_user_schema
 )
 
 
@@ -38,6 +43,13 @@ def test_db(tmp_path):
     return db_path
 
 
+@pytest.fixture
+def users_db(test_db, monkeypatch):
+    """Run from the test database's directory so ``users.db`` resolves to it."""
+    monkeypatch.chdir(os.path.dirname(test_db))
+    return test_db
+
+
 @pytest.fixture
 def user_manager():
     """Return a UserManager instance."""
@@ -76,6 +88,84 @@ class TestGetUser:
             mock_conn.return_value.close.assert_called_once()
 
 
+class TestGetUserCache:
+    def test_repeated_lookups_hit_cache(self):
+        """Should open one connection for repeated lookups of the same ID."""
+        with patch('sqlite3.connect') as mock_conn:
+            mock_cursor = MagicMock()
+            mock_cursor.fetchone.return_value = (1, 'john_doe', 'john@test.com', 'pass123', 'user')
+            mock_conn.return_value.cursor.return_value = mock_cursor
+            for _ in range(5):
+                assert get_user("1")[1] == 'john_doe'
+            assert mock_conn.call_count == 1
+        stats = user_cache_stats()
+        assert stats["hits"] == 4
+        assert stats["hit_ratio"] == pytest.approx(0.8)
+
+    def test_missing_ids_are_cached(self):
+        """Should cache a miss so unknown IDs do not hit the database each time."""
+        with patch('sqlite3.connect') as mock_conn:
+            mock_conn.return_value.cursor.return_value.fetchone.return_value = None
+            assert get_user("999") is None
+            assert get_user("999") is None
+            assert mock_conn.call_count == 1
+
+    def test_delete_user_invalidates(self):
+        """Should reload a user after it has been deleted."""
+        with patch('sqlite3.connect') as mock_conn:
+            mock_cursor = MagicMock()
+            mock_cursor.fetchone.return_value = (1, 'john_doe')
+            mock_conn.return_value.cursor.return_value = mock_cursor
+            get_user("1")
+            delete_user(1)
+            mock_cursor.fetchone.return_value = None
+            assert get_user("1") is None
+
+    def test_create_user_invalidates_cached_miss(self):
+        """Should forget a cached miss for the ID the new user receives."""
+        with patch('sqlite3.connect') as mock_conn:
+            mock_cursor = MagicMock()
+            mock_cursor.fetchone.return_value = None
+            mock_cursor.lastrowid = 4
+            mock_conn.return_value.cursor.return_value = mock_cursor
+            assert get_user("4") is None
+            create_user("dave", "dave@test.com", "pw")
+            mock_cursor.fetchone.return_value = (4, 'dave')
+            assert get_user("4") == (4, 'dave')
+
+
+class TestGetUsers:
+    def test_get_users_returns_dict_of_existing_ids(self, users_db):
+        """Should key found rows by the requested ID and skip missing ones."""
+        users = get_users(["1", "3", "42"])
+        assert set(users) == {"1", "3"}
+        assert users["3"][1] == 'bob'
+
+    def test_get_users_chunks_and_deduplicates(self, users_db):
+        """Should query each distinct ID once, in chunks under the variable limit."""
+        with patch('src.user_service.connect_db', wraps=sqlite3.connect) as mock_connect:
+            users = get_users(["1", "2", "1", "3", "2"], chunk_size=2)
+        assert set(users) == {"1", "2", "3"}
+        assert mock_connect.call_count == 1
+
+    def test_get_users_uses_and_fills_cache(self, users_db):
+        """Should serve cached IDs and cache rows loaded in the batch."""
+        get_user("1")
+        get_users(["1", "2"])
+        with patch('sqlite3.connect') as mock_conn:
+            assert get_user("2")[1] == 'jane_doe'
+            assert get_users(["1", "2"]).keys() == {"1", "2"}
+            mock_conn.assert_not_called()
+
+    def test_bulk_process_costs_one_connection(self, users_db, user_manager):
+        """Should load a whole batch over one connection."""
+        ids = [str(i) for i in range(1, 1001)]
+        with patch('src.user_service.connect_db', wraps=sqlite3.connect) as mock_connect:
+            results = user_manager.bulk_process(ids)
+        assert [r[0] for r in results] == [1, 2, 3]
+        assert mock_connect.call_count == 1
+
+
 # ─── authenticate_user Tests ───────────────────────────────────────────────
 
 class TestAuthenticateUser:
@@ -107,6 +197,41 @@ class TestAuthenticateUser:
             result = authenticate_user("wrong", "wrong")
             assert result is False
 
+    def test_authenticate_against_salted_hash(self):
+        """Should verify the password against a stored salted hash."""
+        from src.passwords import hash_password
+        stored = hash_password("pass", iterations=1000)
+        with patch('sqlite3.connect') as mock_conn:
+            mock_cursor = MagicMock()
+            mock_cursor.fetchone.return_value = (1, 'john', 'john@test.com', stored, 'user')
+            mock_conn.return_value.cursor.return_value = mock_cursor
+            assert authenticate_user("john", "pass") is True
+            assert authenticate_user("john", "wrong") is False
+            sql, params = mock_cursor.execute.call_args[0]
+            assert "?" in sql and params == ("john",)
+
+    def test_locked_out_user_is_rejected_before_db(self):
+        """Should refuse a locked-out user without touching the database."""
+        with patch('sqlite3.connect') as mock_conn:
+            mock_conn.return_value.cursor.return_value.fetchone.return_value = None
+            for _ in range(5):
+                assert authenticate_user("mallory", "guess") is False
+            assert mock_conn.call_count == 5
+            assert authenticate_user("mallory", "guess") is False
+            assert mock_conn.call_count == 5
+
+    def test_success_resets_failures(self):
+        """Should clear the failure count after a successful login."""
+        from src.user_service import failed_logins
+        with patch('sqlite3.connect') as mock_conn:
+            mock_cursor = MagicMock()
+            mock_cursor.fetchone.return_value = (1, 'john', 'john@test.com', 'pass', 'user')
+            mock_conn.return_value.cursor.return_value = mock_cursor
+            authenticate_user("john", "wrong")
+            assert failed_logins.failures("john") == 1
+            assert authenticate_user("john", "pass") is True
+            assert failed_logins.failures("john") == 0
+
     def test_authenticate_empty_credentials(self):
         """Should handle empty username and password."""
         with patch('sqlite3.connect') as mock_conn:
@@ -152,6 +277,16 @@ class TestCreateUser:
             create_user("test", "test@test.com", "pass")
             mock_conn.return_value.commit.assert_called_once()
 
+    def test_create_user_stores_hash(self):
+        """Should never write the plaintext password."""
+        with patch('sqlite3.connect') as mock_conn:
+            mock_cursor = MagicMock()
+            mock_conn.return_value.cursor.return_value = mock_cursor
+            create_user("new_user", "new@test.com", "plain-pw")
+            sql = mock_cursor.execute.call_args[0][0]
+            assert "plain-pw" not in sql
+            assert "pbkdf2_sha256$" in sql
+
 
 # ─── delete_user Tests ─────────────────────────────────────────────────────
 
@@ -183,6 +318,65 @@ class TestDeleteUser:
                 pytest.fail(f"delete_user raised an exception: {e}")
 
 
+# ─── get_all_users_with_orders Tests ──────────────────────────────────────
+
+class TestGetAllUsersWithOrders:
+    @pytest.fixture
+    def orders_db(self, users_db):
+        conn = sqlite3.connect(users_db)
+        conn.execute("CREATE TABLE orders (id INTEGER PRIMARY KEY, user_id INTEGER, total REAL)")
+        conn.executemany(
+            "INSERT INTO orders (user_id, total) VALUES (?, ?)",
+            [(1, 10.0), (3, 5.0), (1, 20.0)],
+        )
+        conn.commit()
+        conn.close()
+        return users_db
+
+    def test_groups_orders_per_user(self, orders_db):
+        """Should yield every user once with their own orders."""
+        users = list(get_all_users_with_orders(batch_size=1))
+        assert [u["username"] for u in users] == ['john_doe', 'jane_doe', 'bob']
+        assert [o["total"] for o in users[0]["orders"]] == [10.0, 20.0]
+        assert users[1]["orders"] == []
+        assert users[2]["orders"] == [{"id": 2, "user_id": 3, "total": 5.0}]
+        assert "password" not in users[0]
+
+    def test_is_lazy_generator(self, orders_db):
+        """Should stream users instead of building a list."""
+        users = get_all_users_with_orders()
+        assert next(users)["id"] == 1
+        users.close()
+
+    def test_does_not_change_schema(self, orders_db):
+        """Should only read; the orders index is created by migrate_user_schema."""
+        list(get_all_users_with_orders())
+        conn = sqlite3.connect(orders_db)
+        indexes = [row[1] for row in conn.execute("PRAGMA index_list(orders)")]
+        conn.close()
+        assert indexes == []
+
+    def test_works_on_read_only_connection(self, orders_db):
+        """Should run against a read-only database."""
+        uri = f"file:{orders_db}?mode=ro"
+        with patch('src.user_service.connect_db', lambda _: sqlite3.connect(uri, uri=True)):
+            assert len(list(get_all_users_with_orders())) == 3
+
+    def test_migration_creates_orders_index_once(self, orders_db):
+        """Should add idx_orders_user_id through the migration mechanism."""
+        assert migrate_user_schema(orders_db) == ["users-001"]
+        assert migrate_user_schema(orders_db) == []
+        conn = sqlite3.connect(orders_db)
+        indexes = [row[1] for row in conn.execute("PRAGMA index_list(orders)")]
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM users AS u "
+            "LEFT JOIN orders AS o ON o.user_id = u.id ORDER BY u.id"
+        ).fetchall()
+        conn.close()
+        assert indexes == ["idx_orders_user_id"]
+        assert any("idx_orders_user_id" in row[-1] for row in plan)
+
+
 # ─── validate_user_input Tests ─────────────────────────────────────────────
 
 class TestValidateUserInput:
@@ -197,6 +391,73 @@ class TestValidateUserInput:
         assert result == "hello"
 
 
+# ─── get_user_tier_report Tests ────────────────────────────────────────────
+
+class TestGetUserTierReport:
+    @pytest.fixture
+    def users_db(self, users_db):
+        conn = sqlite3.connect(users_db)
+        conn.executemany(
+            "INSERT INTO users (id, username, balance) VALUES (?, ?, ?)",
+            [(4, "big", 25000.0), (5, "edge", 499.0), (6, "nobalance", None)]
+        )
+        conn.commit()
+        conn.close()
+        return users_db
+
+    def test_counts_and_per_user_tiers(self, users_db):
+        """Should classify every user in one scan with get_user_report's thresholds."""
+        report = get_user_tier_report(batch_size=2)
+        assert report["counts"] == {"free": 4, "standard": 1, "premium": 1}
+        tiers = dict(zip(report["ids"].tolist(), report["tiers"].tolist()))
+        assert tiers == {1: 0, 2: 1, 3: 0, 4: 2, 5: 0, 6: 0}
+
+    def test_does_not_write_unless_persisting(self, users_db):
+        """Should leave the database untouched by default."""
+        get_user_tier_report()
+        conn = sqlite3.connect(users_db)
+        assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'user_tiers'").fetchone() is None
+        conn.close()
+
+    def test_persist_writes_user_tiers(self, users_db):
+        """Should store each user's tier in user_tiers."""
+        get_user_tier_report(persist=True)
+        conn = sqlite3.connect(users_db)
+        rows = dict(conn.execute("SELECT user_id, tier FROM user_tiers").fetchall())
+        conn.close()
+        assert rows == {1: 0, 2: 1, 3: 0, 4: 2, 5: 0, 6: 0}
+
+    def test_incremental_only_reclassifies_changed_users(self, users_db):
+        """Should pick up new, changed and deleted users and skip the rest."""
+        first = get_user_tier_report(incremental=True)
+        assert len(first["ids"]) == 6
+        assert len(get_user_tier_report(incremental=True)["ids"]) == 0
+
+        conn = sqlite3.connect(users_db)
+        conn.execute("UPDATE users SET balance = 600 WHERE id = 1")
+        conn.execute("DELETE FROM users WHERE id = 4")
+        conn.execute("INSERT INTO users (id, username, balance) VALUES (7, 'new', 12000)")
+        conn.commit()
+        conn.close()
+
+        report = get_user_tier_report(incremental=True)
+        assert sorted(report["ids"].tolist()) == [1, 7]
+        assert report["counts"] == {"free": 3, "standard": 2, "premium": 1}
+
+    def test_incremental_reclassifies_when_thresholds_change(self, users_db):
+        """Should treat a threshold change as a change for every user."""
+        get_user_tier_report(incremental=True)
+        report = get_user_tier_report(thresholds=(100, 1000), incremental=True)
+        assert len(report["ids"]) == 6
+        assert report["counts"] == {"free": 2, "standard": 2, "premium": 2}
+
+    def test_rejects_unknown_column(self, users_db):
+        """Should validate the column name before building SQL."""
+        from src.query_builder import InvalidIdentifierError
+        with pytest.raises(InvalidIdentifierError):
+            get_user_tier_report(column="balance; DROP TABLE users")
+
+
 # ─── UserManager Tests ─────────────────────────────────────────────────────
 
 class TestUserManager:
@@ -210,10 +471,12 @@ class TestUserManager:
 
     def test_bulk_process_returns_results(self, user_manager):
         """Should return results for given user IDs."""
-        with patch('src.user_service.get_user') as mock_get:
-            mock_get.return_value = (1, "john", "john@test.com", "pass", "user")
+        with patch('src.user_service.get_users') as mock_get:
+            mock_get.return_value = {"1": (1, "john", "john@test.com", "pass", "user")}
             results = user_manager.bulk_process(["1", "2"])
             assert isinstance(results, list)
+            assert results == [(1, "john", "john@test.com", "pass", "user")]
+            mock_get.assert_called_once_with(["1", "2"])
 
     def test_bulk_process_empty_list(self, user_manager):
         """Should return empty list for empty input."""
@@ -228,3 +491,44 @@ class TestUserManager:
             mock_conn.return_value.cursor.return_value = mock_cursor
             result = user_manager.export_users()
             assert isinstance(result, list)
+
+
+# ─── export_users Tests ────────────────────────────────────────────────────
+
+class TestExportUsers:
+    def test_export_csv_to_path(self, users_db, user_manager, tmp_path):
+        """Should stream a CSV with a header and no password column by default."""
+        path = tmp_path / "users.csv"
+        stats = user_manager.export_users(str(path), batch_size=2)
+        rows = list(csv.reader(path.open()))
+        assert rows[0] == ["id", "username", "email", "role", "balance"]
+        assert [r[1] for r in rows[1:]] == ["john_doe", "jane_doe", "bob"]
+        assert stats["rows"] == 3
+
+    def test_export_gzip_jsonl_with_columns(self, users_db, user_manager, tmp_path):
+        """Should gzip paths ending in .gz and honor the column selection."""
+        path = tmp_path / "users.jsonl.gz"
+        user_manager.export_users(str(path), fmt="jsonl", columns=["id", "role"])
+        with gzip.open(path, "rt") as f:
+            records = [json.loads(line) for line in f]
+        assert records[1] == {"id": 2, "role": "admin"}
+
+    def test_export_to_binary_file_object(self, users_db, user_manager):
+        """Should write to an open binary file object and leave it open."""
+        buffer = io.BytesIO()
+        user_manager.export_users(buffer, fmt="jsonl", compress=True)
+        assert not buffer.closed
+        lines = gzip.decompress(buffer.getvalue()).decode().splitlines()
+        assert len(lines) == 3
+
+    def test_export_reports_progress_per_batch(self, users_db, user_manager):
+        """Should call progress with the running row count after each batch."""
+        seen = []
+        user_manager.export_users(io.StringIO(), batch_size=2, progress=seen.append)
+        assert seen == [2, 3]
+
+    def test_export_rejects_unknown_columns(self, users_db, user_manager):
+        """Should validate selected columns before building SQL."""
+        from src.query_builder import InvalidIdentifierError
+        with pytest.raises(InvalidIdentifierError):
+            user_manager.export_users(io.StringIO(), columns=["id", "x; DROP TABLE users"])